@@ -1,53 +1,525 @@
+import numpy as np
 import pandas as pd
-import config
+from config import Config
+from metrics_calculator import compute_metrics, periods_per_year
+
+# Integer signal codes used by the array engine
+BUY, HOLD, SELL = 1, 0, -1
+
+def encode_signals(signals):
+    """
+    Convert 'buy'/'sell'/'hold' labels (or already numeric codes) to an int8 array.
+
+    :param signals: Series or array of signal labels or codes.
+    :return: int8 NumPy array with 1 for buy, -1 for sell and 0 for hold.
+    """
+    values = np.asarray(signals)
+    if values.dtype.kind in 'iub':
+        return values.astype(np.int8)
+    if values.dtype.kind == 'f':
+        return np.nan_to_num(values).astype(np.int8)
+    return np.where(values == 'buy', BUY, np.where(values == 'sell', SELL, HOLD)).astype(np.int8)
+
+def simulate_long_only(close, signals, initial_balance, fee, position_size=1.0):
+    """
+    Array engine for a single long-only position, trading at the close of the signal bar.
+
+    A buy opens a position only when flat and a sell closes it only when long,
+    so the position after each bar is simply whether the last non-hold signal
+    was a buy. That makes the whole simulation a handful of vectorized passes:
+    a forward fill for the position state, one cumulative product over trade
+    returns for the compounding balance and a gather for per-bar equity.
+
+    :param close: Close prices as a float array.
+    :param signals: int8 signal codes (see encode_signals).
+    :param initial_balance: Starting cash.
+    :param fee: Fee per side as a fraction of traded value.
+    :param position_size: Fraction of equity invested on each entry.
+    :return: Dictionary of per-bar arrays ('position', 'exposure', 'equity', 'cash')
+             and per-trade arrays ('entry_idx', 'exit_idx', 'entry_price', 'exit_price',
+             'units', 'pnl', 'balance').
+    """
+    close = np.asarray(close, dtype=np.float64)
+    signals = np.asarray(signals, dtype=np.int8)
+    n = len(close)
+    bars = np.arange(n)
+
+    # Position state after each bar: forward fill of the last non-hold signal
+    last_signal_idx = np.maximum.accumulate(np.where(signals != HOLD, bars, 0))
+    in_market = (signals[last_signal_idx] == BUY)
+    previous = np.concatenate(([False], in_market[:-1]))
+    entry_idx = np.flatnonzero(in_market & ~previous)
+    exit_idx = np.flatnonzero(~in_market & previous)
+
+    entry_price = close[entry_idx]
+    exit_price = close[exit_idx]
+    closed = len(exit_idx)
+
+    # Balance multiplier of every closed trade, compounded into the balance before each entry
+    gross = exit_price * (1 - fee) / (entry_price[:closed] * (1 + fee))
+    multiplier = (1 - position_size) + position_size * gross
+    balance_after = initial_balance * np.cumprod(multiplier)
+    balance_before = np.concatenate(([initial_balance], balance_after))[:len(entry_idx)]
+
+    # A trailing zero lets bars before the first entry (trade number -1) read a neutral value
+    units = np.append(balance_before * position_size / (entry_price * (1 + fee)), 0.0)
+    idle_cash = np.append(balance_before * (1 - position_size), 0.0)
+
+    entry_flag = np.zeros(n, dtype=bool)
+    entry_flag[entry_idx] = True
+    exit_flag = np.zeros(n, dtype=bool)
+    exit_flag[exit_idx] = True
+    trade_no = np.cumsum(entry_flag) - 1
+    flat_equity = np.concatenate(([initial_balance], balance_after))[np.cumsum(exit_flag)]
+
+    position = np.where(in_market, units[trade_no], 0.0)
+    cash = np.where(in_market, idle_cash[trade_no], flat_equity)
+    equity = cash + position * close
+
+    return {
+        'position': position,
+        'exposure': in_market.astype(np.int8),
+        'equity': equity,
+        'cash': cash,
+        'entry_idx': entry_idx[:closed],
+        'exit_idx': exit_idx,
+        'entry_price': entry_price[:closed],
+        'exit_price': exit_price,
+        'units': units[:closed],
+        'pnl': gross - 1,
+        'balance': balance_after,
+        'open_entry_idx': entry_idx[closed:]
+    }
+
+def simulate_batch(close, signal_matrix, initial_balance, fee, position_size=1.0):
+    """
+    Simulate many signal columns (one per parameter set) in a single 2-D array pass.
+
+    Same trading rules as simulate_long_only. Equity is expressed relative to
+    the balance at the last exit, so every column compounds through one
+    cumprod along the bar axis instead of a Python loop over trades.
+
+    :param close: Close prices as a float array of length n.
+    :param signal_matrix: int8 signal codes of shape (n, m).
+    :param initial_balance: Starting cash.
+    :param fee: Fee per side as a fraction of traded value.
+    :param position_size: Fraction of equity invested on each entry.
+    :return: Dictionary of (n, m) arrays: 'equity', 'exposure', 'entry', 'exit' and
+             'pnl' (trade return on exit bars, NaN elsewhere).
+    """
+    close = np.asarray(close, dtype=np.float64)
+    signals = np.asarray(signal_matrix, dtype=np.int8)
+    if signals.ndim == 1:
+        signals = signals[:, None]
+    bars = np.arange(len(close))[:, None]
+
+    last_signal_idx = np.maximum.accumulate(np.where(signals != HOLD, bars, 0), axis=0)
+    in_market = np.take_along_axis(signals, last_signal_idx, axis=0) == BUY
+    previous = np.vstack((np.zeros((1, in_market.shape[1]), dtype=bool), in_market[:-1]))
+    entry = in_market & ~previous
+    exit_ = ~in_market & previous
+
+    # Entry price of the current (or just closed) trade on every bar
+    entry_price = close[np.maximum.accumulate(np.where(entry, bars, 0), axis=0)]
+    price_ratio = close[:, None] / entry_price
+
+    exit_gross = price_ratio * (1 - fee) / (1 + fee)
+    multiplier = np.where(exit_, (1 - position_size) + position_size * exit_gross, 1.0)
+    flat_equity = initial_balance * np.cumprod(multiplier, axis=0)
+    equity = np.where(in_market, flat_equity * ((1 - position_size) + position_size * price_ratio / (1 + fee)), flat_equity)
+
+    return {
+        'equity': equity,
+        'exposure': in_market,
+        'entry': entry,
+        'exit': exit_,
+        'pnl': np.where(exit_, exit_gross - 1, np.nan)
+    }
+
+def batch_metrics(close, sim, initial_balance, bars_per_year=365):
+    """
+    Summary metrics for every column of a simulate_batch result.
+
+    :param close: Close prices as a float array of length n.
+    :param sim: Output of simulate_batch.
+    :param initial_balance: Starting cash.
+    :param bars_per_year: Annualization factor (see metrics_calculator.periods_per_year).
+    :return: DataFrame with one row per column.
+    """
+    return pd.DataFrame(compute_metrics(
+        sim['equity'], initial_balance, bars_per_year, close=close, exposure=sim['exposure'], pnl=sim['pnl']
+    ))
+
+def simulate_portfolio(close, signals, initial_balance, fee, max_positions, position_size=None,
+                       tick_size=None, step_size=None, min_notional=None, slippage_ticks=0, priority=None):
+    """
+    Long-only portfolio engine: many symbols trading against one cash balance.
+
+    Bars are processed in time order because every entry depends on the cash
+    left by earlier ones, but each bar handles all symbols with array
+    operations. On every bar exits are filled first, then buy signals are
+    ranked by priority and filled while open slots and cash last. Fills pay
+    the fee and `slippage_ticks` price ticks; quantities are rounded down to
+    the lot step and orders below the minimum notional are skipped.
+
+    :param close: Close prices of shape (n, m); NaN where a symbol has no bar.
+    :param signals: int8 signal codes of shape (n, m) (see encode_signals).
+    :param initial_balance: Starting cash.
+    :param fee: Fee per side, scalar or one per symbol.
+    :param max_positions: Maximum concurrently open positions.
+    :param position_size: Fraction of equity per position. Defaults to 1 / max_positions.
+    :param tick_size: Price tick per symbol, or None.
+    :param step_size: Lot step per symbol, or None.
+    :param min_notional: Minimum order value per symbol, or None.
+    :param slippage_ticks: Ticks paid on each fill.
+    :param priority: Ranking of shape (n, m) for competing buys, higher first (e.g. RRS). None keeps column order.
+    :return: Dictionary of per-bar arrays ('equity', 'cash', 'invested', 'open_positions'),
+             the (n, m) 'holdings' matrix of units held and per-trade arrays ('symbol_idx', 'entry_idx', 'exit_idx',
+             'entry_price', 'exit_price', 'units', 'pnl', 'profit').
+    """
+    close = np.asarray(close, dtype=np.float64)
+    signals = np.asarray(signals, dtype=np.int8)
+    n, m = close.shape
+    fee = np.broadcast_to(np.asarray(fee, dtype=np.float64), (m,))
+    tick = np.zeros(m) if tick_size is None else np.asarray(tick_size, dtype=np.float64)
+    step = np.zeros(m) if step_size is None else np.asarray(step_size, dtype=np.float64)
+    floor_notional = np.zeros(m) if min_notional is None else np.asarray(min_notional, dtype=np.float64)
+    slip = tick * slippage_ticks
+    position_size = position_size if position_size is not None else 1.0 / max_positions
+
+    tradable = np.isfinite(close)
+    # Held positions are valued at their last known close through missing bars
+    mark = pd.DataFrame(close).ffill().fillna(0.0).to_numpy()
+
+    cash = float(initial_balance)
+    units = np.zeros(m)
+    entry_bar = np.zeros(m, dtype=np.int64)
+    entry_fill = np.zeros(m)
+    entry_cost = np.zeros(m)
+    units_matrix = np.zeros((n, m))
+    equity = np.empty(n)
+    cash_curve = np.empty(n)
+    open_positions = np.empty(n, dtype=np.int64)
+    ledger = []
+
+    for t in range(n):
+        price, sig = close[t], signals[t]
+
+        sell = np.flatnonzero((units > 0) & (sig == SELL) & tradable[t])
+        if len(sell):
+            fill = np.maximum(price[sell] - slip[sell], 0.0)
+            proceeds = units[sell] * fill * (1 - fee[sell])
+            cash += proceeds.sum()
+            ledger.append((sell, entry_bar[sell], np.full(len(sell), t), entry_fill[sell], fill,
+                           units[sell], proceeds / entry_cost[sell] - 1, proceeds - entry_cost[sell]))
+            units[sell] = 0.0
+
+        held = np.count_nonzero(units)
+        if held < max_positions:
+            buy = np.flatnonzero((units == 0) & (sig == BUY) & tradable[t])
+            if len(buy):
+                if priority is not None:
+                    buy = buy[np.argsort(-np.nan_to_num(priority[t, buy], nan=-np.inf), kind='stable')]
+                buy = buy[:max_positions - held]
+                fill = price[buy] + slip[buy]
+                target = (cash + units @ mark[t]) * position_size
+                # Greedy in priority order: each order gets its target or whatever cash is left
+                spent_before = np.concatenate(([0.0], np.cumsum(np.full(len(buy) - 1, target))))
+                budget = np.clip(cash - spent_before, 0.0, target)
+                qty = budget / (fill * (1 + fee[buy]))
+                qty = np.where(step[buy] > 0, np.floor(qty / np.where(step[buy] > 0, step[buy], 1)) * step[buy], qty)
+                ok = (qty > 0) & (qty * fill >= floor_notional[buy])
+                buy, qty, fill = buy[ok], qty[ok], fill[ok]
+                cost = qty * fill * (1 + fee[buy])
+                cash -= cost.sum()
+                units[buy] = qty
+                entry_bar[buy] = t
+                entry_fill[buy] = fill
+                entry_cost[buy] = cost
+
+        units_matrix[t] = units
+        cash_curve[t] = cash
+        equity[t] = cash + units @ mark[t]
+        open_positions[t] = np.count_nonzero(units)
+
+    fields = ('symbol_idx', 'entry_idx', 'exit_idx', 'entry_price', 'exit_price', 'units', 'pnl', 'profit')
+    trades = {name: np.concatenate([rec[i] for rec in ledger]) if ledger else np.empty(0)
+              for i, name in enumerate(fields)}
+    for name in ('symbol_idx', 'entry_idx', 'exit_idx'):
+        trades[name] = trades[name].astype(np.int64)
+
+    return {
+        'equity': equity,
+        'cash': cash_curve,
+        'invested': equity - cash_curve,
+        'open_positions': open_positions,
+        'holdings': units_matrix,
+        **trades
+    }
 
 class Backtester:
-    def __init__(self, df, signals):
+    def __init__(self, df, signals, initial_balance=Config.INITIAL_BALANCE, fee=Config.FEE,
+                 position_size=Config.POSITION_SIZE, verbose=True):
         """
         Initializes the Backtester with data, signals, and initial configuration.
 
         :param df: DataFrame containing price data and signals.
-        :param signals: Series containing buy/sell signals.
+        :param signals: Series containing buy/sell signals, or a (bars x parameter sets)
+                        DataFrame/array of signal codes for a batch run.
+        :param initial_balance: Starting cash.
+        :param fee: Fee per side as a fraction of traded value.
+        :param position_size: Fraction of equity invested on each entry.
+        :param verbose: Print debugging output. Disable for batch runs.
         """
         self.df = df
         self.signals = signals
-        self.initial_balance = config.INITIAL_BALANCE
-        self.fee = config.FEE
+        self.initial_balance = initial_balance
+        self.fee = fee
+        self.position_size = position_size
+        self.verbose = verbose
         self.balance = self.initial_balance
         self.positions = []
         self.trade_history = []
+        self.results = pd.DataFrame()
+        self.trades = pd.DataFrame()
 
     def execute_trades(self):
         """
         Simulates trade execution based on signals.
+
+        :return: Per-bar DataFrame with 'close', 'signal', 'position', 'exposure', 'equity',
+                 'drawdown', 'trade_signal', 'pnl' and 'duration' columns, ready for
+                 MetricsCalculator and Visualizer.
         """
+        if np.ndim(self.signals) == 2:
+            return self.execute_batch()
         try:
             if 'close' not in self.df.columns:
                 raise KeyError("The DataFrame must contain a 'close' column for trade execution.")
 
-            for i in range(len(self.df)):
-                signal = self.signals.iloc[i]
-                close_price = self.df['close'].iloc[i]
+            close = self.df['close'].to_numpy(dtype=np.float64)
+            codes = encode_signals(self.signals)
+            if len(codes) != len(close):
+                raise ValueError("Signals must have one entry per bar of the DataFrame.")
 
-                if signal == 'buy' and not self.positions:
-                    # Buy action
-                    self.positions.append(close_price)
-                    self.balance -= close_price * (1 + self.fee)
-                    self.trade_history.append({'action': 'buy', 'price': close_price, 'balance': self.balance})
-
-                elif signal == 'sell' and self.positions:
-                    # Sell action
-                    entry_price = self.positions.pop()
-                    profit = close_price - entry_price
-                    self.balance += close_price * (1 - self.fee)
-                    self.trade_history.append({'action': 'sell', 'price': close_price, 'profit': profit, 'balance': self.balance})
+            sim = simulate_long_only(close, codes, self.initial_balance, self.fee, self.position_size)
+            self._build_results(sim, codes)
 
             # Debugging output
-            print("Final Balance:", self.balance)
-            print("Trade History:")
-            print(pd.DataFrame(self.trade_history))
+            if self.verbose:
+                print("Final Balance:", self.balance)
+                print("Trade History:")
+                print(self.trades)
+            return self.results
         except Exception as e:
             print(f"Error during trade execution: {e}")
+            return pd.DataFrame()
+
+    def execute_batch(self, keep_equity=False):
+        """
+        Simulates every column of a signal matrix at once.
+
+        Columns are processed in blocks of Config.BATCH_COLUMNS_PER_PASS to bound
+        memory; within a block all parameter sets share each array operation.
+
+        :param keep_equity: Also store the (bars x parameter sets) equity matrix in self.equity.
+        :return: Metrics DataFrame with one row per signal column.
+        """
+        try:
+            if 'close' not in self.df.columns:
+                raise KeyError("The DataFrame must contain a 'close' column for trade execution.")
+
+            close = self.df['close'].to_numpy(dtype=np.float64)
+            labels = self.signals.columns if isinstance(self.signals, pd.DataFrame) else None
+            matrix = np.asarray(self.signals, dtype=np.int8)
+            if matrix.shape[0] != len(close):
+                raise ValueError("Signal matrix must have one row per bar of the DataFrame.")
+
+            bars_per_year = periods_per_year(self.df.index)
+            tables, equity_blocks = [], []
+            for start in range(0, matrix.shape[1], Config.BATCH_COLUMNS_PER_PASS):
+                block = matrix[:, start:start + Config.BATCH_COLUMNS_PER_PASS]
+                sim = simulate_batch(close, block, self.initial_balance, self.fee, self.position_size)
+                tables.append(batch_metrics(close, sim, self.initial_balance, bars_per_year))
+                if keep_equity:
+                    equity_blocks.append(sim['equity'])
+
+            metrics = pd.concat(tables, ignore_index=True)
+            if labels is not None:
+                metrics.index = labels
+            if keep_equity:
+                self.equity = pd.DataFrame(np.hstack(equity_blocks), index=self.df.index, columns=labels)
+            self.results = metrics
+
+            # Debugging output
+            if self.verbose:
+                print(f"Simulated {matrix.shape[1]} parameter sets over {len(close)} bars.")
+                print(metrics.head())
+            return metrics
+        except Exception as e:
+            print(f"Error during batch trade execution: {e}")
+            return pd.DataFrame()
+
+    def _build_results(self, sim, codes):
+        index = self.df.index
+        entry_idx, exit_idx = sim['entry_idx'], sim['exit_idx']
+
+        equity = sim['equity']
+        trade_signal = np.full(len(index), None, dtype=object)
+        trade_signal[entry_idx] = 'buy'
+        trade_signal[sim['open_entry_idx']] = 'buy'
+        trade_signal[exit_idx] = 'sell'
+        pnl = np.full(len(index), np.nan)
+        pnl[exit_idx] = sim['pnl']
+        durations = index[exit_idx] - index[entry_idx]
+        duration = pd.Series(durations, index=index[exit_idx]).reindex(index)
+
+        self.results = pd.DataFrame({
+            'close': self.df['close'].to_numpy(),
+            # Codes -1/0/1 index the label array from the end for sell
+            'signal': np.array(['hold', 'buy', 'sell'], dtype=object)[codes],
+            'position': sim['position'],
+            'exposure': sim['exposure'],
+            'cash': sim['cash'],
+            'equity': equity,
+            'drawdown': equity / np.maximum.accumulate(equity) - 1,
+            'trade_signal': trade_signal,
+            'pnl': pnl,
+            'duration': duration.to_numpy()
+        }, index=index)
+
+        self.trades = pd.DataFrame({
+            'entry_time': index[entry_idx],
+            'exit_time': index[exit_idx],
+            'entry_price': sim['entry_price'],
+            'exit_price': sim['exit_price'],
+            'units': sim['units'],
+            'pnl': sim['pnl'],
+            'profit': sim['units'] * (sim['exit_price'] - sim['entry_price']),
+            'duration': durations,
+            'balance': sim['balance']
+        })
+
+        self.balance = equity[-1] if len(equity) else self.initial_balance
+        self.positions = [(index[i], sim['position'][i]) for i in sim['open_entry_idx']]
+        self.trade_history = []
+        for trade in self.trades.itertuples(index=False):
+            self.trade_history.append({'action': 'buy', 'price': trade.entry_price, 'time': trade.entry_time})
+            self.trade_history.append({'action': 'sell', 'price': trade.exit_price, 'profit': trade.profit,
+                                       'balance': trade.balance, 'time': trade.exit_time})
+
+class PortfolioBacktester:
+    def __init__(self, prices, signals, initial_balance=Config.INITIAL_BALANCE, fee=Config.FEE,
+                 max_positions=Config.MAX_OPEN_POSITIONS, position_size=None, filters=None,
+                 slippage_ticks=Config.SLIPPAGE_TICKS, priority=None, verbose=True):
+        """
+        Runs Strategy signals of many symbols against one shared balance.
+
+        :param prices: Dictionary mapping symbols to DataFrames with a 'close' column,
+                       or a wide DataFrame of closes (one column per symbol).
+        :param signals: Dictionary mapping symbols to signal Series ('buy'/'sell'/'hold' or codes),
+                        or a wide DataFrame of the same shape as the closes.
+        :param initial_balance: Starting cash shared by all symbols.
+        :param fee: Fee per side, a scalar or a dictionary of symbol -> fee.
+        :param max_positions: Maximum concurrently open positions.
+        :param position_size: Fraction of equity per position. Defaults to 1 / max_positions.
+        :param filters: Dictionary of symbol -> ExchangeInfoCache.get_symbol_filters() output,
+                        used for tick slippage, lot rounding and minimum notional. None to ignore.
+        :param slippage_ticks: Ticks paid on each fill.
+        :param priority: Ranking of competing buy signals, higher first (e.g. each symbol's RRS),
+                         as a dictionary of Series or a wide DataFrame.
+        :param verbose: Print debugging output.
+        """
+        self.close = self._wide(prices, lambda df: df['close'] if isinstance(df, pd.DataFrame) else df)
+        self.symbols = list(self.close.columns)
+        self.signals = self._wide(signals, lambda s: pd.Series(encode_signals(s), index=s.index))
+        self.signals = self.signals.reindex(index=self.close.index, columns=self.symbols).fillna(HOLD)
+        self.priority = self._wide(priority, lambda s: s).reindex(index=self.close.index, columns=self.symbols) \
+            if priority is not None else None
+        self.initial_balance = initial_balance
+        self.fee = fee
+        self.max_positions = max_positions
+        self.position_size = position_size
+        self.filters = filters or {}
+        self.slippage_ticks = slippage_ticks
+        self.verbose = verbose
+        self.balance = initial_balance
+        self.positions = []
+        self.results = pd.DataFrame()
+        self.trades = pd.DataFrame()
+
+    @staticmethod
+    def _wide(data, column):
+        if isinstance(data, pd.DataFrame):
+            return data
+        return pd.DataFrame({symbol: column(value) for symbol, value in data.items()}).sort_index()
+
+    def _per_symbol(self, key, default):
+        return np.array([self.filters.get(symbol, {}).get(key, default) for symbol in self.symbols], dtype=np.float64)
+
+    def execute_trades(self):
+        """
+        Simulates the portfolio.
+
+        :return: Per-bar DataFrame with 'close' (equal-weight universe index, for buy-and-hold),
+                 'equity', 'cash', 'exposure' (invested fraction of equity), 'open_positions' and
+                 'drawdown' columns. Closed trades are in self.trades; pass them to
+                 MetricsCalculator(results, initial_balance, trades=backtester.trades).
+        """
+        try:
+            close = self.close.to_numpy(dtype=np.float64)
+            fees = [self.fee.get(s, Config.FEE) for s in self.symbols] if isinstance(self.fee, dict) else self.fee
+            sim = simulate_portfolio(
+                close, self.signals.to_numpy(dtype=np.int8), self.initial_balance, fees, self.max_positions,
+                self.position_size, self._per_symbol('tick_size', 0.0), self._per_symbol('step_size', 0.0),
+                self._per_symbol('min_notional', 0.0), self.slippage_ticks,
+                self.priority.to_numpy(dtype=np.float64) if self.priority is not None else None
+            )
+            self._build_results(sim, close)
+
+            # Debugging output
+            if self.verbose:
+                print(f"Simulated {len(self.symbols)} symbols over {len(close)} bars.")
+                print("Final Balance:", self.balance)
+                print(self.trades.tail())
+            return self.results
+        except Exception as e:
+            print(f"Error during portfolio trade execution: {e}")
+            return pd.DataFrame()
+
+    def _build_results(self, sim, close):
+        index = self.close.index
+        equity = sim['equity']
+        with np.errstate(invalid='ignore'):
+            first = pd.DataFrame(close).bfill().to_numpy()[0]
+            universe = np.nanmean(pd.DataFrame(close / first).ffill().to_numpy(), axis=1) * 100
+
+        self.results = pd.DataFrame({
+            'close': universe,
+            'equity': equity,
+            'cash': sim['cash'],
+            'exposure': np.divide(sim['invested'], equity, out=np.zeros_like(equity), where=equity > 0),
+            'open_positions': sim['open_positions'],
+            'drawdown': equity / np.maximum.accumulate(equity) - 1
+        }, index=index)
+
+        symbols = np.array(self.symbols, dtype=object)
+        self.trades = pd.DataFrame({
+            'symbol': symbols[sim['symbol_idx']],
+            'entry_time': index[sim['entry_idx']],
+            'exit_time': index[sim['exit_idx']],
+            'entry_price': sim['entry_price'],
+            'exit_price': sim['exit_price'],
+            'units': sim['units'],
+            'pnl': sim['pnl'],
+            'profit': sim['profit'],
+            'duration': index[sim['exit_idx']] - index[sim['entry_idx']]
+        }).sort_values('exit_time', kind='stable').reset_index(drop=True)
+        self.holdings = pd.DataFrame(sim['holdings'], index=index, columns=self.symbols)
+
+        self.balance = equity[-1] if len(equity) else self.initial_balance
+        last_units = sim['holdings'][-1] if len(equity) else np.zeros(len(self.symbols))
+        self.positions = [(self.symbols[i], last_units[i]) for i in np.flatnonzero(last_units)]
 
 if __name__ == "__main__":
     # Example data
@@ -59,8 +531,17 @@ if __name__ == "__main__":
     signals = df['signal']
 
     backtester = Backtester(df, signals)
-    backtester.execute_trades()
+    results = backtester.execute_trades()
 
     # Debugging output for processed data
-    print("Processed Data:")
-    print(df.head())
\ No newline at end of file
+    print("Backtest Results:")
+    print(results.head())
+
+    # Portfolio example: two symbols sharing one balance
+    portfolio = PortfolioBacktester(
+        {'AAAUSDT': df, 'BBBUSDT': df.assign(close=df['close'] * 2)},
+        {'AAAUSDT': signals, 'BBBUSDT': signals.shift(1).fillna('hold')},
+        max_positions=2
+    )
+    print("Portfolio Results:")
+    print(portfolio.execute_trades())
@@ -0,0 +1,347 @@
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import time
+import tracemalloc
+import zlib
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+import pandas as pd
+from config import Config
+import data_fetcher
+import data_processor
+from backtester import Backtester
+from candles import INTERVAL_MS
+from metrics_calculator import MetricsCalculator
+from rate_limiter import WeightRateLimiter
+from strategy import Strategy
+
+logger = logging.getLogger(__name__)
+
+# (bars per symbol, symbols) cases of each suite
+SUITES = {
+    'small': [(10_000, 1), (10_000, 50)],
+    'medium': [(1_000_000, 1), (10_000, 500)],
+    'large': [(10_000_000, 1), (100_000, 500)]
+}
+
+# Fixed first candle so every run generates identical data
+SYNTHETIC_START_MS = 1_577_836_800_000  # 2020-01-01 00:00 UTC
+
+def synthetic_ohlcv(bars, seed=0, interval='1m', start_ms=SYNTHETIC_START_MS, drift=0.0, volatility=0.001):
+    """
+    Deterministic OHLCV candles from a geometric Brownian motion.
+
+    Each bar opens at the previous close; highs and lows extend beyond the body
+    by a random fraction of the bar volatility and volume is log-normal with
+    more volume on larger moves.
+
+    :param bars: Number of candles.
+    :param seed: Random seed; the same seed always yields the same frame.
+    :param interval: Candle interval, which sets the timestamp spacing.
+    :param start_ms: Open time of the first candle in milliseconds.
+    :param drift: Mean log return per bar.
+    :param volatility: Standard deviation of the log return per bar.
+    :return: DataFrame with 'open', 'high', 'low', 'close' and 'volume' indexed by 'timestamp'.
+    """
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(drift, volatility, bars)
+    close = 100.0 * np.exp(np.cumsum(returns))
+    open_ = np.concatenate(([100.0], close[:-1]))
+    wick = np.abs(rng.normal(0, volatility, (2, bars)))
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+    volume = rng.lognormal(3.0, 0.5, bars) * (1 + np.abs(returns) / volatility)
+
+    step = INTERVAL_MS[interval]
+    open_ms = start_ms + step * np.arange(bars, dtype=np.int64)
+    index = pd.DatetimeIndex(open_ms.astype('datetime64[ms]').astype('datetime64[ns]'), name='timestamp')
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume}, index=index)
+
+def symbol_seed(symbol):
+    """
+    :return: Stable random seed of a symbol name (the same in every process).
+    """
+    return zlib.crc32(symbol.encode())
+
+def synthetic_universe(bars, symbols, interval='1m'):
+    """
+    :param bars: Candles per symbol.
+    :param symbols: Number of symbols.
+    :param interval: Candle interval.
+    :return: Dictionary of 'SYN{i}USDT' -> synthetic OHLCV frame.
+    """
+    names = [f"SYN{i}USDT" for i in range(symbols)]
+    return {name: synthetic_ohlcv(bars, symbol_seed(name), interval) for name in names}
+
+class _KlineHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real API behind requests.Session
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if not url.path.endswith('/klines'):
+            self.send_error(404)
+            return
+        body = self.server.klines(
+            query['symbol'], query['interval'], int(query['startTime']), int(query['endTime']),
+            int(query.get('limit', Config.KLINES_PAGE_LIMIT))
+        )
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class _KlineHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, bars):
+        super().__init__(address, _KlineHandler)
+        self.bars = bars
+        self._series = {}
+        self._pages = {}
+
+    def klines(self, symbol, interval, start_ts, end_ts, limit):
+        """
+        :return: JSON body of one klines page. Bodies are cached, so after one warm-up pass
+                 the server costs far less than the client parsing its responses.
+        """
+        page_key = (symbol, interval, start_ts, end_ts, limit)
+        body = self._pages.get(page_key)
+        if body is not None:
+            return body
+
+        key = (symbol, interval)
+        if key not in self._series:
+            df = synthetic_ohlcv(self.bars, symbol_seed(symbol), interval)
+            self._series[key] = (
+                df.index.to_numpy(dtype='datetime64[ms]').astype(np.int64),
+                df[['open', 'high', 'low', 'close', 'volume']].to_numpy()
+            )
+        open_ms, values = self._series[key]
+        step = INTERVAL_MS[interval]
+        first, last = np.searchsorted(open_ms, [start_ts, end_ts + 1])
+        last = min(last, first + limit)
+        fields = np.column_stack((
+            values[first:last], values[first:last, 3] * values[first:last, 4],
+            values[first:last, 4] / 2, values[first:last, 3] * values[first:last, 4] / 2
+        ))
+        # Same row layout and string-encoded decimals as /api/v3/klines
+        rows = (
+            f'[{t},"{r[0]}","{r[1]}","{r[2]}","{r[3]}","{r[4]}",{t + step - 1},"{r[5]}",100,"{r[6]}","{r[7]}","0"]'
+            for t, r in zip(open_ms[first:last].tolist(), np.round(fields, 8).astype(str).tolist())
+        )
+        body = f"[{','.join(rows)}]".encode()
+        self._pages[page_key] = body
+        return body
+
+def _serve(port_queue, bars):
+    server = _KlineHTTPServer(('127.0.0.1', 0), bars)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+class FakeKlineServer:
+    def __init__(self, bars):
+        """
+        Local stand-in for the Binance klines endpoint, serving synthetic_ohlcv
+        candles of any symbol in the real JSON layout.
+
+        It runs in its own process so formatting responses does not compete with
+        the measured client for the GIL. Use as a context manager; inside it
+        Config.BASE_API_URL points at the server.
+
+        :param bars: Candles available per symbol, starting at SYNTHETIC_START_MS.
+        """
+        self.bars = bars
+        self.url = None
+        self._process = None
+        self._previous_url = None
+
+    def __enter__(self):
+        ctx = multiprocessing.get_context('spawn')
+        port_queue = ctx.Queue()
+        self._process = ctx.Process(target=_serve, args=(port_queue, self.bars), daemon=True)
+        self._process.start()
+        self.url = f"http://127.0.0.1:{port_queue.get(timeout=30)}/api/v3"
+        self._previous_url = Config.BASE_API_URL
+        Config.BASE_API_URL = self.url
+        return self
+
+    def __exit__(self, *exc):
+        Config.BASE_API_URL = self._previous_url
+        self._process.terminate()
+        self._process.join()
+
+@contextmanager
+def _unlimited_requests():
+    # The fake server has no weight limit; keep the client's limiter from throttling the benchmark
+    previous = data_fetcher.rate_limiter
+    data_fetcher.rate_limiter = WeightRateLimiter(weight_limit=10 ** 12)
+    try:
+        yield
+    finally:
+        data_fetcher.rate_limiter = previous
+
+def _prepare(universe):
+    # Inputs of every stage, computed once outside the timed region
+    benchmark = synthetic_ohlcv(len(next(iter(universe.values()))), symbol_seed('BENCHMARK'))
+    strat = Strategy(verbose=False)
+    cases = []
+    for df in universe.values():
+        frame = df.copy()
+        frame['RRS'] = data_processor.relative_strength(frame[['close']], benchmark['close']).iloc[:, 0].to_numpy()
+        signals = strat.generate_signals(frame)
+        results = Backtester(frame, signals, verbose=False).execute_trades()
+        cases.append({'raw': df, 'frame': frame, 'signals': signals, 'results': results})
+    return strat, cases
+
+def _fetch(symbols, bars):
+    end_ts = SYNTHETIC_START_MS + bars * INTERVAL_MS['1m'] - 1
+
+    async def fetch_all():
+        return await asyncio.gather(*(
+            data_fetcher.fetch_candles_async(symbol, '1m', SYNTHETIC_START_MS, end_ts) for symbol in symbols
+        ))
+
+    results = asyncio.run(fetch_all())
+    fetched = sum(len(candles) for candles, _ in results)
+    if fetched != bars * len(symbols):
+        raise RuntimeError(f"Fake server returned {fetched} candles, expected {bars * len(symbols)}.")
+
+def _measure(func, repeats):
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(times), peak / 1024 ** 2
+
+def run_case(bars, symbols, repeats=3, include_fetch=True):
+    """
+    Time every benchmarked stage on one synthetic universe.
+
+    :param bars: Candles per symbol.
+    :param symbols: Number of symbols.
+    :param repeats: Timed runs per stage; the fastest is reported.
+    :param include_fetch: Also time fetching and parsing the universe from a local FakeKlineServer.
+    :return: List of result dictionaries (benchmark, bars, symbols, seconds, bars_per_second, peak_mb).
+    """
+    universe = synthetic_universe(bars, symbols)
+    strat, cases = _prepare(universe)
+    stages = {
+        'process_data': lambda: [data_processor.process_data(c['raw'].copy()) for c in cases],
+        'generate_signals': lambda: [strat.generate_signals(c['frame']) for c in cases],
+        'execute_trades': lambda: [Backtester(c['frame'], c['signals'], verbose=False).execute_trades() for c in cases],
+        'calculate_metrics': lambda: [
+            MetricsCalculator(c['results'], Config.INITIAL_BALANCE, verbose=False).calculate_metrics() for c in cases
+        ]
+    }
+
+    results = []
+    total = bars * symbols
+    for name, func in stages.items():
+        seconds, peak_mb = _measure(func, repeats)
+        results.append({'benchmark': name, 'bars': bars, 'symbols': symbols, 'seconds': seconds,
+                        'bars_per_second': total / seconds, 'peak_mb': peak_mb})
+        logger.info(f"{name} {bars}x{symbols}: {seconds:.4f}s")
+
+    if include_fetch:
+        with FakeKlineServer(bars), _unlimited_requests():
+            _fetch(list(universe), bars)  # Warm connections and the server's page cache
+            seconds, peak_mb = _measure(lambda: _fetch(list(universe), bars), 1)
+        results.append({'benchmark': 'fetch_parse', 'bars': bars, 'symbols': symbols, 'seconds': seconds,
+                        'bars_per_second': total / seconds, 'peak_mb': peak_mb})
+    return results
+
+def run_suite(suite='small', repeats=3, include_fetch=True):
+    """
+    :param suite: Name in SUITES.
+    :param repeats: Timed runs per stage.
+    :param include_fetch: Include the fake-server fetch benchmark.
+    :return: DataFrame with one row per (benchmark, bars, symbols).
+    """
+    if suite not in SUITES:
+        raise ValueError(f"Unknown suite: {suite}. Available: {list(SUITES)}")
+    # Memoized indicators would turn every repeat after the first into a cache lookup
+    cache_enabled = Config.INDICATOR_CACHE_ENABLED
+    Config.INDICATOR_CACHE_ENABLED = False
+    try:
+        rows = [row for bars, symbols in SUITES[suite] for row in run_case(bars, symbols, repeats, include_fetch)]
+    finally:
+        Config.INDICATOR_CACHE_ENABLED = cache_enabled
+    return pd.DataFrame(rows)
+
+def _case_key(row):
+    return f"{row['benchmark']}/{row['bars']}x{row['symbols']}"
+
+def compare_to_baseline(results, baseline_file=Config.BENCHMARK_BASELINE_FILE, tolerance=Config.BENCHMARK_TOLERANCE):
+    """
+    Add the baseline throughput and the relative change to every result.
+
+    :param results: Output of run_suite.
+    :param baseline_file: JSON file written by save_baseline.
+    :param tolerance: Allowed throughput drop as a fraction before a case counts as a regression.
+    :return: Results with 'baseline_bars_per_second', 'change_pct' and 'regression' columns.
+    """
+    baseline = {}
+    if os.path.exists(baseline_file):
+        with open(baseline_file) as f:
+            baseline = json.load(f)['results']
+    results = results.copy()
+    results['baseline_bars_per_second'] = [baseline.get(_case_key(row), np.nan) for _, row in results.iterrows()]
+    results['change_pct'] = (results['bars_per_second'] / results['baseline_bars_per_second'] - 1) * 100
+    results['regression'] = results['change_pct'] < -tolerance * 100
+    return results
+
+def save_baseline(results, baseline_file=Config.BENCHMARK_BASELINE_FILE):
+    """
+    Store the throughput of every case as the new baseline, keeping cases not in this run.
+
+    :param results: Output of run_suite.
+    :param baseline_file: Output JSON file.
+    """
+    baseline = {}
+    if os.path.exists(baseline_file):
+        with open(baseline_file) as f:
+            baseline = json.load(f)['results']
+    baseline.update({_case_key(row): row['bars_per_second'] for _, row in results.iterrows()})
+    if os.path.dirname(baseline_file):
+        os.makedirs(os.path.dirname(baseline_file), exist_ok=True)
+    with open(baseline_file, 'w') as f:
+        json.dump({'saved_at': pd.Timestamp.now(tz='UTC').isoformat(), 'results': baseline}, f, indent=2, sort_keys=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline throughput benchmarks on synthetic candles.")
+    parser.add_argument('--suite', choices=list(SUITES), default='small')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--no-fetch', action='store_true', help="Skip the fake kline server benchmark.")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline.")
+    parser.add_argument('--output', help="Also write the results to this JSON file.")
+    args = parser.parse_args()
+
+    results = compare_to_baseline(run_suite(args.suite, args.repeats, not args.no_fetch))
+    pd.set_option('display.width', 200)
+    print(results.to_string(index=False, float_format=lambda v: f"{v:,.4g}"))
+    if args.output:
+        results.to_json(args.output, orient='records', indent=2)
+    if args.save_baseline:
+        save_baseline(results)
+        print(f"Baseline saved to {Config.BENCHMARK_BASELINE_FILE}.")
+    elif results['regression'].any():
+        print(f"Regressions beyond {Config.BENCHMARK_TOLERANCE:.0%}: {list(results.loc[results['regression'], 'benchmark'])}")
+        raise SystemExit(1)
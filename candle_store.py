@@ -0,0 +1,168 @@
+import json
+import logging
+import os
+import pandas as pd
+from config import Config
+from candles import STORE_PRICE_DTYPE, to_price_dtype
+
+logger = logging.getLogger(__name__)
+
+def merge_ranges(ranges):
+    """
+    Merge overlapping or adjacent [start_ms, end_ms] ranges.
+
+    :param ranges: Iterable of [start_ms, end_ms] pairs (inclusive).
+    :return: Sorted list of merged [start_ms, end_ms] ranges.
+    """
+    merged = []
+    for range_start, range_end in sorted([int(a), int(b)] for a, b in ranges):
+        if merged and range_start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], range_end)
+        else:
+            merged.append([range_start, range_end])
+    return merged
+
+def subtract_ranges(coverage, start_ts, end_ts):
+    """
+    Return the parts of [start_ts, end_ts] not contained in the coverage.
+
+    :param coverage: Sorted, merged list of [start_ms, end_ms] ranges.
+    :param start_ts: Range start in milliseconds.
+    :param end_ts: Range end in milliseconds (inclusive).
+    :return: List of (start_ms, end_ms) tuples.
+    """
+    missing = []
+    cursor = start_ts
+    for range_start, range_end in coverage:
+        if range_end < cursor:
+            continue
+        if range_start > end_ts:
+            break
+        if range_start > cursor:
+            missing.append((cursor, range_start - 1))
+        cursor = max(cursor, range_end + 1)
+    if cursor <= end_ts:
+        missing.append((cursor, end_ts))
+    return missing
+
+class CandleStore:
+    def __init__(self, root=Config.CANDLE_STORE_DIR):
+        """
+        Persistent OHLCV store, one Parquet file per symbol/interval/month.
+
+        Next to the partitions each symbol/interval keeps a coverage file listing
+        the millisecond ranges that were already requested from the API. Ranges
+        that returned no candles (before listing, exchange downtime) are covered
+        too, so they are never downloaded again.
+
+        :param root: Root directory of the store.
+        """
+        self.root = root
+
+    def _series_dir(self, symbol, interval):
+        return os.path.join(self.root, symbol, interval)
+
+    def _partition_path(self, symbol, interval, month):
+        return os.path.join(self._series_dir(symbol, interval), f"{month}.parquet")
+
+    def _coverage_path(self, symbol, interval):
+        return os.path.join(self._series_dir(symbol, interval), "coverage.json")
+
+    def get_coverage(self, symbol, interval):
+        """
+        :return: Sorted list of merged [start_ms, end_ms] ranges already fetched.
+        """
+        path = self._coverage_path(symbol, interval)
+        if not os.path.exists(path):
+            return []
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def mark_covered(self, symbol, interval, start_ts, end_ts):
+        """
+        Record that [start_ts, end_ts] has been fetched.
+
+        :param start_ts: Range start in milliseconds.
+        :param end_ts: Range end in milliseconds (inclusive).
+        """
+        if end_ts < start_ts:
+            return
+        merged = merge_ranges(self.get_coverage(symbol, interval) + [[start_ts, end_ts]])
+
+        def _write_json(tmp_path):
+            with open(tmp_path, 'w') as f:
+                json.dump(merged, f)
+
+        os.makedirs(self._series_dir(symbol, interval), exist_ok=True)
+        self._atomic_write(self._coverage_path(symbol, interval), _write_json)
+
+    def missing_ranges(self, symbol, interval, start_ts, end_ts):
+        """
+        Return the parts of [start_ts, end_ts] that are not covered yet.
+
+        :param start_ts: Range start in milliseconds.
+        :param end_ts: Range end in milliseconds (inclusive).
+        :return: List of (start_ms, end_ms) tuples to download.
+        """
+        return subtract_ranges(self.get_coverage(symbol, interval), start_ts, end_ts)
+
+    def write(self, symbol, interval, df):
+        """
+        Merge candles into their monthly partitions. Existing rows with the same
+        open time are replaced.
+
+        :param symbol: Trading pair symbol (e.g., 'SOLUSDT').
+        :param interval: Data interval (e.g., '1h').
+        :param df: DataFrame indexed by open time. Float columns are stored as float64.
+        """
+        if df.empty:
+            return
+        # float32 in-memory frames must not lower the precision of what is persisted
+        df = to_price_dtype(df, STORE_PRICE_DTYPE)
+        os.makedirs(self._series_dir(symbol, interval), exist_ok=True)
+
+        for month, part in df.groupby(df.index.strftime('%Y-%m')):
+            path = self._partition_path(symbol, interval, month)
+            if os.path.exists(path):
+                part = pd.concat([pd.read_parquet(path), part])
+                part = part[~part.index.duplicated(keep='last')]
+            part = part.sort_index()
+            self._atomic_write(path, part.to_parquet)
+        logger.debug("Stored %d candles for %s %s.", len(df), symbol, interval)
+
+    def load(self, symbol, interval, start=None, end=None, columns=None):
+        """
+        Load a time slice, reading only the months and columns that are needed.
+
+        :param symbol: Trading pair symbol (e.g., 'SOLUSDT').
+        :param interval: Data interval (e.g., '1h').
+        :param start: Slice start (anything pd.Timestamp accepts). None for the beginning.
+        :param end: Slice end (inclusive). None for the end.
+        :param columns: Columns to read. None for all.
+        :return: DataFrame indexed by open time.
+        """
+        series_dir = self._series_dir(symbol, interval)
+        if not os.path.isdir(series_dir):
+            return pd.DataFrame()
+
+        first_month = pd.Timestamp(start).strftime('%Y-%m') if start is not None else None
+        last_month = pd.Timestamp(end).strftime('%Y-%m') if end is not None else None
+        parts = []
+        for name in sorted(os.listdir(series_dir)):
+            if not name.endswith('.parquet'):
+                continue
+            month = name[:-len('.parquet')]
+            if (first_month and month < first_month) or (last_month and month > last_month):
+                continue
+            parts.append(pd.read_parquet(os.path.join(series_dir, name), columns=columns, memory_map=True))
+
+        if not parts:
+            return pd.DataFrame()
+        df = pd.concat(parts) if len(parts) > 1 else parts[0]
+        return df.loc[start:end]
+
+    @staticmethod
+    def _atomic_write(path, write_func):
+        tmp_path = f"{path}.tmp"
+        write_func(tmp_path)
+        os.replace(tmp_path, path)
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+from config import Config
+
+# (column name, position in a raw /api/v3/klines row, dtype); None means the price dtype
+OHLCV_FIELDS = [
+    ('open', 1, None), ('high', 2, None), ('low', 3, None), ('close', 4, None), ('volume', 5, None)
+]
+EXTENDED_FIELDS = [
+    ('quote_asset_volume', 7, None),
+    ('number_of_trades', 8, np.int32),
+    ('taker_buy_base_asset_volume', 9, None),
+    ('taker_buy_quote_asset_volume', 10, None)
+]
+
+# Length of one candle for every supported interval, in milliseconds
+# '1M' has no fixed length; 31 days is used so a page never undershoots a month
+INTERVAL_MS = {
+    '1m': 60_000, '3m': 3 * 60_000, '5m': 5 * 60_000, '15m': 15 * 60_000, '30m': 30 * 60_000,
+    '1h': 3_600_000, '2h': 2 * 3_600_000, '4h': 4 * 3_600_000, '6h': 6 * 3_600_000,
+    '8h': 8 * 3_600_000, '12h': 12 * 3_600_000, '1d': 86_400_000, '3d': 3 * 86_400_000,
+    '1w': 7 * 86_400_000, '1M': 31 * 86_400_000
+}
+
+# Candles written to the candle store or database are parsed at full precision;
+# Config.CANDLE_PRICE_DTYPE only applies to frames handed to callers
+STORE_PRICE_DTYPE = 'float64'
+
+def to_price_dtype(df, price_dtype=Config.CANDLE_PRICE_DTYPE):
+    """
+    Cast the float columns of a candle frame to the in-memory price dtype.
+
+    :param df: Candle DataFrame (e.g., loaded from the candle store).
+    :param price_dtype: Target dtype of the float columns.
+    :return: The same frame if it already matches, else a cast copy.
+    """
+    floats = [c for c, dtype in df.dtypes.items() if dtype.kind == 'f' and dtype != np.dtype(price_dtype)]
+    if not floats:
+        return df
+    return df.astype({c: price_dtype for c in floats})
+
+def candle_fields(extended=Config.KEEP_EXTENDED_KLINE_FIELDS, price_dtype=Config.CANDLE_PRICE_DTYPE):
+    """
+    :param extended: Include the quote volume, trade count and taker-buy fields.
+    :param price_dtype: dtype of the OHLCV columns.
+    :return: List of (column name, row position, NumPy dtype).
+    """
+    fields = OHLCV_FIELDS + (EXTENDED_FIELDS if extended else [])
+    return [(name, pos, np.dtype(dtype or price_dtype)) for name, pos, dtype in fields]
+
+class Candles:
+    def __init__(self, open_time, columns):
+        """
+        Compact columnar candle block: an int64 open-time array plus one typed
+        array per field.
+
+        Raw kline rows are 12 Python objects each, mostly decimal strings, which
+        makes a list of rows several times larger than the data it holds. A
+        Candles block parses each field straight into its final dtype, so a 1m
+        candle with the extended fields costs 76 bytes (44 with float32 prices).
+
+        :param open_time: int64 array of candle open times in milliseconds.
+        :param columns: Dictionary mapping column names to arrays of the same length.
+        """
+        self.open_time = open_time
+        self.columns = columns
+
+    @classmethod
+    def from_klines(cls, klines, extended=Config.KEEP_EXTENDED_KLINE_FIELDS, price_dtype=Config.CANDLE_PRICE_DTYPE):
+        """
+        Parse raw kline rows (e.g. one REST page) into typed column arrays.
+
+        :param klines: List of raw kline rows.
+        :param extended: Keep the quote volume, trade count and taker-buy fields.
+        :param price_dtype: dtype of the OHLCV columns.
+        :return: Candles instance.
+        """
+        n = len(klines)
+        open_time = np.fromiter((row[0] for row in klines), dtype=np.int64, count=n)
+        # NumPy parses the decimal strings directly into the target dtype; no float objects are created
+        columns = {
+            name: np.array([row[pos] for row in klines], dtype=dtype) if n else np.empty(0, dtype=dtype)
+            for name, pos, dtype in candle_fields(extended, price_dtype)
+        }
+        return cls(open_time, columns)
+
+    @classmethod
+    def concat(cls, blocks):
+        """
+        Join blocks in the given order.
+
+        :param blocks: Iterable of Candles with the same columns.
+        :return: Candles instance.
+        """
+        blocks = [b for b in blocks if b is not None and len(b)]
+        if not blocks:
+            return cls.from_klines([])
+        if len(blocks) == 1:
+            return blocks[0]
+        return cls(
+            np.concatenate([b.open_time for b in blocks]),
+            {name: np.concatenate([b.columns[name] for b in blocks]) for name in blocks[0].columns}
+        )
+
+    def __len__(self):
+        return len(self.open_time)
+
+    @property
+    def nbytes(self):
+        """
+        :return: Memory held by the arrays in bytes.
+        """
+        return self.open_time.nbytes + sum(a.nbytes for a in self.columns.values())
+
+    def filter(self, mask):
+        """
+        :param mask: Boolean array selecting candles.
+        :return: New Candles with the selected rows.
+        """
+        return Candles(self.open_time[mask], {name: a[mask] for name, a in self.columns.items()})
+
+    def to_dataframe(self, columns=None):
+        """
+        Wrap the arrays in a DataFrame indexed by open time without copying them.
+
+        :param columns: Columns to include. None for all.
+        :return: DataFrame indexed by 'timestamp'.
+        """
+        index = pd.DatetimeIndex(self.open_time.astype('datetime64[ms]').astype('datetime64[ns]'), name='timestamp')
+        names = columns or list(self.columns)
+        return pd.DataFrame({name: self.columns[name] for name in names}, index=index, copy=False)
@@ -8,6 +8,16 @@ class Config:
     # Logging configuration
     LOG_FILE = "logs/data_fetcher.log"
     DEBUG_MODE = False  # Set to False in production
+    LOG_LEVEL = "INFO"  # Level of every module without an entry in LOG_LEVELS (DEBUG when DEBUG_MODE is set)
+    LOG_LEVELS = {}  # Per-module levels, e.g. {"data_fetcher": "DEBUG", "websocket_stream": "WARNING"}
+    LOG_PROGRESS_INTERVAL = 10  # Seconds between progress summaries of long fetches
+    IMPORT_TIME_BUDGET = 1.0  # Seconds a cold `import main` may take (see import_budget.py)
+
+    # Run instrumentation
+    RUN_REPORT_DIR = "output/reports/"  # Where main.py writes its per-stage JSON run report
+    PROFILER = None  # None, "cprofile" or "pyinstrument" to profile main.py runs (also: main.py --profile)
+    BENCHMARK_BASELINE_FILE = "benchmark_baseline.json"  # Throughput baseline compared by benchmark.py
+    BENCHMARK_TOLERANCE = 0.2  # Throughput drop (fraction) that benchmark.py reports as a regression
 
     # Default trading pairs and time settings
     SYMBOL = "SOLUSDT"  # Main symbol to fetch data for
@@ -19,22 +29,85 @@ class Config:
     # Data fetching configuration
     DATA_FETCH_CHUNK_SIZE = 60 * 60 * 1000  # Chunk size in milliseconds (default 1 hour per fetch)
     MAX_API_RETRIES = 5  # Max retries for API calls
+    PAGED_KLINE_FETCH = True  # Size each request to a full klines page instead of DATA_FETCH_CHUNK_SIZE
+    KLINES_PAGE_LIMIT = 1000  # Maximum candles returned by a single /api/v3/klines request
+    BASE_API_URL = "https://api.binance.com/api/v3"  # REST endpoint used for kline pages
+    REQUEST_TIMEOUT = 10  # Seconds before a single HTTP request is abandoned
 
     # Multithreading and rate limit handling
     MAX_CONCURRENT_REQUESTS = 10  # Maximum concurrent API calls
     RATE_LIMIT_CHECK_INTERVAL = 60  # Interval in seconds to check rate limits
+    REQUEST_WEIGHT_LIMIT = 6000  # Binance request weight allowed per minute per IP
+    KLINES_REQUEST_WEIGHT = 2  # Request weight of one /api/v3/klines call (any limit up to 1000)
+
+    # Strategy and backtest settings
+    STRATEGY = "rrs"  # Registered strategy name (see strategy.STRATEGIES)
+    RRS_BUY_THRESHOLD = 1.02  # Buy when RRS rises above this value
+    RRS_SELL_THRESHOLD = 0.98  # Sell when RRS falls below this value
+    RRS_WINDOW = 12  # Lookback in bars for relative strength against the benchmark
+    RRS_METHOD = "ratio"  # 'ratio' (around 1), 'log' or 'real' (ATR-normalized, around 0)
+    SCANNER_QUOTE_ASSET = "USDT"  # Quote asset of the symbols the universe scanner covers
+    SCANNER_HISTORY_BARS = 500  # Bars kept in memory per symbol by the universe scanner
+    INITIAL_BALANCE = 10_000.0  # Starting cash for backtests
+    FEE = 0.001  # Fee per side as a fraction of traded value (0.1% Binance spot)
+    POSITION_SIZE = 1.0  # Fraction of equity invested on each entry
+    MAX_OPEN_POSITIONS = 10  # Concurrent positions in portfolio backtests; each entry targets 1/N of equity
+    SLIPPAGE_TICKS = 1  # Price ticks paid on every portfolio fill (buys above, sells below the close)
+    BATCH_COLUMNS_PER_PASS = 512  # Parameter sets simulated per array pass in batch backtests
+
+    # Indicator cache
+    INDICATOR_CACHE_ENABLED = True  # Reuse data_processor indicator arrays computed from identical data
+    INDICATOR_CACHE_MAX_BYTES = 256 * 1024 ** 2  # Memory budget of the in-process LRU tier
+    INDICATOR_CACHE_DIR = None  # Directory for the on-disk tier (e.g. "output/indicator_cache/"), None to disable
+
+    # Symbol metadata cache
+    EXCHANGE_INFO_CACHE_FILE = "output/exchange_info.json"  # On-disk copy of the exchangeInfo payload
+    EXCHANGE_INFO_TTL = 24 * 60 * 60  # Seconds before the cached exchangeInfo is refreshed
+
+    # Local candle store
+    USE_CANDLE_STORE = True  # Serve fetches from the on-disk store and download only missing ranges
+    CANDLE_STORE_DIR = "data/candles/"  # Root of the Parquet store (symbol/interval/YYYY-MM.parquet)
+    CANDLE_PRICE_DTYPE = "float64"  # In-memory dtype of price and volume columns; "float32" halves memory. The candle store always keeps float64
+    KEEP_EXTENDED_KLINE_FIELDS = True  # Keep quote volume, trade count and taker-buy volumes next to OHLCV
+    RESAMPLE_FROM_BASE = False  # Build coarser intervals from stored base candles instead of fetching each interval
+    RESAMPLE_BASE_INTERVAL = "1m"  # Interval fetched and stored when RESAMPLE_FROM_BASE is enabled
+    RESAMPLE_CACHE_SIZE = 64  # Resampled (symbol, interval) frames kept in memory
 
     # CSV Output
     SAVE_CSV = True  # Set to False if you don't want to save fetched data as CSV
     OUTPUT_DIR = "output/"  # Directory to save CSV files
 
+    # Charts
+    PLOT_DIR = "output/plots/"  # Directory of charts written by Visualizer.render_batch
+    PLOT_FIGSIZE = (14, 7)  # Figure size in inches
+    PLOT_DPI = 100  # Saved image resolution; PLOT_FIGSIZE[0] * PLOT_DPI is the pixel width series are downsampled to
+    PLOT_DOWNSAMPLE = "minmax"  # "minmax" (keeps every spike), "lttb" (smoother shape) or None to draw every bar
+    PLOT_WORKERS = None  # Processes of Visualizer.render_batch; None uses all cores
+
     # Advanced configurations
     USE_WEBSOCKETS = False  # Enable WebSocket support for live data
+    WEBSOCKET_URL = "wss://stream.binance.com:9443"  # Base URL of the combined kline streams
+    WEBSOCKET_STREAMS_PER_CONNECTION = 200  # Streams multiplexed on one connection (Binance allows 1024)
+    WEBSOCKET_FLUSH_INTERVAL = 60  # Seconds between candle store flushes of streamed candles
     RATE_LIMIT_WARNING_THRESHOLD = 80  # Percentage of rate limit usage to trigger warnings
     DATABASE_ENABLED = False  # If True, save data to a database instead of CSV
     DATABASE_URI = "sqlite:///data_fetcher.db"  # Database connection URI (e.g., SQLite, PostgreSQL)
+    DATABASE_BATCH_SIZE = 10_000  # Rows per executemany batch for bulk upserts
 
     # Derived settings
+    @staticmethod
+    def validate():
+        """
+        Create the log/output directories and check the settings.
+
+        Called by entry points (main.py, module __main__ blocks) rather than at
+        import, so importing any module stays free of side effects.
+        """
+        Config.create_directories()
+        Config.validate_api_keys()
+        Config.validate_timeframe()
+        Config.validate_date_range()
+
     @staticmethod
     def create_directories():
         """
@@ -83,9 +156,3 @@ class Config:
                 raise ValueError("START_DATE must be earlier than END_DATE.")
         except Exception as e:
             raise ValueError(f"Invalid date range: {e}")
-
-# Ensure necessary directories are created and configurations are validated
-Config.create_directories()
-Config.validate_api_keys()
-Config.validate_timeframe()
-Config.validate_date_range()
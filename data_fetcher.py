@@ -1,37 +1,87 @@
 import pandas as pd
-from binance.client import Client
 import asyncio
 import os
 import logging
+import threading
+import time as timer
+import weakref
+import requests
 from config import Config
-from binance.exceptions import BinanceAPIException
+from rate_limiter import WeightRateLimiter
+from exchange_info import ExchangeInfoCache
+from candles import INTERVAL_MS, STORE_PRICE_DTYPE, Candles, to_price_dtype
+from resampler import Resampler, RESAMPLE_INTERVAL_MS
 from datetime import time
-# Ensure logging directory exists
-log_dir = os.path.dirname(Config.LOG_FILE)
-if log_dir and not os.path.exists(log_dir):
-    os.makedirs(log_dir)
-
-# Set up logging
-logging.basicConfig(
-    filename=Config.LOG_FILE,
-    level=logging.DEBUG,  # Keep detailed logs even in production mode
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    filemode="a"
-)
-
-# Add console logging
-console = logging.StreamHandler()
-console.setLevel(logging.DEBUG if Config.DEBUG_MODE else logging.INFO)
-formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-console.setFormatter(formatter)
-logging.getLogger("").addHandler(console)
-
-# Initialize Binance client
-client = Client(Config.API_KEY, Config.API_SECRET)
-
-# Ensure output directory exists
-if not os.path.exists(Config.OUTPUT_DIR):
-    os.makedirs(Config.OUTPUT_DIR, exist_ok=True)
+from logging_setup import ProgressLog
+
+logger = logging.getLogger(__name__)
+
+# Process-wide objects are created on first use, so importing this module never touches the
+# network or the disk and does not pay for importing python-binance (about half a second)
+_client = None
+_candle_store = None
+_resampler = None
+_init_lock = threading.Lock()
+
+def get_client():
+    """
+    :return: Shared binance.client.Client, created (and the API pinged) on the first call.
+    """
+    global _client
+    with _init_lock:
+        if _client is None:
+            from binance.client import Client
+            _client = Client(Config.API_KEY, Config.API_SECRET)
+    return _client
+
+def get_candle_store():
+    """
+    Local OHLCV store consulted before any kline download: the database when
+    enabled, else Parquet files.
+
+    :return: KlineDatabase, CandleStore or None when both are disabled.
+    """
+    global _candle_store
+    with _init_lock:
+        if _candle_store is None:
+            if Config.DATABASE_ENABLED:
+                from database import KlineDatabase
+                _candle_store = KlineDatabase(Config.DATABASE_URI)
+            elif Config.USE_CANDLE_STORE:
+                from candle_store import CandleStore
+                _candle_store = CandleStore()
+    return _candle_store
+
+def get_resampler():
+    """
+    :return: Resampler building coarser intervals from the stored base candles, or None without a store.
+    """
+    global _resampler
+    store = get_candle_store()
+    with _init_lock:
+        if _resampler is None and store is not None:
+            _resampler = Resampler(store, Config.RESAMPLE_BASE_INTERVAL)
+    return _resampler
+
+def __getattr__(name):
+    # Keep data_fetcher.client / .candle_store / .resampler working for existing callers
+    getters = {'client': get_client, 'candle_store': get_candle_store, 'resampler': get_resampler}
+    if name in getters:
+        return getters[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Symbol metadata, downloaded once and shared by every fetch
+exchange_info = ExchangeInfoCache(lambda: get_client().get_exchange_info())
+
+# Shared HTTP session and weight budget for concurrent kline page requests
+http_session = requests.Session()
+rate_limiter = WeightRateLimiter()
+
+# One concurrency gate per event loop, sized by Config.MAX_CONCURRENT_REQUESTS
+_request_semaphores = weakref.WeakKeyDictionary()
+
+# Periodic summary of page downloads in place of a log line per page
+download_progress = ProgressLog(logger, "Kline download")
 
 # Function to validate trading pair and interval
 # Ensures that the given symbol and interval are supported by the Binance API
@@ -44,8 +94,7 @@ def validate_symbol_and_interval(symbol, interval):
     :raises ValueError: If validation fails.
     """
     try:
-        info = client.get_exchange_info()
-        valid_symbols = {s['symbol'] for s in info['symbols']}
+        valid_symbols = exchange_info.symbols()
         valid_intervals = [
             '1m', '3m', '5m', '15m', '30m', '1h', '2h', '4h',
             '6h', '8h', '12h', '1d', '3d', '1w', '1M'
@@ -56,31 +105,264 @@ def validate_symbol_and_interval(symbol, interval):
         if interval not in valid_intervals:
             raise ValueError(f"Invalid interval: {interval}. Supported intervals: {valid_intervals}")
     except Exception as e:
-        logging.error(f"Error validating symbol and interval: {e}")
+        logger.error(f"Error validating symbol and interval: {e}")
         raise
 
+def interval_to_milliseconds(interval):
+    """
+    Convert a Binance interval string to its candle length in milliseconds.
+
+    :param interval: Data interval (e.g., '1h').
+    :return: Candle length in milliseconds.
+    :raises ValueError: If the interval is not supported.
+    """
+    try:
+        return INTERVAL_MS[interval]
+    except KeyError:
+        raise ValueError(f"Invalid interval: {interval}. Supported intervals: {list(INTERVAL_MS)}")
+
+def page_window_ms(interval, limit=Config.KLINES_PAGE_LIMIT):
+    """
+    Width of a request window that returns exactly one full klines page.
+
+    :param interval: Data interval (e.g., '1h').
+    :param limit: Candles per page (the API maximum is 1000).
+    :return: Window width in milliseconds.
+    """
+    return interval_to_milliseconds(interval) * limit
+
+def split_into_windows(start_ts, end_ts, window):
+    """
+    Split [start_ts, end_ts] into consecutive non-overlapping request windows.
+
+    :param start_ts: Range start in milliseconds.
+    :param end_ts: Range end in milliseconds (inclusive).
+    :param window: Window width in milliseconds.
+    :return: List of (window_start, window_end) tuples.
+    """
+    return [(ts, min(ts + window - 1, end_ts)) for ts in range(start_ts, end_ts + 1, window)]
+
+def _get_request_semaphore():
+    loop = asyncio.get_running_loop()
+    semaphore = _request_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_REQUESTS)
+        _request_semaphores[loop] = semaphore
+    return semaphore
+
+def request_klines(symbol, interval, start_ts, end_ts, limit=Config.KLINES_PAGE_LIMIT):
+    """
+    Blocking GET of one klines page from the public REST endpoint.
+
+    :param symbol: Trading pair symbol (e.g., 'SOLUSDT').
+    :param interval: Data interval (e.g., '1h').
+    :param start_ts: Window start in milliseconds.
+    :param end_ts: Window end in milliseconds.
+    :param limit: Maximum candles to return.
+    :return: Tuple of (raw kline rows, response headers).
+    :raises BinanceAPIException: If the API answers with an error status.
+    """
+    response = http_session.get(
+        f"{Config.BASE_API_URL}/klines",
+        params={'symbol': symbol, 'interval': interval, 'startTime': start_ts, 'endTime': end_ts, 'limit': limit},
+        timeout=Config.REQUEST_TIMEOUT
+    )
+    if response.status_code >= 400:
+        from binance.exceptions import BinanceAPIException
+        raise BinanceAPIException(response, response.status_code, response.text)
+    return response.json(), response.headers
+
+async def fetch_page_async(symbol, interval, start_ts, end_ts, max_retries=3):
+    """
+    Fetch one klines page without blocking the event loop.
+
+    The HTTP call runs in a worker thread behind the shared weight limiter and
+    concurrency gate. On HTTP 429/418 or error -1003 the limiter is paused for
+    the server's Retry-After instead of a fixed sleep, at most
+    Config.MAX_API_RETRIES times per page.
+
+    :param symbol: Trading pair symbol (e.g., 'SOLUSDT').
+    :param interval: Data interval (e.g., '1h').
+    :param start_ts: Window start in milliseconds.
+    :param end_ts: Window end in milliseconds.
+    :param max_retries: Maximum number of retries for transient errors.
+    :return: List of raw kline rows, or None if the window could not be fetched.
+    """
+    from binance.exceptions import BinanceAPIException
+
+    semaphore = _get_request_semaphore()
+    retries = rate_limited = 0
+    while True:
+        await rate_limiter.acquire(Config.KLINES_REQUEST_WEIGHT)
+        try:
+            async with semaphore:
+                logger.debug("Fetching chunk from %d to %d for %s", start_ts, end_ts, symbol)
+                klines, headers = await asyncio.to_thread(request_klines, symbol, interval, start_ts, end_ts)
+            rate_limiter.record(Config.KLINES_REQUEST_WEIGHT)
+            rate_limiter.update_from_headers(headers)
+            download_progress.add(requests=1, candles=len(klines))
+            return klines
+
+        except BinanceAPIException as api_error:
+            # The server answered, so the request counts against the weight used
+            rate_limiter.record(Config.KLINES_REQUEST_WEIGHT)
+            if api_error.status_code in (418, 429) or api_error.code == -1003:  # Rate limit exceeded
+                rate_limited += 1
+                if rate_limited > Config.MAX_API_RETRIES:
+                    logger.error(f"Still rate limited after {Config.MAX_API_RETRIES} retries for chunk starting at {start_ts} for {symbol}. Skipping...")
+                    return None
+                retry_after = int(api_error.response.headers.get('Retry-After', 1))
+                logger.warning(f"Rate limit exceeded. Pausing requests for {retry_after} seconds...")
+                rate_limiter.pause(retry_after)
+                continue
+            logger.error(f"Binance API error for {symbol}: {api_error}")
+            raise  # Re-raise non-rate-limit errors
+
+        except Exception as e:
+            retries += 1
+            if retries > max_retries:
+                logger.error(f"Max retries exceeded for chunk starting at {start_ts} for {symbol}. Skipping...")
+                return None
+            logger.error(f"Error fetching data chunk for {symbol}: {e}. Retrying ({retries}/{max_retries})...")
+            await asyncio.sleep(min(2 ** retries, 30))
+
 # Function to save fetched data to a CSV file
 # Saves the DataFrame to the output directory defined in the configuration
 def save_data_to_csv(df, symbol):
     try:
+        os.makedirs(Config.OUTPUT_DIR, exist_ok=True)
         output_file = os.path.join(Config.OUTPUT_DIR, f"{symbol}_data.csv")
-        logging.debug(f"Attempting to save data to {output_file}. DataFrame size: {df.shape}")
+        logger.debug("Attempting to save data to %s. DataFrame size: %s", output_file, df.shape)
         
         if df.empty:
-            logging.warning(f"No data to save for {symbol}. Skipping CSV write.")
+            logger.warning(f"No data to save for {symbol}. Skipping CSV write.")
             return
         
         df.to_csv(output_file, index=True)
-        logging.info(f"Data for {symbol} successfully saved to {output_file}.")
+        logger.info(f"Data for {symbol} successfully saved to {output_file}.")
     except Exception as e:
-        logging.error(f"Error saving data for {symbol}: {e}", exc_info=True)
+        logger.error(f"Error saving data for {symbol}: {e}", exc_info=True)
+
+# Column layout of a raw /api/v3/klines row
+KLINE_COLUMNS = [
+    'timestamp', 'open', 'high', 'low', 'close', 'volume',
+    'close_time', 'quote_asset_volume', 'number_of_trades',
+    'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
+]
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+def klines_to_dataframe(klines, price_dtype=Config.CANDLE_PRICE_DTYPE):
+    """
+    Convert raw kline rows into a compact DataFrame indexed by open time.
+
+    :param klines: List of raw kline rows.
+    :param price_dtype: dtype of the price and volume columns; use STORE_PRICE_DTYPE for frames that get stored.
+    :return: DataFrame with 'open', 'high', 'low', 'close', 'volume' columns in price_dtype,
+             plus the taker-buy and trade-count fields if Config.KEEP_EXTENDED_KLINE_FIELDS.
+    """
+    return Candles.from_klines(klines, price_dtype=price_dtype).to_dataframe()
+
+def _klines_to_store_dataframe(klines):
+    return klines_to_dataframe(klines, STORE_PRICE_DTYPE)
+
+def _request_window_ms(interval):
+    if Config.PAGED_KLINE_FETCH:
+        # One full page of candles per request
+        return page_window_ms(interval)
+    # A window must never hold more candles than one page can return
+    return min(Config.DATA_FETCH_CHUNK_SIZE, page_window_ms(interval))
+
+async def fetch_range_async(symbol, interval, start_ts, end_ts, max_retries=3):
+    """
+    Fetch every candle in [start_ts, end_ts] as concurrently fetched pages.
+
+    :param symbol: Trading pair symbol (e.g., 'SOLUSDT').
+    :param interval: Data interval (e.g., '1h').
+    :param start_ts: Range start in milliseconds.
+    :param end_ts: Range end in milliseconds (inclusive).
+    :param max_retries: Maximum number of retries for transient errors.
+    :return: Tuple of (raw kline rows in time order, list of (start_ms, end_ms) windows fetched successfully).
+    """
+    windows = split_into_windows(start_ts, end_ts, _request_window_ms(interval))
+
+    # Windows do not overlap, so pages can be fetched in parallel and concatenated in order
+    pages = await asyncio.gather(*(
+        fetch_page_async(symbol, interval, window_start, window_end, max_retries)
+        for window_start, window_end in windows
+    ))
+    rows = [row for page in pages if page for row in page]
+    fetched_windows = [w for w, page in zip(windows, pages) if page is not None]
+    return rows, fetched_windows
+
+async def _fetch_page_candles_async(symbol, interval, start_ts, end_ts, max_retries, price_dtype):
+    klines = await fetch_page_async(symbol, interval, start_ts, end_ts, max_retries)
+    return None if klines is None else Candles.from_klines(klines, price_dtype=price_dtype)
+
+async def fetch_candles_async(symbol, interval, start_ts, end_ts, max_retries=3, price_dtype=Config.CANDLE_PRICE_DTYPE):
+    """
+    Fetch every candle in [start_ts, end_ts] into a compact Candles block.
+
+    Each page is parsed into typed arrays as soon as it arrives, so at most a
+    few pages of raw rows are alive at once instead of the whole range.
+
+    :param symbol: Trading pair symbol (e.g., 'SOLUSDT').
+    :param interval: Data interval (e.g., '1h').
+    :param start_ts: Range start in milliseconds.
+    :param end_ts: Range end in milliseconds (inclusive).
+    :param max_retries: Maximum number of retries for transient errors.
+    :param price_dtype: dtype of the price and volume arrays.
+    :return: Tuple of (Candles in time order, list of (start_ms, end_ms) windows fetched successfully).
+    """
+    windows = split_into_windows(start_ts, end_ts, _request_window_ms(interval))
+    pages = await asyncio.gather(*(
+        _fetch_page_candles_async(symbol, interval, window_start, window_end, max_retries, price_dtype)
+        for window_start, window_end in windows
+    ))
+    fetched_windows = [w for w, page in zip(windows, pages) if page is not None]
+    return Candles.concat(pages), fetched_windows
+
+async def _fetch_into_store_async(symbol, interval, start_ts, end_ts, max_retries):
+    """
+    Download only the parts of the range missing from the candle store and append them.
+
+    :return: Tuple of (rows downloaded, requests made).
+    """
+    candle_store = get_candle_store()
+    missing = candle_store.missing_ranges(symbol, interval, start_ts, end_ts)
+    if not missing:
+        logger.debug("%s %s fully served from the candle store.", symbol, interval)
+        return 0, 0
+
+    # The currently open candle is still changing; neither store it nor mark it covered
+    now_ms = int(timer.time() * 1000)
+    open_candle_start = now_ms - now_ms % interval_to_milliseconds(interval)
+
+    results = await asyncio.gather(*(
+        fetch_candles_async(symbol, interval, range_start, range_end, max_retries, STORE_PRICE_DTYPE)
+        for range_start, range_end in missing
+    ))
+
+    row_count = request_count = 0
+    for candles, fetched_windows in results:
+        closed = candles.filter(candles.open_time < open_candle_start)
+        candle_store.write(symbol, interval, closed.to_dataframe())
+        for window_start, window_end in fetched_windows:
+            candle_store.mark_covered(symbol, interval, window_start, min(window_end, open_candle_start - 1))
+        row_count += len(closed)
+        request_count += len(fetched_windows)
+    return row_count, request_count
 
 # Function to fetch historical OHLCV data asynchronously
-# Retrieves data in chunks to avoid exceeding API limits
+# Serves the range from the candle store and downloads only what is missing, page windows in parallel
 async def fetch_data_async(symbol, start_date, end_date, interval=Config.TIMEFRAME, max_retries=3):
     """
     Fetch historical OHLCV data asynchronously with enhanced error handling and retries.
 
+    With Config.USE_CANDLE_STORE or Config.DATABASE_ENABLED, ranges already in the
+    local store are not downloaded again; a fully cached range does no network I/O.
+    With Config.RESAMPLE_FROM_BASE, intervals coarser than Config.RESAMPLE_BASE_INTERVAL
+    are resampled from the stored base candles instead of being fetched.
+
     :param symbol: Trading pair symbol (e.g., 'SOLUSDT').
     :param start_date: Start date for data (e.g., '2023-01-01').
     :param end_date: End date for data (e.g., '2023-02-01').
@@ -89,101 +371,111 @@ async def fetch_data_async(symbol, start_date, end_date, interval=Config.TIMEFRA
     :return: DataFrame containing the fetched data.
     """
     try:
-        validate_symbol_and_interval(symbol, interval)
-        logging.debug(f"Validation passed for symbol: {symbol}, interval: {interval}")
-
         start_ts = int(pd.Timestamp(start_date).timestamp() * 1000)
         end_ts = int(pd.Timestamp(end_date).timestamp() * 1000)
-        all_data = []
-        current_ts = start_ts
-
-        logging.info(f"Fetching data for {symbol} from {start_date} to {end_date} with interval {interval}")
-
-        while current_ts < end_ts:
-            retries = 0
-            while retries <= max_retries:
-                try:
-                    logging.debug(f"Fetching chunk from {current_ts} to {min(current_ts + Config.DATA_FETCH_CHUNK_SIZE, end_ts)} for {symbol}")
-                    klines = client.get_historical_klines(
-                        symbol, interval, current_ts, min(current_ts + Config.DATA_FETCH_CHUNK_SIZE, end_ts)
-                    )
-
-                    if not klines:
-                        logging.warning(f"No data returned for {symbol} in chunk {current_ts} to {end_ts}. Stopping fetch.")
-                        break
-
-                    all_data.extend(klines)
-                    current_ts = klines[-1][0] + 1
-                    logging.info(f"Fetched {len(klines)} rows for {symbol} in current chunk.")
-
-                    if len(all_data) % 1000 == 0:
-                        logging.info(f"Fetched {len(all_data)} total rows for {symbol} so far.")
-                    break  # Exit retry loop on success
-
-                except BinanceAPIException as api_error:
-                    if api_error.code == -1003:  # Rate limit exceeded
-                        logging.warning("Rate limit exceeded. Retrying after 60 seconds...")
-                        await asyncio.sleep(60)
-                    else:
-                        logging.error(f"Binance API error for {symbol}: {api_error}")
-                        raise  # Re-raise non-rate-limit errors
-
-                except Exception as e:
-                    retries += 1
-                    logging.error(f"Error fetching data chunk for {symbol}: {e}. Retrying ({retries}/{max_retries})...")
-                    if retries > max_retries:
-                        logging.error(f"Max retries exceeded for chunk starting at {current_ts}. Skipping...")
-                        current_ts += Config.DATA_FETCH_CHUNK_SIZE  # Skip problematic chunk
-                        break
-
-        if not all_data:
-            logging.warning(f"No data fetched for {symbol}. Returning empty DataFrame.")
+        started = timer.perf_counter()
+        candle_store = get_candle_store()
+        resampler = get_resampler()
+
+        if (Config.RESAMPLE_FROM_BASE and resampler is not None and interval != Config.RESAMPLE_BASE_INTERVAL
+                and interval in RESAMPLE_INTERVAL_MS):
+            # Only base candles are downloaded and stored; every coarser interval is derived from them
+            base_interval = Config.RESAMPLE_BASE_INTERVAL
+            if candle_store.missing_ranges(symbol, base_interval, start_ts, end_ts):
+                await asyncio.to_thread(validate_symbol_and_interval, symbol, base_interval)
+                await _fetch_into_store_async(symbol, base_interval, start_ts, end_ts, max_retries)
+            df = resampler.get(symbol, interval, pd.Timestamp(start_ts, unit='ms'), pd.Timestamp(end_ts, unit='ms'))
+            logger.info("Built %d %s bars for %s from %s candles.", len(df), interval, symbol, base_interval)
+            df = to_price_dtype(df)
+            df.attrs.update(symbol=symbol, interval=interval)
+            return df
+
+        if candle_store is not None and not candle_store.missing_ranges(symbol, interval, start_ts, end_ts):
+            df = candle_store.load(symbol, interval, pd.Timestamp(start_ts, unit='ms'), pd.Timestamp(end_ts, unit='ms'))
+            logger.info("Loaded %d rows for %s %s from the candle store.", len(df), symbol, interval)
+            df = to_price_dtype(df)
+            df.attrs.update(symbol=symbol, interval=interval)
+            return df
+
+        # The first validation may download exchangeInfo; keep it off the event loop
+        await asyncio.to_thread(validate_symbol_and_interval, symbol, interval)
+        logger.debug("Validation passed for symbol: %s, interval: %s", symbol, interval)
+        logger.debug("Fetching data for %s from %s to %s with interval %s", symbol, start_date, end_date, interval)
+
+        if candle_store is not None:
+            row_count, request_count = await _fetch_into_store_async(symbol, interval, start_ts, end_ts, max_retries)
+            df = to_price_dtype(candle_store.load(symbol, interval, pd.Timestamp(start_ts, unit='ms'), pd.Timestamp(end_ts, unit='ms')))
+        else:
+            candles, fetched_windows = await fetch_candles_async(symbol, interval, start_ts, end_ts, max_retries)
+            row_count, request_count = len(candles), len(fetched_windows)
+            df = candles.to_dataframe() if len(candles) else pd.DataFrame()
+
+        elapsed = max(timer.perf_counter() - started, 1e-9)
+        logger.info(
+            "Fetched %d rows for %s in %d requests (%.2fs, %.1f req/s, %.0f rows/s).",
+            row_count, symbol, request_count, elapsed, request_count / elapsed, row_count / elapsed
+        )
+
+        if df.empty:
+            logger.warning(f"No data fetched for {symbol}. Returning empty DataFrame.")
             return pd.DataFrame()
 
-        # Convert data to DataFrame
-        df = pd.DataFrame(all_data, columns=[
-            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_asset_volume', 'number_of_trades',
-            'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
-        ])
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df.set_index('timestamp', inplace=True)
-        df = df[['open', 'high', 'low', 'close', 'volume']].astype(float)
-        
-        logging.info(f"Data successfully fetched and converted to DataFrame for {symbol}.")
+        logger.debug("Data successfully fetched and converted to DataFrame for %s.", symbol)
+        df.attrs.update(symbol=symbol, interval=interval)
         return df
 
     except Exception as e:
-        logging.error(f"Error in fetch_data_async for {symbol}: {e}", exc_info=True)
+        logger.error(f"Error in fetch_data_async for {symbol}: {e}", exc_info=True)
         return pd.DataFrame()
 
+# Synchronous entry point used by main.py and scripts
+def fetch_data(symbol, start_date, end_date, interval=Config.TIMEFRAME):
+    """
+    Fetch historical OHLCV data for one symbol, blocking until done.
+
+    :param symbol: Trading pair symbol (e.g., 'SOLUSDT').
+    :param start_date: Start date for data (e.g., '2023-01-01').
+    :param end_date: End date for data (e.g., '2023-02-01').
+    :param interval: Data interval (e.g., '1h'). Defaults to Config.TIMEFRAME.
+    :return: DataFrame containing the fetched data.
+    """
+    return asyncio.run(fetch_data_async(symbol, start_date, end_date, interval))
+
 
 # Function to fetch data for multiple symbols concurrently
-# Executes the asynchronous fetch function for each symbol
-async def fetch_multiple_symbols_async(symbols, start_date, end_date):
+# All symbols share one weight budget and one concurrency gate, so the universe is fetched as fast as the limits allow
+async def fetch_multiple_symbols_async(symbols, start_date, end_date, interval=Config.TIMEFRAME):
     """
     Fetch data for multiple symbols concurrently.
 
     :param symbols: List of trading pair symbols.
     :param start_date: Start date for data (e.g., '2023-01-01').
     :param end_date: End date for data (e.g., '2023-02-01').
+    :param interval: Data interval (e.g., '1h'). Defaults to Config.TIMEFRAME.
     :return: Dictionary with symbols as keys and DataFrames as values.
     """
-    logging.info(f"Preparing to fetch data for symbols: {symbols}")
-    
+    logger.info("Preparing to fetch data for %d symbols.", len(symbols))
+
+    # Warm the symbol metadata cache once for the whole universe
+    await asyncio.to_thread(exchange_info.get)
+
     tasks = []
     for symbol in symbols:
-        logging.debug(f"Creating task for symbol: {symbol}")
-        tasks.append(fetch_data_async(symbol, start_date, end_date))
+        logger.debug("Creating task for symbol: %s", symbol)
+        tasks.append(fetch_data_async(symbol, start_date, end_date, interval))
     
     try:
         results = await asyncio.gather(*tasks, return_exceptions=True)
-        logging.debug(f"Data fetch completed for all symbols.")
+        download_progress.done()
+        logger.info(
+            "Data fetch completed for all symbols: %d requests, %d weight used.",
+            rate_limiter.request_count, rate_limiter.total_weight
+        )
         
         data = {}
         for symbol, result in zip(symbols, results):
             if isinstance(result, Exception):
-                logging.error(f"Error fetching data for {symbol}: {result}")
+                logger.error(f"Error fetching data for {symbol}: {result}")
                 data[symbol] = pd.DataFrame()  # Return empty DataFrame on error
             else:
                 data[symbol] = result
@@ -191,28 +483,64 @@ async def fetch_multiple_symbols_async(symbols, start_date, end_date):
         return data
 
     except Exception as e:
-        logging.error(f"Unexpected error during multiple symbol data fetch: {e}", exc_info=True)
+        logger.error(f"Unexpected error during multiple symbol data fetch: {e}", exc_info=True)
         return {}
 
+# Live candles over websockets, backfilled and stored through the same paths as REST fetches
+def stream_klines(symbols, interval=Config.TIMEFRAME, history=None):
+    """
+    Create a live kline stream for the given symbols.
+
+    Usage: ``async for bar in stream_klines(['SOLUSDT']): ...``
+
+    :param symbols: List of trading pair symbols.
+    :param interval: Data interval (e.g., '1h').
+    :param history: Optional dictionary of symbol -> DataFrame used to seed indicators and gap detection.
+    :return: websocket_stream.KlineStream instance.
+    """
+    from websocket_stream import KlineStream
+
+    stream = KlineStream(
+        symbols, interval, store=get_candle_store(), backfill=fetch_range_async,
+        interval_ms=interval_to_milliseconds(interval), to_dataframe=_klines_to_store_dataframe
+    )
+    if history:
+        stream.seed_indicators(history)
+    return stream
+
+async def _print_live_bars(symbols, history):
+    async for bar in stream_klines(symbols, history=history):
+        logger.info("%s %s close=%s RSI=%.2f", bar['symbol'], bar['timestamp'], bar['close'], bar['RSI'])
+
 if __name__ == "__main__":
+    from logging_setup import setup_logging
+
+    setup_logging()
+    Config.validate()
+
     # Main script to initiate data fetch
     # Fetches data for the configured symbols and saves the results to CSV files
     symbols = [Config.SYMBOL, Config.BENCHMARK_SYMBOL]
     start_date = Config.START_DATE
     end_date = Config.END_DATE
 
-    logging.info("Starting data fetch...")
+    logger.info("Starting data fetch...")
     print("Fetching data for symbols...")
 
     try:
-        logging.info("Starting data fetching for multiple symbols...")
+        logger.info("Starting data fetching for multiple symbols...")
         data = asyncio.run(fetch_multiple_symbols_async(symbols, start_date, end_date))
     
         for symbol, df in data.items():
             if df is not None and not df.empty:
-                logging.info(f"Fetched {len(df)} rows for {symbol}.")
-                save_data_to_csv(df, symbol)
+                logger.info(f"Fetched {len(df)} rows for {symbol}.")
+                if Config.SAVE_CSV and not Config.DATABASE_ENABLED:
+                    save_data_to_csv(df, symbol)
             else:
-                logging.warning(f"No data fetched for {symbol}.")
+                logger.warning(f"No data fetched for {symbol}.")
+
+        if Config.USE_WEBSOCKETS:
+            logger.info("Switching to live websocket ingestion...")
+            asyncio.run(_print_live_bars(symbols, data))
     except Exception as e:
-        logging.error(f"Error during data fetching or saving: {e}", exc_info=True)
+        logger.error(f"Error during data fetching or saving: {e}", exc_info=True)
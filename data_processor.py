@@ -3,18 +3,9 @@ import numpy as np
 import logging
 import os
 from config import Config
+from indicator_cache import indicator_cache
 
-# Set up logging for the data processor
-log_dir = Config.OUTPUT_DIR
-if log_dir and not os.path.exists(log_dir):
-    os.makedirs(log_dir)
-
-logging.basicConfig(
-    filename=os.path.join(Config.OUTPUT_DIR, "data_processor.log"),
-    level=logging.DEBUG if Config.DEBUG_MODE else logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    filemode="a"
-)
+logger = logging.getLogger(__name__)
 
 def validate_columns(df, required_columns):
     """
@@ -24,6 +15,25 @@ def validate_columns(df, required_columns):
     if missing_columns:
         raise ValueError(f"Missing required columns: {missing_columns}")
 
+def cached_indicator(df, name, params, source, compute):
+    """
+    Look an indicator up in the indicator cache, computing it on a miss.
+
+    The key covers the source values and their timestamps, so a cached array
+    is only reused for identical data. The symbol and interval recorded in
+    df.attrs by data_fetcher are part of the key when present.
+
+    :param df: Frame the indicator is added to.
+    :param name: Indicator name (e.g., 'SMA').
+    :param params: Dictionary of indicator parameters.
+    :param source: Series the indicator is computed from.
+    :param compute: Callable returning the indicator as a NumPy array.
+    :return: NumPy array of indicator values.
+    """
+    if not Config.INDICATOR_CACHE_ENABLED:
+        return compute()
+    return indicator_cache.memoize(name, params, source, compute, df.attrs.get('symbol'), df.attrs.get('interval'))
+
 def add_moving_averages(df, short_window=10, long_window=50):
     """
     Adds moving average columns to the DataFrame.
@@ -34,95 +44,765 @@ def add_moving_averages(df, short_window=10, long_window=50):
     :return: DataFrame with 'SMA_short' and 'SMA_long' columns added.
     """
     try:
-        df[f"SMA_{short_window}"] = df['close'].rolling(window=short_window).mean()
-        df[f"SMA_{long_window}"] = df['close'].rolling(window=long_window).mean()
+        for window in (short_window, long_window):
+            df[f"SMA_{window}"] = cached_indicator(
+                df, 'SMA', {'window': window}, df['close'],
+                lambda window=window: df['close'].rolling(window=window).mean().to_numpy()
+            )
+        return df
+    except Exception as e:
+        logger.error(f"Error adding moving averages: {e}")
+        raise
+
+def add_ema(df, span=20, column='close'):
+    """
+    Adds an exponential moving average column to the DataFrame.
+
+    :param df: Input DataFrame with the source column.
+    :param span: EMA span; the smoothing factor is 2 / (span + 1).
+    :param column: Source column.
+    :return: DataFrame with 'EMA_{span}' column added.
+    """
+    try:
+        df[f"EMA_{span}"] = cached_indicator(
+            df, 'EMA', {'span': span}, df[column], lambda: df[column].ewm(span=span, adjust=False).mean().to_numpy()
+        )
         return df
     except Exception as e:
-        logging.error(f"Error adding moving averages: {e}")
+        logger.error(f"Error adding EMA: {e}")
         raise
 
-def add_rsi(df, window=14):
+def wilder_average(values, window):
+    """
+    Wilder's smoothing: a simple mean of the first `window` values, then
+    avg = (prev_avg * (window - 1) + value) / window.
+
+    :param values: Float array; the first element is skipped (it has no price change).
+    :param window: Smoothing window.
+    :return: Float array of the same length, NaN until the seed is complete.
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) <= window:
+        return out
+    seed = values[1:window + 1].mean()
+    smoothed = pd.Series(np.concatenate(([seed], values[window + 1:]))).ewm(alpha=1 / window, adjust=False).mean()
+    out[window:] = smoothed.to_numpy()
+    return out
+
+def add_rsi(df, window=14, method='sma'):
     """
     Adds a Relative Strength Index (RSI) column to the DataFrame.
 
     :param df: Input DataFrame with 'close' prices.
     :param window: Window size for calculating RSI.
+    :param method: 'sma' for rolling-mean averages, 'wilder' for Wilder's smoothing.
     :return: DataFrame with 'RSI' column added.
     """
     try:
-        delta = df['close'].diff()
-        gain = np.where(delta > 0, delta, 0)
-        loss = np.where(delta < 0, -delta, 0)
-
-        avg_gain = pd.Series(gain).rolling(window=window).mean()
-        avg_loss = pd.Series(loss).rolling(window=window).mean()
-        
-        rs = avg_gain / avg_loss
-        df['RSI'] = 100 - (100 / (1 + rs))
+        if method not in ('sma', 'wilder'):
+            raise ValueError(f"Unknown RSI method: {method}")
+        df['RSI'] = cached_indicator(
+            df, 'RSI', {'window': window, 'method': method}, df['close'], lambda: _rsi(df['close'], window, method)
+        )
         return df
     except Exception as e:
-        logging.error(f"Error adding RSI: {e}")
+        logger.error(f"Error adding RSI: {e}")
         raise
 
-def process_data(df):
+def _rsi(close, window, method):
+    delta = close.diff().to_numpy()
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+
+    if method == 'wilder':
+        avg_gain = wilder_average(gain, window)
+        avg_loss = wilder_average(loss, window)
+    else:
+        avg_gain = pd.Series(gain).rolling(window=window).mean().to_numpy()
+        avg_loss = pd.Series(loss).rolling(window=window).mean().to_numpy()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+def process_data(df, short_window=10, long_window=50, rsi_window=14):
     """
     Main function to process raw OHLCV data. Includes:
     - Adding moving averages
     - Adding RSI
 
     :param df: Input DataFrame with raw OHLCV data.
+    :param short_window: Window size for the short moving average.
+    :param long_window: Window size for the long moving average.
+    :param rsi_window: Window size for calculating RSI.
     :return: Processed DataFrame with additional technical indicators.
     """
     try:
-        logging.info("Starting data processing...")
+        logger.info("Starting data processing...")
         
         # Validate required columns
         validate_columns(df, ['close'])
 
         # Add moving averages
-        df = add_moving_averages(df, short_window=10, long_window=50)
-        
+        df = add_moving_averages(df, short_window=short_window, long_window=long_window)
+
         # Add RSI
-        df = add_rsi(df, window=14)
+        df = add_rsi(df, window=rsi_window)
 
-        logging.info("Data processing completed successfully.")
+        logger.info("Data processing completed successfully.")
         return df
     except Exception as e:
-        logging.error(f"Error in process_data: {e}")
+        logger.error(f"Error in process_data: {e}")
         raise
 
-def save_processed_data(df, symbol):
+# Indicator library
+# Every add_* function adds its columns through the indicator cache. Recursive indicators are
+# either solved as a linear recurrence over arrays (KAMA, Heikin-Ashi) or run as loop kernels
+# over plain arrays that numba compiles when it is installed (PSAR, Half Trend).
+
+def _compiled(func):
+    """
+    Compile a loop kernel with numba on first use.
+
+    numba is a declared dependency (see README). Without it the kernel runs as
+    a plain Python loop, which gives the same values but takes about 2 s per
+    million bars, so a warning is logged the first time that happens.
+    """
+    compiled = None
+
+    def wrapper(*args):
+        nonlocal compiled
+        if compiled is None:
+            try:
+                from numba import njit
+                compiled = njit(cache=True)(func)
+            except ImportError:
+                logger.warning(f"numba is not installed; {func.__name__} runs as a slow Python loop (pip install numba).")
+                compiled = func
+        return compiled(*args)
+
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+def linear_recurrence(a, b, initial=0.0):
+    """
+    Solve y[t] = a[t] * y[t-1] + b[t] with array operations.
+
+    The series is cut into blocks; inside a block the solution is a cumulative
+    product and a cumulative sum, and only the carry between blocks is
+    propagated sequentially. Blocks are sized so their products stay above
+    1e-280, clear of the float64 underflow limit. A zero coefficient restarts
+    the recurrence: y[t] = b[t] and nothing before it carries over.
+
+    :param a: Coefficients, each in [0, 1].
+    :param b: Inputs.
+    :param initial: Value of y before the first element.
+    :return: Float array y.
+    """
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    n = len(a)
+    if n == 0:
+        return np.empty(0)
+    positive = a[a > 0]
+    smallest = positive.min() if len(positive) else 1.0
+    block = 256 if smallest >= 0.5 else max(1, min(256, int(-280 / np.log10(smallest))))
+    pad = -n % block
+    coef = np.concatenate((a, np.ones(pad))).reshape(-1, block)
+    inputs = np.concatenate((b, np.zeros(pad))).reshape(-1, block)
+
+    # Zeros are left out of the products and handled as resets below
+    zero = coef == 0
+    products = np.cumprod(np.where(zero, 1.0, coef), axis=1)
+    sums = np.cumsum(inputs / products, axis=1)
+    # Solution of every block when it starts from zero; after a reset only the
+    # inputs from the last zero onwards count
+    last_zero = np.maximum.accumulate(np.where(zero, np.arange(block), -1), axis=1)
+    before_reset = np.take_along_axis(sums, np.maximum(last_zero - 1, 0), axis=1)
+    partial = products * (sums - np.where(last_zero > 0, before_reset, 0.0))
+    # Weight of the incoming carry, gone once the block has seen a zero
+    carry_weight = np.where(last_zero >= 0, 0.0, products)
+
+    carry = np.empty(len(coef))
+    value = initial
+    for i in range(len(coef)):
+        carry[i] = value
+        value = carry_weight[i, -1] * value + partial[i, -1]
+    return (partial + carry_weight * carry[:, None]).ravel()[:n]
+
+def add_sma(df, window=20, column='close'):
+    """
+    Adds a simple moving average column to the DataFrame.
+
+    :param df: Input DataFrame with the source column.
+    :param window: Number of bars averaged.
+    :param column: Source column.
+    :return: DataFrame with 'SMA_{window}' column added.
+    """
+    df[f"SMA_{window}"] = cached_indicator(
+        df, 'SMA', {'window': window}, df[column], lambda: df[column].rolling(window=window).mean().to_numpy()
+    )
+    return df
+
+def add_wma(df, window=20, column='close'):
+    """
+    Adds a linearly weighted moving average column (weights 1..window, newest heaviest).
+
+    :param df: Input DataFrame with the source column.
+    :param window: Number of bars averaged.
+    :param column: Source column.
+    :return: DataFrame with 'WMA_{window}' column added.
+    """
+    def compute():
+        values = df[column].to_numpy(dtype=np.float64)
+        out = np.full(len(values), np.nan)
+        if len(values) >= window:
+            weights = np.arange(1, window + 1, dtype=np.float64)
+            out[window - 1:] = np.convolve(values, weights[::-1], mode='valid') / weights.sum()
+        return out
+
+    df[f"WMA_{window}"] = cached_indicator(df, 'WMA', {'window': window}, df[column], compute)
+    return df
+
+def add_macd(df, fast=12, slow=26, signal=9):
+    """
+    Adds MACD line, signal line and histogram columns.
+
+    :param df: Input DataFrame with 'close' prices.
+    :param fast: Fast EMA span.
+    :param slow: Slow EMA span.
+    :param signal: Signal EMA span.
+    :return: DataFrame with 'MACD', 'MACD_signal' and 'MACD_hist' columns added.
+    """
+    def compute():
+        close = df['close']
+        macd = close.ewm(span=fast, adjust=False).mean() - close.ewm(span=slow, adjust=False).mean()
+        macd_signal = macd.ewm(span=signal, adjust=False).mean()
+        return np.column_stack((macd, macd_signal, macd - macd_signal))
+
+    values = cached_indicator(df, 'MACD', {'fast': fast, 'slow': slow, 'signal': signal}, df['close'], compute)
+    df['MACD'], df['MACD_signal'], df['MACD_hist'] = values[:, 0], values[:, 1], values[:, 2]
+    return df
+
+def add_trix(df, window=15):
+    """
+    Adds the TRIX column: percent change of a triple-smoothed EMA.
+
+    :param df: Input DataFrame with 'close' prices.
+    :param window: EMA span of each smoothing pass.
+    :return: DataFrame with 'TRIX_{window}' column added.
+    """
+    def compute():
+        triple = df['close']
+        for _ in range(3):
+            triple = triple.ewm(span=window, adjust=False).mean()
+        return (triple.pct_change() * 100).to_numpy()
+
+    df[f"TRIX_{window}"] = cached_indicator(df, 'TRIX', {'window': window}, df['close'], compute)
+    return df
+
+def add_cmo(df, window=14):
+    """
+    Adds the Chande Momentum Oscillator: 100 * (gains - losses) / (gains + losses) over the window.
+
+    :param df: Input DataFrame with 'close' prices.
+    :param window: Lookback in bars.
+    :return: DataFrame with 'CMO_{window}' column added.
+    """
+    def compute():
+        delta = df['close'].diff().to_numpy()
+        gains = pd.Series(np.where(delta > 0, delta, 0.0)).rolling(window=window).mean().to_numpy()
+        losses = pd.Series(np.where(delta < 0, -delta, 0.0)).rolling(window=window).mean().to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cmo = 100 * (gains - losses) / (gains + losses)
+        cmo[:window] = np.nan  # The first bar has no price change
+        return cmo
+
+    df[f"CMO_{window}"] = cached_indicator(df, 'CMO', {'window': window}, df['close'], compute)
+    return df
+
+def add_aroon(df, window=25):
+    """
+    Adds Aroon up/down and the Aroon oscillator.
+
+    Aroon up is 100 * (window - bars since the highest high of the last
+    window + 1 bars) / window; Aroon down uses the lowest low. Ties count from
+    the most recent bar.
+
+    :param df: Input DataFrame with 'high' and 'low' prices.
+    :param window: Lookback in bars.
+    :return: DataFrame with 'Aroon_up', 'Aroon_down' and 'Aroon_osc' columns added.
+    """
+    def compute():
+        from numpy.lib.stride_tricks import sliding_window_view
+
+        out = np.full((len(df), 3), np.nan)
+        if len(df) > window:
+            # Reversed windows make argmax/argmin return the most recent extreme directly
+            highs = sliding_window_view(df['high'].to_numpy(dtype=np.float64), window + 1)[:, ::-1]
+            lows = sliding_window_view(df['low'].to_numpy(dtype=np.float64), window + 1)[:, ::-1]
+            up = 100 * (window - highs.argmax(axis=1)) / window
+            down = 100 * (window - lows.argmin(axis=1)) / window
+            out[window:] = np.column_stack((up, down, up - down))
+        return out
+
+    values = cached_indicator(df, 'Aroon', {'window': window}, df[['high', 'low']], compute)
+    df['Aroon_up'], df['Aroon_down'], df['Aroon_osc'] = values[:, 0], values[:, 1], values[:, 2]
+    return df
+
+def add_chaikin(df, fast=3, slow=10):
+    """
+    Adds the Chaikin oscillator: fast EMA minus slow EMA of the accumulation/distribution line.
+
+    :param df: Input DataFrame with 'high', 'low', 'close' and 'volume'.
+    :param fast: Fast EMA span.
+    :param slow: Slow EMA span.
+    :return: DataFrame with 'Chaikin' column added.
     """
-    Save the processed data to a CSV file.
+    def compute():
+        high, low, close, volume = (df[c].to_numpy(dtype=np.float64) for c in ('high', 'low', 'close', 'volume'))
+        spread = high - low
+        with np.errstate(divide='ignore', invalid='ignore'):
+            multiplier = np.where(spread > 0, ((close - low) - (high - close)) / spread, 0.0)
+        adl = pd.Series(np.cumsum(multiplier * volume))
+        return (adl.ewm(span=fast, adjust=False).mean() - adl.ewm(span=slow, adjust=False).mean()).to_numpy()
+
+    df['Chaikin'] = cached_indicator(
+        df, 'Chaikin', {'fast': fast, 'slow': slow}, df[['high', 'low', 'close', 'volume']], compute
+    )
+    return df
+
+def add_volume_spike(df, window=20, multiplier=2.0):
+    """
+    Flags bars whose volume is at least `multiplier` times the average of the previous `window` bars.
+
+    :param df: Input DataFrame with 'volume'.
+    :param window: Number of previous bars averaged.
+    :param multiplier: Ratio that counts as a spike.
+    :return: DataFrame with 'volume_ratio' and 'volume_spike' (0/1) columns added.
+    """
+    def compute():
+        volume = df['volume'].to_numpy(dtype=np.float64)
+        average = pd.Series(volume).rolling(window=window).mean().shift(1).to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(average > 0, volume / average, np.nan)
+
+    df['volume_ratio'] = cached_indicator(df, 'VolumeRatio', {'window': window}, df['volume'], compute)
+    df['volume_spike'] = (df['volume_ratio'] >= multiplier).astype(np.int8)
+    return df
+
+def add_heikin_ashi(df):
+    """
+    Adds Heikin-Ashi candles.
+
+    HA_open is the recursive average of the previous HA open and close, solved
+    as a linear recurrence instead of a row loop.
+
+    :param df: Input DataFrame with 'open', 'high', 'low' and 'close'.
+    :return: DataFrame with 'HA_open', 'HA_high', 'HA_low' and 'HA_close' columns added.
+    """
+    def compute():
+        open_, high, low, close = (df[c].to_numpy(dtype=np.float64) for c in ('open', 'high', 'low', 'close'))
+        ha_close = (open_ + high + low + close) / 4
+        if len(ha_close) == 0:
+            return np.empty((0, 4))
+        ha_open = np.empty(len(ha_close))
+        ha_open[0] = (open_[0] + close[0]) / 2
+        ha_open[1:] = linear_recurrence(np.full(len(ha_close) - 1, 0.5), ha_close[:-1] / 2, ha_open[0])
+        return np.column_stack((ha_open, np.maximum(high, np.maximum(ha_open, ha_close)),
+                                np.minimum(low, np.minimum(ha_open, ha_close)), ha_close))
+
+    values = cached_indicator(df, 'HeikinAshi', {}, df[['open', 'high', 'low', 'close']], compute)
+    df['HA_open'], df['HA_high'], df['HA_low'], df['HA_close'] = values.T
+    return df
+
+def add_kama(df, window=10, fast=2, slow=30):
+    """
+    Adds Kaufman's Adaptive Moving Average.
+
+    The smoothing constant follows the efficiency ratio of the last `window`
+    bars; the recursion KAMA += sc * (close - KAMA) is solved as a linear
+    recurrence. KAMA starts at the close of bar window - 1.
+
+    :param df: Input DataFrame with 'close' prices.
+    :param window: Efficiency ratio lookback.
+    :param fast: Fastest EMA span.
+    :param slow: Slowest EMA span.
+    :return: DataFrame with 'KAMA_{window}' column added.
+    """
+    def compute():
+        close = df['close'].to_numpy(dtype=np.float64)
+        out = np.full(len(close), np.nan)
+        if len(close) <= window:
+            return out
+        change = np.abs(close[window:] - close[:-window])
+        volatility = pd.Series(np.abs(np.diff(close))).rolling(window=window).sum().to_numpy()[window - 1:]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            efficiency = np.where(volatility > 0, change / volatility, 0.0)
+        fast_sc, slow_sc = 2 / (fast + 1), 2 / (slow + 1)
+        sc = (efficiency * (fast_sc - slow_sc) + slow_sc) ** 2
+        out[window - 1] = close[window - 1]
+        out[window:] = linear_recurrence(1 - sc, sc * close[window:], close[window - 1])
+        return out
+
+    df[f"KAMA_{window}"] = cached_indicator(df, 'KAMA', {'window': window, 'fast': fast, 'slow': slow}, df['close'], compute)
+    return df
+
+@_compiled
+def _psar_kernel(high, low, step, max_step):
+    n = len(high)
+    sar_out = np.full(n, np.nan)
+    trend_out = np.ones(n)
+    if n == 0:
+        return sar_out, trend_out
+    rising = True
+    sar = low[0]
+    extreme = high[0]
+    af = step
+    for i in range(1, n):
+        sar = sar + af * (extreme - sar)
+        if rising:
+            sar = min(sar, low[i - 1], low[i - 2] if i > 1 else low[i - 1])
+            if low[i] < sar:
+                rising, sar, extreme, af = False, extreme, low[i], step
+            elif high[i] > extreme:
+                extreme, af = high[i], min(af + step, max_step)
+        else:
+            sar = max(sar, high[i - 1], high[i - 2] if i > 1 else high[i - 1])
+            if high[i] > sar:
+                rising, sar, extreme, af = True, extreme, high[i], step
+            elif low[i] < extreme:
+                extreme, af = low[i], min(af + step, max_step)
+        sar_out[i] = sar
+        trend_out[i] = 1.0 if rising else -1.0
+    return sar_out, trend_out
+
+def add_psar(df, step=0.02, max_step=0.2):
+    """
+    Adds Wilder's Parabolic SAR.
+
+    :param df: Input DataFrame with 'high' and 'low' prices.
+    :param step: Acceleration factor step.
+    :param max_step: Maximum acceleration factor.
+    :return: DataFrame with 'PSAR' and 'PSAR_trend' (1 rising, -1 falling) columns added.
+    """
+    def compute():
+        sar, trend = _psar_kernel(df['high'].to_numpy(dtype=np.float64), df['low'].to_numpy(dtype=np.float64),
+                                  float(step), float(max_step))
+        return np.column_stack((sar, trend))
+
+    values = cached_indicator(df, 'PSAR', {'step': step, 'max_step': max_step}, df[['high', 'low']], compute)
+    df['PSAR'], df['PSAR_trend'] = values[:, 0], values[:, 1].astype(np.int8)
+    return df
+
+@_compiled
+def _half_trend_kernel(high, low, close, high_price, low_price, high_ma, low_ma, start):
+    n = len(close)
+    line = np.full(n, np.nan)
+    direction = np.zeros(n)
+    if start >= n:
+        return line, direction
+    trend, next_trend, previous_trend = 0, 0, -1
+    max_low = low[start - 1] if start > 0 else low[start]
+    min_high = high[start - 1] if start > 0 else high[start]
+    up = np.nan
+    down = np.nan
+    for i in range(start, n):
+        previous_low = low[i - 1] if i > 0 else low[i]
+        previous_high = high[i - 1] if i > 0 else high[i]
+        if next_trend == 1:
+            max_low = max(low_price[i], max_low)
+            if high_ma[i] < max_low and close[i] < previous_low:
+                trend, next_trend, min_high = 1, 0, high_price[i]
+        else:
+            min_high = min(high_price[i], min_high)
+            if low_ma[i] > min_high and close[i] > previous_high:
+                trend, next_trend, max_low = 0, 1, low_price[i]
+
+        if trend == 0:
+            if previous_trend != -1 and previous_trend != 0:
+                up = down
+            else:
+                up = max_low if np.isnan(up) else max(max_low, up)
+            line[i] = up
+            direction[i] = 1.0
+        else:
+            if previous_trend != -1 and previous_trend != 1:
+                down = up
+            else:
+                down = min_high if np.isnan(down) else min(min_high, down)
+            line[i] = down
+            direction[i] = -1.0
+        previous_trend = trend
+    return line, direction
+
+def add_half_trend(df, amplitude=2):
+    """
+    Adds the Half Trend line.
+
+    The trend flips up when the average low of the last `amplitude` bars rises
+    above the lowest recent high and the close breaks the previous high (and
+    the mirror image for down). The line trails the highest low in an uptrend
+    and the lowest high in a downtrend.
+
+    :param df: Input DataFrame with 'high', 'low' and 'close'.
+    :param amplitude: Lookback of the high/low channel.
+    :return: DataFrame with 'HalfTrend' and 'HalfTrend_trend' (1 up, -1 down) columns added.
+    """
+    def compute():
+        high, low = df['high'].astype(np.float64), df['low'].astype(np.float64)
+        line, direction = _half_trend_kernel(
+            high.to_numpy(), low.to_numpy(), df['close'].to_numpy(dtype=np.float64),
+            high.rolling(amplitude).max().to_numpy(), low.rolling(amplitude).min().to_numpy(),
+            high.rolling(amplitude).mean().to_numpy(), low.rolling(amplitude).mean().to_numpy(), amplitude - 1
+        )
+        return np.column_stack((line, direction))
+
+    values = cached_indicator(df, 'HalfTrend', {'amplitude': amplitude}, df[['high', 'low', 'close']], compute)
+    df['HalfTrend'], df['HalfTrend_trend'] = values[:, 0], values[:, 1].astype(np.int8)
+    return df
+
+# Indicator name -> add_* function, used by add_indicators and Strategy.indicators
+INDICATORS = {
+    'SMA': add_sma, 'EMA': add_ema, 'WMA': add_wma, 'RSI': add_rsi, 'MACD': add_macd, 'TRIX': add_trix,
+    'CMO': add_cmo, 'Aroon': add_aroon, 'Chaikin': add_chaikin, 'VolumeSpike': add_volume_spike,
+    'HeikinAshi': add_heikin_ashi, 'KAMA': add_kama, 'PSAR': add_psar, 'HalfTrend': add_half_trend
+}
+
+def add_indicators(df, specs):
+    """
+    Add every requested indicator once, however many strategies ask for it.
+
+    :param df: Input DataFrame with OHLCV columns.
+    :param specs: Iterable of indicator names or (name, params) pairs, e.g. the
+                  concatenated Strategy.indicators of several strategies.
+    :return: DataFrame with the indicator columns added.
+    """
+    seen = set()
+    for spec in specs:
+        name, params = (spec, {}) if isinstance(spec, str) else (spec[0], dict(spec[1]))
+        key = (name, tuple(sorted(params.items())))
+        if key in seen:
+            continue
+        seen.add(key)
+        if name not in INDICATORS:
+            raise ValueError(f"Unknown indicator: {name}. Available: {list(INDICATORS)}")
+        df = INDICATORS[name](df, **params)
+    return df
+
+def align_universe(assets, benchmark, fields=('high', 'low', 'close')):
+    """
+    Align any number of assets and one benchmark on their common timestamps in a single join.
+
+    :param assets: Dictionary mapping symbols to OHLCV DataFrames.
+    :param benchmark: Benchmark OHLCV DataFrame.
+    :param fields: Columns to keep.
+    :return: Tuple of (dictionary of wide time x symbol DataFrames per field,
+             DataFrame of benchmark fields), all on the same index.
+    """
+    fields = [f for f in fields if f in benchmark.columns]
+    panel = pd.concat({symbol: df[fields] for symbol, df in assets.items()}, axis=1)
+    bench = pd.concat({'__benchmark__': benchmark[fields]}, axis=1)
+    joined = panel.join(bench, how='inner').sort_index()
+
+    wide = {field: joined.xs(field, axis=1, level=1).drop(columns='__benchmark__') for field in fields}
+    return wide, joined['__benchmark__']
+
+def wide_atr(high, low, close, window=14):
+    """
+    Average True Range for every column of wide high/low/close frames (Wilder's smoothing).
+    Series inputs work the same way.
+
+    :return: Wide DataFrame (or Series) of ATR values.
+    """
+    prev_close = close.shift(1)
+    true_range = np.maximum(high - low, np.maximum((high - prev_close).abs(), (low - prev_close).abs()))
+    return true_range.ewm(alpha=1 / window, adjust=False, min_periods=window).mean()
+
+# Relative strength of an asset that moves exactly with the benchmark, per method
+RRS_NEUTRAL = {'ratio': 1.0, 'log': 0.0, 'real': 0.0}
+
+def relative_strength(asset_close, bench_close, window=Config.RRS_WINDOW, method=Config.RRS_METHOD,
+                      asset_atr=None, bench_atr=None):
+    """
+    Rolling relative strength of every asset column against the benchmark.
+
+    - 'ratio': (asset / asset[n]) / (benchmark / benchmark[n]), centered on 1.
+    - 'log':   log return of the asset minus log return of the benchmark over n bars.
+    - 'real':  real relative strength; the asset's n-bar move minus the move the
+               benchmark's ATR-normalized move implies, in units of the asset's ATR.
+
+    :param asset_close: Wide DataFrame (time x symbol) of asset closes.
+    :param bench_close: Series of benchmark closes on the same index.
+    :param window: Lookback in bars.
+    :param method: 'ratio', 'log' or 'real'.
+    :param asset_atr: Wide ATR frame of the assets (required for 'real').
+    :param bench_atr: ATR Series of the benchmark (required for 'real').
+    :return: Wide DataFrame of relative strength values.
+    """
+    if method == 'ratio':
+        return asset_close.pct_change(window).add(1).div(bench_close.pct_change(window).add(1), axis=0)
+    if method == 'log':
+        return np.log(asset_close).diff(window).sub(np.log(bench_close).diff(window), axis=0)
+    if method == 'real':
+        if asset_atr is None or bench_atr is None:
+            raise ValueError("The 'real' relative strength method requires ATR inputs.")
+        asset_move = asset_close.diff(window)
+        power_index = bench_close.diff(window) / bench_atr.shift(1)
+        prev_atr = asset_atr.shift(1)
+        return (asset_move - prev_atr.mul(power_index, axis=0)) / prev_atr
+    raise ValueError(f"Unknown relative strength method: {method}")
+
+def check_rrs_thresholds(method, buy_threshold, sell_threshold):
+    """
+    Make sure buy/sell thresholds fit the scale of a relative strength method: ratio
+    values center on 1, log and real values on 0.
+
+    :param method: 'ratio', 'log' or 'real'.
+    :param buy_threshold: RRS above which a bar is a buy.
+    :param sell_threshold: RRS below which a bar is a sell.
+    :raises ValueError: If the thresholds do not lie on either side of the method's neutral value.
+    """
+    if method not in RRS_NEUTRAL:
+        raise ValueError(f"Unknown relative strength method: {method}")
+    neutral = RRS_NEUTRAL[method]
+    if not sell_threshold < neutral < buy_threshold:
+        raise ValueError(
+            f"Thresholds buy={buy_threshold}, sell={sell_threshold} do not fit the '{method}' RRS method, "
+            f"whose values center on {neutral}; use sell < {neutral} < buy."
+        )
+
+def calculate_universe_rrs(assets, benchmark, window=Config.RRS_WINDOW, method=Config.RRS_METHOD, atr_window=14):
+    """
+    Relative strength of N assets against one benchmark as a single matrix computation.
+
+    :param assets: Dictionary mapping symbols to OHLCV DataFrames.
+    :param benchmark: Benchmark OHLCV DataFrame.
+    :param window: Lookback in bars.
+    :param method: 'ratio', 'log' or 'real'.
+    :param atr_window: ATR window for the 'real' method.
+    :return: Wide DataFrame (time x symbol) of RRS values.
+    """
+    fields = ('high', 'low', 'close') if method == 'real' else ('close',)
+    wide, bench = align_universe(assets, benchmark, fields)
+    asset_atr = bench_atr = None
+    if method == 'real':
+        asset_atr = wide_atr(wide['high'], wide['low'], wide['close'], atr_window)
+        bench_atr = wide_atr(bench['high'], bench['low'], bench['close'], atr_window)
+    return relative_strength(wide['close'], bench['close'], window, method, asset_atr, bench_atr)
+
+class DataProcessor:
+    def __init__(self, df_asset, df_benchmark, rrs_window=Config.RRS_WINDOW, rrs_method=Config.RRS_METHOD,
+                 atr_window=14, short_window=10, long_window=50, rsi_window=14):
+        """
+        Processes an asset against its benchmark.
+
+        :param df_asset: Asset OHLCV DataFrame.
+        :param df_benchmark: Benchmark OHLCV DataFrame.
+        :param rrs_window: Lookback in bars for relative strength.
+        :param rrs_method: 'ratio', 'log' or 'real'.
+        :param atr_window: ATR window for the 'real' method.
+        :param short_window: Window size for the short moving average.
+        :param long_window: Window size for the long moving average.
+        :param rsi_window: Window size for calculating RSI.
+        """
+        self.df_asset = df_asset
+        self.df_benchmark = df_benchmark
+        self.rrs_window = rrs_window
+        self.rrs_method = rrs_method
+        self.atr_window = atr_window
+        self.short_window = short_window
+        self.long_window = long_window
+        self.rsi_window = rsi_window
+
+    def calculate_indicators(self):
+        """
+        Align asset and benchmark, then add the process_data indicators and the 'RRS' column.
+
+        :return: Asset DataFrame on the common timestamps with 'benchmark_close' and 'RRS' added.
+        """
+        try:
+            validate_columns(self.df_asset, ['close'])
+            validate_columns(self.df_benchmark, ['close'])
+
+            rrs = calculate_universe_rrs(
+                {'asset': self.df_asset}, self.df_benchmark, self.rrs_window, self.rrs_method, self.atr_window
+            )
+            df = self.df_asset.loc[rrs.index].copy()
+            df['benchmark_close'] = self.df_benchmark['close'].reindex(rrs.index)
+            df = process_data(df, self.short_window, self.long_window, self.rsi_window)
+            df['RRS'] = rrs['asset'].to_numpy()
+
+            logger.info(f"Calculated indicators for {len(df)} aligned rows.")
+            return df
+        except Exception as e:
+            logger.error(f"Error in calculate_indicators: {e}")
+            raise
+
+    @staticmethod
+    def rank_universe(assets, benchmark, window=Config.RRS_WINDOW, method=Config.RRS_METHOD, atr_window=14):
+        """
+        Rank every asset by its latest relative strength against the benchmark.
+
+        :param assets: Dictionary mapping symbols to OHLCV DataFrames.
+        :param benchmark: Benchmark OHLCV DataFrame.
+        :return: Series of the latest RRS per symbol, strongest first.
+        """
+        rrs = calculate_universe_rrs(assets, benchmark, window, method, atr_window)
+        return rrs.ffill().iloc[-1].dropna().sort_values(ascending=False)
+
+def save_processed_data(df, symbol, interval=Config.TIMEFRAME):
+    """
+    Save the processed data to the database when enabled, otherwise to a CSV file.
+
+    The database path writes the kline fields (OHLCV and the extended fields)
+    to the klines table and every other numeric column to the indicators table,
+    through the connection data_fetcher already holds.
 
     :param df: Processed DataFrame.
     :param symbol: Trading pair symbol (e.g., 'SOLUSDT').
+    :param interval: Data interval (e.g., '1h').
     """
     try:
+        if Config.DATABASE_ENABLED:
+            from data_fetcher import get_candle_store
+            from database import OHLCV_COLUMNS
+            database = get_candle_store()
+            if set(OHLCV_COLUMNS).issubset(df.columns):
+                database.write(symbol, interval, df)
+            database.write_indicators(symbol, interval, df)
+            logger.info(f"Processed data for {symbol} saved to {Config.DATABASE_URI}.")
+            return
+
+        os.makedirs(Config.OUTPUT_DIR, exist_ok=True)
         output_file = os.path.join(Config.OUTPUT_DIR, f"{symbol}_processed_data.csv")
         df.to_csv(output_file, index=True)
-        logging.info(f"Processed data saved to {output_file}.")
+        logger.info(f"Processed data saved to {output_file}.")
     except Exception as e:
-        logging.error(f"Error saving processed data for {symbol}: {e}")
+        logger.error(f"Error saving processed data for {symbol}: {e}")
 
 if __name__ == "__main__":
+    from logging_setup import setup_logging
+
+    setup_logging()
     try:
         # Example usage: Load raw data and process it
         input_file = os.path.join(Config.OUTPUT_DIR, f"{Config.SYMBOL}_data.csv")
 
         if not os.path.exists(input_file):
-            logging.error(f"Input file {input_file} does not exist. Ensure `data_fetcher.py` has saved data correctly.")
+            logger.error(f"Input file {input_file} does not exist. Ensure `data_fetcher.py` has saved data correctly.")
         else:
             raw_data = pd.read_csv(input_file, index_col='timestamp', parse_dates=True)
 
             if raw_data.empty:
-                logging.warning(f"Input file {input_file} is empty. No processing performed.")
+                logger.warning(f"Input file {input_file} is empty. No processing performed.")
             else:
-                logging.info(f"Loaded raw data with {len(raw_data)} rows.")
+                logger.info(f"Loaded raw data with {len(raw_data)} rows.")
                 processed_data = process_data(raw_data)
 
                 # Save processed data
                 save_processed_data(processed_data, Config.SYMBOL)
 
     except Exception as e:
-        logging.error(f"Error in main execution: {e}")
+        logger.error(f"Error in main execution: {e}")
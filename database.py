@@ -0,0 +1,262 @@
+import logging
+import os
+import sqlite3
+import threading
+from itertools import islice
+import numpy as np
+import pandas as pd
+from config import Config
+from candle_store import merge_ranges, subtract_ranges
+from candles import EXTENDED_FIELDS
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+# Quote volume, trade count and taker-buy volumes, stored next to OHLCV when the frame has them
+EXTENDED_COLUMNS = [name for name, _, _ in EXTENDED_FIELDS]
+KLINE_COLUMNS = OHLCV_COLUMNS + EXTENDED_COLUMNS
+_EXTENDED_SQL_TYPES = {'number_of_trades': 'BIGINT'}
+
+def _batched(rows, batch_size):
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+class KlineDatabase:
+    def __init__(self, uri=Config.DATABASE_URI, batch_size=Config.DATABASE_BATCH_SIZE):
+        """
+        Database sink for klines and processed indicators.
+
+        Implements the same interface as CandleStore (write, load, missing_ranges,
+        mark_covered), so data_fetcher can serve ranges from it before going to
+        the network. Supported URIs are 'sqlite:///path.db' and, when psycopg2 is
+        installed, 'postgresql://...'.
+
+        :param uri: Database connection URI.
+        :param batch_size: Rows per executemany batch.
+        """
+        self.uri = uri
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+
+        if uri.startswith('sqlite:///'):
+            path = uri[len('sqlite:///'):]
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.dialect = 'sqlite'
+            self.placeholder = '?'
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        elif uri.startswith(('postgresql://', 'postgres://')):
+            try:
+                import psycopg2
+            except ImportError:
+                raise ImportError("psycopg2 is required for PostgreSQL DATABASE_URI values.")
+            self.dialect = 'postgresql'
+            self.placeholder = '%s'
+            self.conn = psycopg2.connect(uri)
+        else:
+            raise ValueError(f"Unsupported DATABASE_URI: {uri}")
+
+        self._create_schema()
+
+    def _create_schema(self):
+        # The primary key doubles as the range-query index; WITHOUT ROWID stores
+        # SQLite rows clustered on it so a time slice is one contiguous scan
+        without_rowid = " WITHOUT ROWID" if self.dialect == 'sqlite' else ""
+        statements = [
+            f"""CREATE TABLE IF NOT EXISTS klines (
+                symbol TEXT NOT NULL, interval TEXT NOT NULL, open_time BIGINT NOT NULL,
+                open DOUBLE PRECISION, high DOUBLE PRECISION, low DOUBLE PRECISION,
+                close DOUBLE PRECISION, volume DOUBLE PRECISION,
+                quote_asset_volume DOUBLE PRECISION, number_of_trades BIGINT,
+                taker_buy_base_asset_volume DOUBLE PRECISION, taker_buy_quote_asset_volume DOUBLE PRECISION,
+                PRIMARY KEY (symbol, interval, open_time)){without_rowid}""",
+            f"""CREATE TABLE IF NOT EXISTS indicators (
+                symbol TEXT NOT NULL, interval TEXT NOT NULL, name TEXT NOT NULL,
+                open_time BIGINT NOT NULL, value DOUBLE PRECISION,
+                PRIMARY KEY (symbol, interval, name, open_time)){without_rowid}""",
+            """CREATE TABLE IF NOT EXISTS kline_coverage (
+                symbol TEXT NOT NULL, interval TEXT NOT NULL,
+                start_ts BIGINT NOT NULL, end_ts BIGINT NOT NULL)"""
+        ]
+        with self._lock:
+            cursor = self.conn.cursor()
+            for statement in statements:
+                cursor.execute(statement)
+            # Databases created before the extended fields were stored get the columns added
+            for name in EXTENDED_COLUMNS:
+                if name not in self._table_columns(cursor, 'klines'):
+                    cursor.execute(f"ALTER TABLE klines ADD COLUMN {name} {_EXTENDED_SQL_TYPES.get(name, 'DOUBLE PRECISION')}")
+            self.conn.commit()
+
+    def _table_columns(self, cursor, table):
+        if self.dialect == 'sqlite':
+            cursor.execute(f"PRAGMA table_info({table})")
+            return {row[1] for row in cursor.fetchall()}
+        cursor.execute("SELECT column_name FROM information_schema.columns WHERE table_name = %s", (table,))
+        return {row[0] for row in cursor.fetchall()}
+
+    def _executemany(self, cursor, sql, rows):
+        if self.dialect == 'postgresql':
+            from psycopg2.extras import execute_values
+            execute_values(cursor, sql.replace(self._values_clause(sql), 'VALUES %s'), rows, page_size=self.batch_size)
+        else:
+            cursor.executemany(sql, rows)
+
+    @staticmethod
+    def _values_clause(sql):
+        start = sql.index('VALUES (')
+        return sql[start:sql.index(')', start) + 1]
+
+    def _bulk_upsert(self, sql, rows):
+        """
+        Insert rows in batches inside a single transaction.
+
+        :return: Number of rows written.
+        """
+        written = 0
+        with self._lock:
+            cursor = self.conn.cursor()
+            try:
+                for batch in _batched(rows, self.batch_size):
+                    self._executemany(cursor, sql, batch)
+                    written += len(batch)
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+        return written
+
+    def write(self, symbol, interval, df):
+        """
+        Upsert klines on (symbol, interval, open_time).
+
+        The extended kline fields present in the frame are stored as well; a
+        frame without them leaves the stored values untouched.
+
+        :param symbol: Trading pair symbol (e.g., 'SOLUSDT').
+        :param interval: Data interval (e.g., '1h').
+        :param df: DataFrame indexed by open time with OHLCV columns and optionally EXTENDED_COLUMNS.
+        """
+        if df.empty:
+            return
+        columns = OHLCV_COLUMNS + [c for c in EXTENDED_COLUMNS if c in df.columns]
+        p = self.placeholder
+        sql = (
+            f"INSERT INTO klines (symbol, interval, open_time, {', '.join(columns)}) "
+            f"VALUES ({', '.join([p] * (len(columns) + 3))}) "
+            f"ON CONFLICT (symbol, interval, open_time) DO UPDATE SET "
+            + ", ".join(f"{c} = excluded.{c}" for c in columns)
+        )
+        open_times = df.index.values.astype('datetime64[ms]').astype(np.int64).tolist()
+        # tolist() keeps the trade count as int and turns float32 volumes into Python floats
+        values = [df[c].to_numpy().tolist() for c in columns]
+        rows = ((symbol, interval, ts, *row) for ts, *row in zip(open_times, *values))
+        written = self._bulk_upsert(sql, rows)
+        logger.debug("Upserted %d klines for %s %s.", written, symbol, interval)
+
+    def write_indicators(self, symbol, interval, df, columns=None):
+        """
+        Upsert processed indicator columns in long format on (symbol, interval, name, open_time).
+
+        :param symbol: Trading pair symbol (e.g., 'SOLUSDT').
+        :param interval: Data interval (e.g., '1h').
+        :param df: Processed DataFrame indexed by open time.
+        :param columns: Indicator columns to store. Defaults to all numeric columns that are not kline fields.
+        """
+        if columns is None:
+            columns = [c for c in df.select_dtypes(include='number').columns if c not in KLINE_COLUMNS]
+        if df.empty or not columns:
+            return
+        p = self.placeholder
+        sql = (
+            f"INSERT INTO indicators (symbol, interval, name, open_time, value) "
+            f"VALUES ({p}, {p}, {p}, {p}, {p}) "
+            f"ON CONFLICT (symbol, interval, name, open_time) DO UPDATE SET value = excluded.value"
+        )
+        open_times = df.index.values.astype('datetime64[ms]').astype(np.int64)
+
+        def _rows():
+            for name in columns:
+                values = df[name].to_numpy(dtype=float)
+                valid = ~np.isnan(values)
+                for ts, value in zip(open_times[valid].tolist(), values[valid].tolist()):
+                    yield symbol, interval, name, ts, value
+
+        written = self._bulk_upsert(sql, _rows())
+        logger.debug("Upserted %d indicator values for %s %s.", written, symbol, interval)
+
+    def load(self, symbol, interval, start=None, end=None, columns=None):
+        """
+        Range query over the primary-key index.
+
+        :param symbol: Trading pair symbol (e.g., 'SOLUSDT').
+        :param interval: Data interval (e.g., '1h').
+        :param start: Slice start (anything pd.Timestamp accepts). None for the beginning.
+        :param end: Slice end (inclusive). None for the end.
+        :param columns: Kline columns (OHLCV_COLUMNS, EXTENDED_COLUMNS) to read. None for OHLCV.
+        :return: DataFrame indexed by open time.
+        """
+        columns = columns or OHLCV_COLUMNS
+        start_ts = int(pd.Timestamp(start).value // 1_000_000) if start is not None else np.iinfo(np.int64).min
+        end_ts = int(pd.Timestamp(end).value // 1_000_000) if end is not None else np.iinfo(np.int64).max
+        p = self.placeholder
+        sql = (
+            f"SELECT open_time, {', '.join(columns)} FROM klines "
+            f"WHERE symbol = {p} AND interval = {p} AND open_time BETWEEN {p} AND {p} ORDER BY open_time"
+        )
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute(sql, (symbol, interval, start_ts, end_ts))
+            rows = cursor.fetchall()
+
+        if not rows:
+            return pd.DataFrame()
+        df = pd.DataFrame(rows, columns=['timestamp'] + columns)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        return df.set_index('timestamp')
+
+    def get_coverage(self, symbol, interval):
+        p = self.placeholder
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                f"SELECT start_ts, end_ts FROM kline_coverage WHERE symbol = {p} AND interval = {p} ORDER BY start_ts",
+                (symbol, interval)
+            )
+            return [list(r) for r in cursor.fetchall()]
+
+    def mark_covered(self, symbol, interval, start_ts, end_ts):
+        """
+        Record that [start_ts, end_ts] has been fetched.
+        """
+        if end_ts < start_ts:
+            return
+        merged = merge_ranges(self.get_coverage(symbol, interval) + [[start_ts, end_ts]])
+        p = self.placeholder
+        with self._lock:
+            cursor = self.conn.cursor()
+            try:
+                cursor.execute(f"DELETE FROM kline_coverage WHERE symbol = {p} AND interval = {p}", (symbol, interval))
+                cursor.executemany(
+                    f"INSERT INTO kline_coverage (symbol, interval, start_ts, end_ts) VALUES ({p}, {p}, {p}, {p})",
+                    [(symbol, interval, a, b) for a, b in merged]
+                )
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+
+    def missing_ranges(self, symbol, interval, start_ts, end_ts):
+        """
+        :return: List of (start_ms, end_ms) tuples of [start_ts, end_ts] not fetched yet.
+        """
+        return subtract_ranges(self.get_coverage(symbol, interval), start_ts, end_ts)
+
+    def close(self):
+        self.conn.close()
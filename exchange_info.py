@@ -0,0 +1,181 @@
+import json
+import logging
+import os
+import threading
+import time
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class ExchangeInfoCache:
+    def __init__(self, fetch_func, cache_file=Config.EXCHANGE_INFO_CACHE_FILE, ttl=Config.EXCHANGE_INFO_TTL):
+        """
+        Process-wide cache of the Binance exchangeInfo payload.
+
+        The payload is downloaded at most once per process, persisted to disk and
+        reused by later runs until it is older than the TTL. A stale disk copy is
+        still served immediately while a fresh one is downloaded in the background.
+
+        :param fetch_func: Callable returning the exchangeInfo dict (e.g. client.get_exchange_info).
+        :param cache_file: Path of the on-disk JSON copy.
+        :param ttl: Maximum age of the cached payload in seconds.
+        """
+        self.fetch_func = fetch_func
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self._info = None
+        self._fetched_at = 0.0
+        self._symbols = {}
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._refresh_timer = None
+
+    def get(self):
+        """
+        Return the exchangeInfo payload, downloading it only if no usable copy exists.
+
+        :return: exchangeInfo dictionary.
+        """
+        with self._lock:
+            if self._info is None:
+                if not self._load_from_disk():
+                    self._refresh_locked()
+            if time.time() - self._fetched_at > self.ttl:
+                self._refresh_in_background()
+            return self._info
+
+    def refresh(self):
+        """
+        Download a fresh exchangeInfo payload and persist it.
+        """
+        with self._lock:
+            self._refresh_locked()
+
+    def symbols(self):
+        """
+        :return: Set of all symbols listed on the exchange.
+        """
+        self.get()
+        return set(self._symbols)
+
+    def symbols_by_quote(self, quote_asset='USDT', status='TRADING'):
+        """
+        :param quote_asset: Quote asset to filter on (e.g., 'USDT').
+        :param status: Required trading status, or None for any.
+        :return: Sorted list of symbols quoted in that asset.
+        """
+        self.get()
+        return sorted(
+            symbol for symbol, info in self._symbols.items()
+            if info.get('quoteAsset') == quote_asset and (status is None or info.get('status') == status)
+        )
+
+    def get_symbol_info(self, symbol):
+        """
+        Return the raw exchangeInfo entry of one symbol.
+
+        :param symbol: Trading pair symbol (e.g., 'SOLUSDT').
+        :return: Symbol dictionary from exchangeInfo.
+        :raises ValueError: If the symbol is not listed.
+        """
+        self.get()
+        try:
+            return self._symbols[symbol]
+        except KeyError:
+            raise ValueError(f"Invalid symbol: {symbol}. Ensure it exists on Binance.")
+
+    def get_symbol_filters(self, symbol):
+        """
+        Return the trading constraints of one symbol, e.g. for order rounding in the backtester.
+
+        :param symbol: Trading pair symbol (e.g., 'SOLUSDT').
+        :return: Dictionary with 'tick_size', 'step_size', 'min_qty', 'max_qty' and 'min_notional'.
+        """
+        filters = {f['filterType']: f for f in self.get_symbol_info(symbol).get('filters', [])}
+        price_filter = filters.get('PRICE_FILTER', {})
+        lot_size = filters.get('LOT_SIZE', {})
+        notional = filters.get('NOTIONAL') or filters.get('MIN_NOTIONAL') or {}
+
+        return {
+            'tick_size': float(price_filter.get('tickSize', 0)),
+            'step_size': float(lot_size.get('stepSize', 0)),
+            'min_qty': float(lot_size.get('minQty', 0)),
+            'max_qty': float(lot_size.get('maxQty', 0)),
+            'min_notional': float(notional.get('minNotional', 0))
+        }
+
+    def start_background_refresh(self, interval=None):
+        """
+        Refresh the payload periodically on a daemon timer.
+
+        :param interval: Seconds between refreshes. Defaults to the TTL.
+        """
+        interval = interval or self.ttl
+
+        def _tick():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Background exchangeInfo refresh failed: {e}")
+            self.start_background_refresh(interval)
+
+        self._refresh_timer = threading.Timer(interval, _tick)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def stop_background_refresh(self):
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+
+    def _set_info(self, info, fetched_at):
+        self._info = info
+        self._fetched_at = fetched_at
+        self._symbols = {s['symbol']: s for s in info.get('symbols', [])}
+
+    def _refresh_locked(self):
+        logger.info("Downloading exchangeInfo...")
+        self._set_info(self.fetch_func(), time.time())
+        self._save_to_disk()
+
+    def _refresh_in_background(self):
+        if self._refreshing:
+            return
+        self._refreshing = True
+
+        def _run():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Background exchangeInfo refresh failed: {e}")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=_run, daemon=True).start()
+
+    def _load_from_disk(self):
+        try:
+            if not self.cache_file or not os.path.exists(self.cache_file):
+                return False
+            with open(self.cache_file, 'r') as f:
+                cached = json.load(f)
+            self._set_info(cached['info'], cached['fetched_at'])
+            logger.debug("Loaded exchangeInfo from %s.", self.cache_file)
+            return True
+        except Exception as e:
+            logger.warning(f"Could not read exchangeInfo cache {self.cache_file}: {e}")
+            return False
+
+    def _save_to_disk(self):
+        if not self.cache_file:
+            return
+        try:
+            cache_dir = os.path.dirname(self.cache_file)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump({'fetched_at': self._fetched_at, 'info': self._info}, f)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            logger.warning(f"Could not write exchangeInfo cache {self.cache_file}: {e}")
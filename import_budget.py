@@ -0,0 +1,60 @@
+import json
+import subprocess
+import sys
+from config import Config
+
+# Modules that only the network, live streaming or plotting paths need; none may load on import
+HEAVY_MODULES = ('binance', 'matplotlib', 'websockets', 'aiohttp', 'numba', 'psycopg2')
+
+# Entry points and library modules checked by default
+MODULES = (
+    'main', 'data_fetcher', 'data_processor', 'strategy', 'backtester', 'metrics_calculator',
+    'visualization', 'optimizer', 'walk_forward', 'scanner'
+)
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{'seconds': elapsed, 'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def measure_import(module, repeats=3):
+    """
+    Time a cold import of one module in fresh interpreters.
+
+    :param module: Module name.
+    :param repeats: Interpreters started; the fastest run is reported to filter out noise.
+    :return: Dictionary with 'seconds' and the 'heavy' modules the import pulled in.
+    """
+    runs = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return min(runs, key=lambda run: run['seconds'])
+
+def check_import_budget(modules=MODULES, budget=Config.IMPORT_TIME_BUDGET, repeats=3):
+    """
+    Measure every module against the import-time budget.
+
+    :param modules: Module names to import.
+    :param budget: Maximum seconds per cold import.
+    :param repeats: Interpreters started per module.
+    :return: Tuple of (results dictionary per module, True if every module is within budget
+             and imported none of HEAVY_MODULES).
+    """
+    results = {module: measure_import(module, repeats) for module in modules}
+    ok = all(r['seconds'] <= budget and not r['heavy'] for r in results.values())
+    return results, ok
+
+if __name__ == "__main__":
+    results, ok = check_import_budget()
+    for module, result in results.items():
+        heavy = f"  loads {', '.join(result['heavy'])}" if result['heavy'] else ""
+        print(f"{module:<20} {result['seconds'] * 1000:7.0f} ms{heavy}")
+    print(f"Budget {Config.IMPORT_TIME_BUDGET * 1000:.0f} ms per module: {'OK' if ok else 'EXCEEDED'}")
+    sys.exit(0 if ok else 1)
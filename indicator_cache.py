@@ -0,0 +1,180 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+def _hash_array(digest, values):
+    values = np.ascontiguousarray(values)
+    digest.update(f"{values.dtype.str}{values.shape}".encode())
+    digest.update(values.data if values.dtype.kind != 'O' else repr(values.tolist()).encode())
+
+def fingerprint(data):
+    """
+    Content hash of a Series, DataFrame or array, including its index.
+
+    :param data: pandas or NumPy object.
+    :return: Hex digest that changes whenever a value, timestamp, dtype or shape changes.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(data, (pd.Series, pd.DataFrame)):
+        index = data.index
+        if isinstance(index, pd.DatetimeIndex):
+            # Normalize the resolution so equal timestamps always hash alike
+            _hash_array(digest, index.to_numpy(dtype='datetime64[ns]').view(np.int64))
+        else:
+            _hash_array(digest, index.to_numpy())
+        if isinstance(data, pd.DataFrame):
+            digest.update(repr(tuple(data.columns)).encode())
+        data = data.to_numpy()
+    _hash_array(digest, np.asarray(data))
+    return digest.hexdigest()
+
+class IndicatorCache:
+    def __init__(self, max_bytes=Config.INDICATOR_CACHE_MAX_BYTES, disk_dir=Config.INDICATOR_CACHE_DIR):
+        """
+        Memoizes indicator arrays across runs over the same data.
+
+        Entries are keyed by (symbol, interval, data fingerprint, indicator,
+        parameters). The memory tier is an LRU bounded by a byte budget; with a
+        disk directory, every computed array is also written as .npy so later
+        processes (optimizer workers, the next main.py run) load it instead of
+        recomputing. Cached arrays are read-only so a caller can never change
+        what other callers get back.
+
+        :param max_bytes: Memory budget for cached arrays.
+        :param disk_dir: Directory of the on-disk tier, or None for memory only.
+        """
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.bytes_used = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(name, params, source, symbol=None, interval=None):
+        """
+        :param name: Indicator name (e.g., 'SMA').
+        :param params: Dictionary of indicator parameters.
+        :param source: Data the indicator is computed from.
+        :param symbol: Trading pair symbol, if known.
+        :param interval: Data interval, if known.
+        :return: Hashable cache key.
+        """
+        return (symbol, interval, fingerprint(source), name, tuple(sorted(params.items())))
+
+    def get(self, key):
+        """
+        :return: Cached array, or None on a miss in both tiers.
+        """
+        with self._lock:
+            values = self._entries.get(key)
+            if values is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return values
+
+        values = self._load_from_disk(key)
+        if values is not None:
+            self.disk_hits += 1
+            self._remember(key, values)
+            return values
+        self.misses += 1
+        return None
+
+    def put(self, key, values):
+        """
+        Store a computed array in memory and, if configured, on disk.
+
+        :return: The read-only cached array.
+        """
+        values = np.array(values, copy=True)
+        values.flags.writeable = False
+        self._remember(key, values)
+        self._save_to_disk(key, values)
+        return values
+
+    def memoize(self, name, params, source, compute, symbol=None, interval=None):
+        """
+        Return the cached indicator or compute and cache it.
+
+        :param name: Indicator name (e.g., 'SMA').
+        :param params: Dictionary of indicator parameters.
+        :param source: Data the indicator is computed from; its contents form part of the key.
+        :param compute: Callable returning the indicator array.
+        :param symbol: Trading pair symbol, if known.
+        :param interval: Data interval, if known.
+        :return: Read-only NumPy array.
+        """
+        key = self.make_key(name, params, source, symbol, interval)
+        values = self.get(key)
+        if values is None:
+            values = self.put(key, compute())
+        return values
+
+    def clear(self, disk=False):
+        """
+        Drop every memory entry, and the disk tier too if requested.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.bytes_used = 0
+        if disk and self.disk_dir and os.path.isdir(self.disk_dir):
+            for name in os.listdir(self.disk_dir):
+                if name.endswith('.npy'):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    def _remember(self, key, values):
+        if values.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes_used -= previous.nbytes
+            self._entries[key] = values
+            self.bytes_used += values.nbytes
+            while self.bytes_used > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes_used -= evicted.nbytes
+
+    def _disk_path(self, key):
+        name = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.disk_dir, f"{name}.npy")
+
+    def _load_from_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            values = np.load(path, allow_pickle=False)
+            values.flags.writeable = False
+            return values
+        except Exception as e:
+            logger.warning(f"Could not read cached indicator {path}: {e}")
+            return None
+
+    def _save_to_disk(self, key, values):
+        if not self.disk_dir or values.dtype.kind == 'O':
+            return
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            path = self._disk_path(key)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.save(f, values, allow_pickle=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not write cached indicator: {e}")
+
+# Process-wide cache used by data_processor
+indicator_cache = IndicatorCache()
@@ -0,0 +1,188 @@
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from config import Config
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+def peak_rss_mb():
+    """
+    :return: Peak resident set size of this process in MiB, or None if the platform does not report it.
+    """
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / 1024 ** 2
+    except (ImportError, AttributeError):
+        return None
+
+class Stage:
+    def __init__(self, name):
+        """
+        Measurements of one pipeline stage. Set `rows` inside the stage to get a throughput figure.
+
+        :param name: Stage name (e.g., 'fetch').
+        """
+        self.name = name
+        self.rows = None
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_rss_mb = None
+        self.counters = {}
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'wall_seconds': round(self.wall_seconds, 6),
+            'cpu_seconds': round(self.cpu_seconds, 6),
+            'peak_rss_mb': round(self.peak_rss_mb, 1) if self.peak_rss_mb is not None else None,
+            'rows': self.rows,
+            'rows_per_second': round(self.rows / self.wall_seconds, 1) if self.rows and self.wall_seconds > 0 else None,
+            **self.counters
+        }
+
+class RunReport:
+    def __init__(self, counters=None, profiler=Config.PROFILER):
+        """
+        Per-stage wall time, CPU time, peak memory and throughput of one pipeline run.
+
+        :param counters: Dictionary of name -> callable returning a running total (e.g. HTTP
+                         requests made); each stage records how much the total grew.
+        :param profiler: None, 'cprofile' or 'pyinstrument' to profile the whole run.
+        """
+        self.counters = counters or {}
+        self.profiler = profiler
+        self.stages = []
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        self._started_cpu = time.process_time()
+        self._profile = None
+        self.profile_path = None
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Measure the enclosed block.
+
+        Usage: ``with report.stage('process') as stage: ...; stage.rows = len(df)``
+
+        :param name: Stage name.
+        :return: Context manager yielding the Stage record.
+        """
+        record = Stage(name)
+        before = {key: read() for key, read in self.counters.items()}
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall_seconds = time.perf_counter() - wall
+            record.cpu_seconds = time.process_time() - cpu
+            record.peak_rss_mb = peak_rss_mb()
+            record.counters = {key: read() - before[key] for key, read in self.counters.items()}
+            self.stages.append(record)
+            logger.info(f"Stage {name}: {record.wall_seconds:.3f}s wall, {record.cpu_seconds:.3f}s CPU.")
+
+    def start_profiler(self):
+        """
+        Start the configured profiler, if any. pyinstrument is optional and falls back to cProfile.
+        """
+        if self.profiler == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+                self._profile = Profiler()
+                self._profile.start()
+                return
+            except ImportError:
+                logger.warning("pyinstrument is not installed; profiling with cProfile instead.")
+                self.profiler = 'cprofile'
+        if self.profiler == 'cprofile':
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        elif self.profiler is not None:
+            raise ValueError(f"Unknown profiler: {self.profiler}. Use 'cprofile' or 'pyinstrument'.")
+
+    def stop_profiler(self, path_stem):
+        """
+        Stop the profiler and write its output next to the report.
+
+        :param path_stem: Output path without extension.
+        :return: Path of the profile (.prof for cProfile, .html for pyinstrument), or None.
+        """
+        if self._profile is None:
+            return None
+        if self.profiler == 'pyinstrument':
+            self._profile.stop()
+            self.profile_path = f"{path_stem}.html"
+            with open(self.profile_path, 'w') as f:
+                f.write(self._profile.output_html())
+        else:
+            self._profile.disable()
+            self.profile_path = f"{path_stem}.prof"
+            self._profile.dump_stats(self.profile_path)
+        self._profile = None
+        return self.profile_path
+
+    def to_dict(self):
+        """
+        :return: JSON-serializable report.
+        """
+        import numpy as np
+        import pandas as pd
+        return {
+            'started_at': self.started_at.isoformat(),
+            'wall_seconds': round(time.perf_counter() - self._started, 6),
+            'cpu_seconds': round(time.process_time() - self._started_cpu, 6),
+            'peak_rss_mb': round(peak_rss_mb(), 1) if peak_rss_mb() is not None else None,
+            'environment': {
+                'python': platform.python_version(), 'platform': platform.platform(),
+                'numpy': np.__version__, 'pandas': pd.__version__
+            },
+            'config': {'symbol': Config.SYMBOL, 'benchmark': Config.BENCHMARK_SYMBOL, 'interval': Config.TIMEFRAME},
+            'stages': [stage.to_dict() for stage in self.stages],
+            'profile': self.profile_path
+        }
+
+    def save(self, directory=Config.RUN_REPORT_DIR):
+        """
+        Write the report as JSON (and the profile, if one was captured).
+
+        :param directory: Output directory.
+        :return: Path of the JSON report.
+        """
+        os.makedirs(directory, exist_ok=True)
+        stem = os.path.join(directory, f"run_{self.started_at.strftime('%Y%m%dT%H%M%S')}")
+        self.stop_profiler(stem)
+        path = f"{stem}.json"
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+        logger.info(f"Run report saved to {path}.")
+        return path
+
+    def summary(self):
+        """
+        :return: Printable table of the stages.
+        """
+        lines = [f"{'stage':<10} {'wall s':>8} {'cpu s':>8} {'peak MiB':>9} {'rows/s':>12}"]
+        for stage in self.stages:
+            row = stage.to_dict()
+            rate = f"{row['rows_per_second']:,.0f}" if row['rows_per_second'] else '-'
+            peak = f"{row['peak_rss_mb']:.0f}" if row['peak_rss_mb'] is not None else '-'
+            lines.append(f"{stage.name:<10} {row['wall_seconds']:>8.3f} {row['cpu_seconds']:>8.3f} {peak:>9} {rate:>12}")
+            extra = {k: v for k, v in stage.counters.items() if v}
+            if extra:
+                lines.append(f"{'':<10} " + ", ".join(f"{k}={v}" for k, v in extra.items()))
+        return "\n".join(lines)
@@ -0,0 +1,129 @@
+import atexit
+import copy
+import logging
+import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from config import Config
+
+_listener = None
+
+_exception_formatter = logging.Formatter()
+
+class _DeferredQueueHandler(QueueHandler):
+    # The stock QueueHandler runs the full Formatter in the logging thread before queueing.
+    # Only the message is merged here, so mutable arguments are captured as they were at the
+    # call and no traceback frames stay alive; timestamps and layout are left to the listener.
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+def setup_logging(level=None, module_levels=None):
+    """
+    Route every log record through a queue to a background writer thread.
+
+    Library modules log through module loggers (logging.getLogger(__name__)) and
+    never touch handlers. Here the root logger gets a single QueueHandler, so a
+    log call in a fetch loop costs one enqueue; formatting and the file and
+    console writes happen on the listener thread. Records below the configured
+    levels are dropped before any message is built.
+
+    Entry points call this once; repeated calls are no-ops.
+
+    :param level: Default level name. Defaults to Config.LOG_LEVEL, or DEBUG with Config.DEBUG_MODE.
+    :param module_levels: Dictionary of module name -> level name. Defaults to Config.LOG_LEVELS.
+    :return: The running QueueListener.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+    log_dir = os.path.dirname(Config.LOG_FILE)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+
+    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s")
+    file_handler = logging.FileHandler(Config.LOG_FILE, mode="a")
+    file_handler.setFormatter(formatter)
+    console = logging.StreamHandler()
+    console.setFormatter(formatter)
+
+    root = logging.getLogger("")
+    root.setLevel(level or ("DEBUG" if Config.DEBUG_MODE else Config.LOG_LEVEL))
+    for name, module_level in (Config.LOG_LEVELS if module_levels is None else module_levels).items():
+        logging.getLogger(name).setLevel(module_level)
+
+    log_queue = queue.SimpleQueue()
+    root.addHandler(_DeferredQueueHandler(log_queue))
+    _listener = QueueListener(log_queue, file_handler, console, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+def shutdown_logging():
+    """
+    Write out every queued record and stop the background writer.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+class ProgressLog:
+    def __init__(self, logger, label, interval=Config.LOG_PROGRESS_INTERVAL, level=logging.INFO):
+        """
+        Aggregates counts of a long-running loop and logs at most one summary per
+        interval, instead of one line per chunk.
+
+        Usage: ``progress.add(rows=len(page), requests=1)`` in the loop, ``progress.done()`` after it.
+
+        :param logger: Logger the summaries go to.
+        :param label: Text starting every summary (e.g., 'Kline fetch').
+        :param interval: Minimum seconds between summaries.
+        :param level: Level of the summaries.
+        """
+        self.logger = logger
+        self.label = label
+        self.interval = interval
+        self.level = level
+        self.totals = {}
+        self._started = self._last_emit = None  # Set by the first add()
+        self._lock = threading.Lock()
+
+    def add(self, **counts):
+        """
+        Add to the running totals and log a summary if the interval has passed.
+
+        :param counts: Named increments (e.g., rows=1000, requests=1).
+        """
+        with self._lock:
+            for name, value in counts.items():
+                self.totals[name] = self.totals.get(name, 0) + value
+            now = time.monotonic()
+            if self._started is None:
+                self._started = self._last_emit = now
+            if now - self._last_emit < self.interval:
+                return
+            self._last_emit = now
+            totals = dict(self.totals)
+        self._emit("%s: %s after %.0fs", totals)
+
+    def done(self):
+        """
+        Log the final totals.
+        """
+        with self._lock:
+            totals = dict(self.totals)
+        self._emit("%s done: %s in %.1fs", totals)
+
+    def _emit(self, message, totals):
+        if self._started is not None and self.logger.isEnabledFor(self.level):
+            summary = ", ".join(f"{value:,} {name}" for name, value in totals.items())
+            self.logger.log(self.level, message, self.label, summary, time.monotonic() - self._started)
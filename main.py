@@ -1,22 +1,47 @@
-import config
+import argparse
+from config import Config
 import data_fetcher
 import data_processor
 import strategy
 import backtester
 import metrics_calculator
 import visualization
-
-def main():
+from indicator_cache import indicator_cache
+from instrumentation import RunReport
+from logging_setup import setup_logging
+
+def main(profiler=Config.PROFILER):
+    """
+    Fetch, process, signal, backtest, score and plot one symbol against its benchmark.
+
+    Every step runs as a measured stage; the per-stage report is printed at the
+    end and written as JSON to Config.RUN_REPORT_DIR.
+
+    :param profiler: None, 'cprofile' or 'pyinstrument' to profile the whole run.
+    :return: RunReport of the run.
+    """
+    setup_logging()
+    report = RunReport(counters={
+        'http_requests': lambda: data_fetcher.rate_limiter.request_count,
+        'api_weight': lambda: data_fetcher.rate_limiter.total_weight,
+        'indicator_cache_hits': lambda: indicator_cache.hits + indicator_cache.disk_hits,
+        'indicator_cache_misses': lambda: indicator_cache.misses
+    }, profiler=profiler)
+    report.start_profiler()
     try:
+        Config.validate()
+
         # Step 1: Fetch data
         print("Fetching data...")
-        asset_symbol = config.SYMBOL
-        benchmark_symbol = config.BENCHMARK_SYMBOL
+        asset_symbol = Config.SYMBOL
+        benchmark_symbol = Config.BENCHMARK_SYMBOL
         start_date = '2023-01-01'
         end_date = '2023-12-31'
 
-        df_asset = data_fetcher.fetch_data(asset_symbol, start_date, end_date)
-        df_benchmark = data_fetcher.fetch_data(benchmark_symbol, start_date, end_date)
+        with report.stage('fetch') as stage:
+            df_asset = data_fetcher.fetch_data(asset_symbol, start_date, end_date)
+            df_benchmark = data_fetcher.fetch_data(benchmark_symbol, start_date, end_date)
+            stage.rows = len(df_asset) + len(df_benchmark)
 
         if df_asset.empty or df_benchmark.empty:
             raise ValueError("Error: Could not fetch data. Ensure the symbols and date range are correct.")
@@ -28,8 +53,10 @@ def main():
 
         # Step 2: Process data
         print("Processing data...")
-        processor = data_processor.DataProcessor(df_asset, df_benchmark)
-        processed_data = processor.calculate_indicators()
+        with report.stage('process') as stage:
+            processor = data_processor.DataProcessor(df_asset, df_benchmark)
+            processed_data = processor.calculate_indicators()
+            stage.rows = len(processed_data)
 
         if processed_data.empty:
             raise ValueError("Error: Data processing failed. Check the input data.")
@@ -39,30 +66,39 @@ def main():
 
         # Step 3: Generate signals
         print("Generating signals...")
-        strat = strategy.Strategy(config.RRS_BUY_THRESHOLD, config.RRS_SELL_THRESHOLD)
-        signals = strat.generate_signals(processed_data)
-        processed_data['signal'] = signals
+        with report.stage('signals') as stage:
+            strat = strategy.get_strategy(Config.STRATEGY)
+            processed_data = strategy.prepare_indicators(processed_data, [strat])
+            signals = strat.generate_signals(processed_data)
+            processed_data['signal'] = signals
+            stage.rows = len(signals)
 
         print("Signals:")
         print(processed_data[['signal', 'RRS']].head())
 
         # Step 4: Backtest strategy
         print("Backtesting strategy...")
-        backtest = backtester.Backtester(processed_data, signals, config.INITIAL_BALANCE, config.FEE)
-        backtest.execute_trades()
+        with report.stage('backtest') as stage:
+            backtest = backtester.Backtester(processed_data, signals, Config.INITIAL_BALANCE, Config.FEE)
+            results = backtest.execute_trades()
+            stage.rows = len(results)
 
         print("Backtest Completed. Trade History:")
-        print(backtest.trade_history)
+        print(backtest.trades)
 
         # Step 5: Calculate metrics
         print("Calculating metrics...")
-        metrics_calc = metrics_calculator.MetricsCalculator(processed_data, config.INITIAL_BALANCE)
-        metrics = metrics_calc.calculate_metrics()
+        with report.stage('metrics') as stage:
+            metrics_calc = metrics_calculator.MetricsCalculator(results, Config.INITIAL_BALANCE)
+            metrics = metrics_calc.calculate_metrics()
+            stage.rows = len(results)
 
         # Step 6: Visualize results
         print("Visualizing results...")
-        visualization.Visualizer.plot_price_and_signals(processed_data, title="Price and Signals")
-        visualization.Visualizer.plot_equity_curve(processed_data, title="Equity Curve")
+        with report.stage('plot') as stage:
+            visualization.Visualizer.plot_price_and_signals(results, title="Price and Signals")
+            visualization.Visualizer.plot_equity_curve(results, title="Equity Curve")
+            stage.rows = len(results)
 
         # Step 7: Display metrics
         print("\nBacktest Metrics:")
@@ -75,6 +111,16 @@ def main():
         print(f"Key Error: {ke}. Check if all required columns are present in the data.")
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
+    finally:
+        path = report.save()
+        print("\nRun Report:")
+        print(report.summary())
+        print(f"Saved to {path}" + (f" (profile: {report.profile_path})" if report.profile_path else ""))
+    return report
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Backtest Config.STRATEGY on Config.SYMBOL against Config.BENCHMARK_SYMBOL.")
+    parser.add_argument('--profile', choices=['cprofile', 'pyinstrument'], default=Config.PROFILER,
+                        help="Profile the run and save the profile next to the run report.")
+    args = parser.parse_args()
+    main(profiler=args.profile)
@@ -1,16 +1,124 @@
 import pandas as pd
 import numpy as np
 
+# Crypto markets trade around the clock, so a year is 365 full days of bars
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+# Keys added by compute_metrics when trade returns are given
+TRADE_METRICS = ('Total Trades', 'Win Rate (%)', 'Best Trade (%)', 'Worst Trade (%)', 'Avg Trade (%)')
+
+def periods_per_year(index, default=365):
+    """
+    Number of bars per year implied by the spacing of an index.
+
+    :param index: DatetimeIndex of the equity curve.
+    :param default: Value used when the spacing cannot be inferred (daily bars).
+    :return: Bars per year, e.g. 8760 for 1h bars.
+    """
+    if not isinstance(index, pd.DatetimeIndex) or len(index) < 2:
+        return default
+    step = np.median(np.diff(index.to_numpy(dtype='datetime64[ns]')).astype(np.int64)) / 1e9
+    return SECONDS_PER_YEAR / step if step > 0 else default
+
+def compute_metrics(equity, initial_balance, bars_per_year, close=None, exposure=None, pnl=None):
+    """
+    Performance metrics over NumPy arrays, for one run or many runs at once.
+
+    Every statistic is derived from one running maximum, one return array and
+    one drawdown array, so scoring thousands of parameter sets is a handful of
+    column-wise array passes. A 1-D equity curve yields scalars; an (n, m)
+    matrix yields one value per column.
+
+    :param equity: Equity curve of shape (n,) or (n, m).
+    :param initial_balance: Starting cash.
+    :param bars_per_year: Annualization factor (see periods_per_year).
+    :param close: Close prices of shape (n,), for the buy-and-hold return. None to skip.
+    :param exposure: In-market flags or invested fractions, same shape as equity. None to skip.
+    :param pnl: Trade returns: a 1-D array of closed trades, or an array shaped like equity
+                with NaN on bars without an exit.
+    :return: Dictionary of metric name -> scalar or array.
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    n = equity.shape[0]
+    bars = np.arange(n).reshape((n,) + (1,) * (equity.ndim - 1))
+
+    returns = equity[1:] / equity[:-1] - 1
+    mean = returns.mean(axis=0) if n > 1 else np.zeros(equity.shape[1:])
+    std = returns.std(axis=0, ddof=1) if n > 2 else np.zeros(equity.shape[1:])
+    downside = np.where(returns < 0, returns, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        downside_count = (returns < 0).sum(axis=0)
+        downside_mean = np.nansum(downside, axis=0) / np.maximum(downside_count, 1)
+        downside_std = np.sqrt(np.nansum((downside - downside_mean) ** 2, axis=0) / np.maximum(downside_count - 1, 1))
+        downside_std = np.where(downside_count > 1, downside_std, 0.0)
+
+        peak = np.maximum.accumulate(equity, axis=0)
+        drawdown = equity / peak - 1
+        # Bars since the last equity high; the longest such run is the max drawdown duration
+        last_peak = np.maximum.accumulate(np.where(drawdown >= 0, bars, 0), axis=0)
+        underwater_bars = (bars - last_peak).max(axis=0)
+
+        years = (n - 1) / bars_per_year
+        total_return = equity[-1] / initial_balance - 1
+        annual_return = np.maximum(1 + total_return, 0) ** (1 / years) - 1 if years > 0 else np.zeros_like(total_return)
+        max_drawdown = drawdown.min(axis=0)
+        scale = np.sqrt(bars_per_year)
+
+        metrics = {
+            'Exposure Time (%)': np.asarray(exposure, dtype=np.float64).mean(axis=0) * 100 if exposure is not None else 0,
+            'Equity Final': equity[-1],
+            'Equity Peak': peak[-1],
+            'Return (%)': total_return * 100,
+            'Buy and Hold Return (%)': (close[-1] - close[0]) / close[0] * 100 if close is not None else np.nan,
+            'Return Annual (%)': annual_return * 100,
+            'Volatility Annual (%)': std * scale * 100,
+            'Sharpe Ratio': np.where(std > 0, mean / std * scale, 0.0),
+            'Sortino Ratio': np.where(downside_std > 0, mean / downside_std * scale, 0.0),
+            'Calmar Ratio': np.where(max_drawdown < 0, annual_return / np.abs(max_drawdown), 0.0),
+            'Max Drawdown (%)': max_drawdown * 100,
+            'Avg Drawdown (%)': drawdown.mean(axis=0) * 100,
+            'Max Drawdown Duration (days)': underwater_bars / bars_per_year * 365
+        }
+
+        if pnl is not None:
+            pnl = np.asarray(pnl, dtype=np.float64)
+            if pnl.size == 0:
+                # No closed trades; nanmax/nanmin of an empty array raise even under np.where
+                zeros = np.zeros(equity.shape[1:])
+                metrics.update({name: zeros for name in TRADE_METRICS})
+                metrics['Total Trades'] = zeros.astype(np.int64)
+            else:
+                trades = np.isfinite(pnl).sum(axis=0)
+                has_trades = trades > 0
+                metrics.update({
+                    'Total Trades': trades,
+                    'Win Rate (%)': np.where(has_trades, (pnl > 0).sum(axis=0) / np.maximum(trades, 1) * 100, 0.0),
+                    'Best Trade (%)': np.where(has_trades, np.nanmax(np.where(np.isfinite(pnl), pnl, -np.inf), axis=0) * 100, 0.0),
+                    'Worst Trade (%)': np.where(has_trades, np.nanmin(np.where(np.isfinite(pnl), pnl, np.inf), axis=0) * 100, 0.0),
+                    'Avg Trade (%)': np.where(has_trades, np.nansum(pnl, axis=0) / np.maximum(trades, 1) * 100, 0.0)
+                })
+
+    if equity.ndim == 1:
+        metrics = {k: v[()] if isinstance(v, np.ndarray) else v for k, v in metrics.items()}
+    return metrics
+
 class MetricsCalculator:
-    def __init__(self, df, initial_balance):
+    def __init__(self, df, initial_balance, verbose=True, trades=None, bars_per_year=None):
         """
         Initializes the MetricsCalculator with trading data.
 
         :param df: DataFrame containing trade and equity information.
         :param initial_balance: Initial balance for the portfolio.
+        :param verbose: Print debugging output. Disable for batch runs.
+        :param trades: Optional trade ledger with 'pnl' and 'duration' columns, e.g.
+                       PortfolioBacktester.trades when several trades can close on one bar.
+        :param bars_per_year: Annualization factor. Defaults to the bar spacing of the index.
         """
         self.df = df
         self.initial_balance = initial_balance
+        self.trades = trades
+        self.bars_per_year = bars_per_year
+        self.verbose = verbose
         self.metrics = {}
 
     def calculate_metrics(self):
@@ -26,93 +134,66 @@ class MetricsCalculator:
             if 'close' not in self.df.columns or 'equity' not in self.df.columns:
                 raise KeyError("DataFrame must contain 'close' and 'equity' columns.")
 
-            equity_curve = self.df['equity']
-            duration = (self.df.index[-1] - self.df.index[0]).days
-
-            # Exposure time percentage
-            exposure_time = self.df['exposure'].mean() * 100 if 'exposure' in self.df.columns else 0
-
-            # Equity metrics
-            equity_final = equity_curve.iloc[-1]
-            equity_peak = equity_curve.cummax().max()
-
-            # Return calculations
-            return_percent = (equity_final - self.initial_balance) / self.initial_balance * 100
-            buy_and_hold_return = ((self.df['close'].iloc[-1] - self.df['close'].iloc[0]) / self.df['close'].iloc[0]) * 100
-            return_annual_percent = (1 + return_percent / 100) ** (365 / duration) - 1 if duration > 0 else 0
-
-            # Volatility and performance ratios
-            daily_returns = equity_curve.pct_change().dropna()
-            volatility_annual_percent = daily_returns.std() * np.sqrt(252) * 100
-            sharpe_ratio = (daily_returns.mean() / daily_returns.std() * np.sqrt(252)) if daily_returns.std() > 0 else 0
-
-            downside_returns = daily_returns[daily_returns < 0]
-            sortino_ratio = (daily_returns.mean() / downside_returns.std() * np.sqrt(252)) if downside_returns.std() > 0 else 0
-
-            max_drawdown = (equity_curve / equity_curve.cummax() - 1).min() * 100
-            calmar_ratio = return_annual_percent / abs(max_drawdown) if max_drawdown != 0 else 0
-
-            # Drawdown metrics
-            avg_drawdown = self.df['drawdown'].mean() * 100 if 'drawdown' in self.df.columns else 0
-            max_drawdown_duration = self._calculate_max_drawdown_duration(equity_curve)
+            bars_per_year = self.bars_per_year or periods_per_year(self.df.index)
 
             # Trade metrics
-            trades = self.df[self.df['trade_signal'].notnull()] if 'trade_signal' in self.df.columns else pd.DataFrame()
-            total_trades = len(trades)
-            win_rate = len(trades[trades['pnl'] > 0]) / total_trades * 100 if total_trades > 0 else 0
-            best_trade = trades['pnl'].max() * 100 if not trades.empty else 0
-            worst_trade = trades['pnl'].min() * 100 if not trades.empty else 0
-            avg_trade = trades['pnl'].mean() * 100 if not trades.empty else 0
-            trade_durations = trades['duration'] if 'duration' in trades.columns else pd.Series(dtype=float)
-            max_trade_duration = trade_durations.max() if not trade_durations.empty else 0
-            avg_trade_duration = trade_durations.mean() if not trade_durations.empty else 0
+            # Closed trades are the rows that carry a realized pnl
+            if self.trades is not None:
+                pnl = self.trades['pnl'].to_numpy(dtype=np.float64)
+                trade_durations = self.trades['duration'] if 'duration' in self.trades.columns else pd.Series(dtype=float)
+            elif 'pnl' in self.df.columns:
+                pnl = self.df['pnl'].to_numpy(dtype=np.float64)
+                trade_durations = self.df['duration'].dropna() if 'duration' in self.df.columns else pd.Series(dtype=float)
+            else:
+                pnl, trade_durations = np.empty(0), pd.Series(dtype=float)
+
+            metrics = compute_metrics(
+                self.df['equity'].to_numpy(dtype=np.float64), self.initial_balance, bars_per_year,
+                close=self.df['close'].to_numpy(dtype=np.float64),
+                exposure=self.df['exposure'].to_numpy() if 'exposure' in self.df.columns else None,
+                pnl=pnl
+            )
 
             # Store metrics
             self.metrics = {
-                'Duration (days)': duration,
-                'Exposure Time (%)': exposure_time,
-                'Equity Final': equity_final,
-                'Equity Peak': equity_peak,
-                'Return (%)': return_percent,
-                'Buy and Hold Return (%)': buy_and_hold_return,
-                'Return Annual (%)': return_annual_percent * 100,
-                'Volatility Annual (%)': volatility_annual_percent,
-                'Sharpe Ratio': sharpe_ratio,
-                'Sortino Ratio': sortino_ratio,
-                'Calmar Ratio': calmar_ratio,
-                'Max Drawdown (%)': max_drawdown,
-                'Avg Drawdown (%)': avg_drawdown,
-                'Max Drawdown Duration (days)': max_drawdown_duration,
-                'Total Trades': total_trades,
-                'Win Rate (%)': win_rate,
-                'Best Trade (%)': best_trade,
-                'Worst Trade (%)': worst_trade,
-                'Avg Trade (%)': avg_trade,
-                'Max Trade Duration': max_trade_duration,
-                'Avg Trade Duration': avg_trade_duration
+                'Duration (days)': (self.df.index[-1] - self.df.index[0]).days,
+                **metrics,
+                'Max Trade Duration': trade_durations.max() if not trade_durations.empty else 0,
+                'Avg Trade Duration': trade_durations.mean() if not trade_durations.empty else 0
             }
 
             # Debugging output
-            print("Calculated Metrics:")
-            for key, value in self.metrics.items():
-                print(f"{key}: {value}")
+            if self.verbose:
+                print("Calculated Metrics:")
+                for key, value in self.metrics.items():
+                    print(f"{key}: {value}")
 
             return self.metrics
         except Exception as e:
             print(f"Error calculating metrics: {e}")
             return {}
 
-    def _calculate_max_drawdown_duration(self, equity_curve):
+    @staticmethod
+    def calculate_batch(equity, initial_balance, close=None, exposure=None, pnl=None, bars_per_year=None):
         """
-        Calculates the maximum duration of a drawdown.
-
-        :param equity_curve: Series representing the equity curve.
-        :return: Maximum drawdown duration in days.
+        Score many runs at once.
+
+        :param equity: (bars x runs) DataFrame of equity curves, e.g. Backtester.equity after
+                       execute_batch(keep_equity=True).
+        :param initial_balance: Initial balance of every run.
+        :param close: Close prices, for the buy-and-hold return.
+        :param exposure: Optional (bars x runs) exposure matrix.
+        :param pnl: Optional (bars x runs) trade returns, NaN on bars without an exit.
+        :param bars_per_year: Annualization factor. Defaults to the bar spacing of the index.
+        :return: DataFrame with one row of metrics per run.
         """
-        drawdown = equity_curve / equity_curve.cummax() - 1
-        is_drawdown = drawdown < 0
-        drawdown_durations = is_drawdown.astype(int).groupby((~is_drawdown).cumsum()).cumsum()
-        return drawdown_durations.max() if not drawdown_durations.empty else 0
+        bars_per_year = bars_per_year or periods_per_year(equity.index)
+        metrics = compute_metrics(
+            equity.to_numpy(dtype=np.float64), initial_balance, bars_per_year,
+            close=np.asarray(close, dtype=np.float64) if close is not None else None,
+            exposure=exposure, pnl=pnl
+        )
+        return pd.DataFrame(metrics, index=equity.columns)
 
 if __name__ == "__main__":
     # Example data
@@ -0,0 +1,273 @@
+import itertools
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from config import Config
+import data_processor
+from strategy import Strategy
+from backtester import Backtester
+from metrics_calculator import MetricsCalculator
+
+logger = logging.getLogger(__name__)
+
+# Parameters of the 'RRS' column Strategy trades on; the thresholds go to Strategy itself
+RRS_PARAMS = ('rrs_window', 'rrs_method')
+
+# Per-worker view of the shared price frame, attached once in _init_worker
+_worker_frame = None
+_worker_shm = None
+
+def default_constraint(params):
+    """
+    Reject parameter sets that cannot describe a sensible strategy.
+
+    :param params: Dictionary of parameter values.
+    :return: True if the combination should be evaluated.
+    """
+    if params.get('buy_threshold', np.inf) <= params.get('sell_threshold', -np.inf):
+        return False
+    # Thresholds must sit on either side of the neutral value of the relative strength method
+    neutral = data_processor.RRS_NEUTRAL.get(params.get('rrs_method'))
+    if neutral is not None and not params.get('sell_threshold', -np.inf) < neutral < params.get('buy_threshold', np.inf):
+        return False
+    return True
+
+def grid_combinations(param_grid, constraint=default_constraint):
+    """
+    Every combination of the parameter grid that passes the constraint.
+
+    :param param_grid: Dictionary mapping parameter names to lists of values.
+    :param constraint: Callable filtering combinations, or None.
+    :return: List of parameter dictionaries.
+    """
+    names = list(param_grid)
+    combos = (dict(zip(names, values)) for values in itertools.product(*(param_grid[n] for n in names)))
+    return [c for c in combos if constraint is None or constraint(c)]
+
+def random_combinations(param_space, n_iter, seed=None, constraint=default_constraint):
+    """
+    Random samples from a parameter space.
+
+    Lists are sampled uniformly; (low, high) tuples are sampled as continuous
+    uniform ranges (integers if both bounds are ints).
+
+    :param param_space: Dictionary mapping parameter names to lists or (low, high) tuples.
+    :param n_iter: Number of combinations to return.
+    :param seed: Random seed for reproducible searches.
+    :param constraint: Callable filtering combinations, or None.
+    :return: List of parameter dictionaries.
+    """
+    rng = np.random.default_rng(seed)
+    combos = []
+    attempts = 0
+    while len(combos) < n_iter and attempts < n_iter * 100:
+        attempts += 1
+        params = {}
+        for name, space in param_space.items():
+            if isinstance(space, tuple):
+                low, high = space
+                if isinstance(low, int) and isinstance(high, int):
+                    params[name] = int(rng.integers(low, high + 1))
+                else:
+                    params[name] = float(rng.uniform(low, high))
+            else:
+                params[name] = space[rng.integers(len(space))]
+        if constraint is None or constraint(params):
+            combos.append(params)
+    return combos
+
+def _init_worker(shm_name, shape, columns, index):
+    global _worker_frame, _worker_shm
+    # Attach to the parent's block; the columns are zero-copy views of it
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    values = np.ndarray(shape, dtype=np.float64, buffer=_worker_shm.buf)
+    _worker_frame = pd.DataFrame({name: values[:, i] for i, name in enumerate(columns)}, index=index, copy=False)
+
+def with_rrs(df, rrs_window=Config.RRS_WINDOW, rrs_method=Config.RRS_METHOD):
+    """
+    Copy of a processed frame with its 'RRS' column recomputed.
+
+    :param df: Frame with 'close' and 'benchmark_close' columns (as built by DataProcessor).
+    :param rrs_window: Lookback in bars.
+    :param rrs_method: 'ratio' or 'log'; 'real' needs the benchmark's highs and lows, which the frame does not carry.
+    :return: DataFrame with the new 'RRS' column.
+    """
+    if 'benchmark_close' not in df.columns:
+        raise ValueError("Sweeping RRS parameters requires a 'benchmark_close' column.")
+    if rrs_method == 'real':
+        raise ValueError("The 'real' RRS method cannot be swept: it needs benchmark highs and lows.")
+    frame = df.copy()
+    rrs = data_processor.relative_strength(frame[['close']], frame['benchmark_close'], rrs_window, rrs_method)
+    frame['RRS'] = rrs['close'].to_numpy()
+    return frame
+
+def evaluate(df, params, initial_balance=Config.INITIAL_BALANCE, fee=Config.FEE):
+    """
+    Run one backtest for a parameter set and return its metrics.
+
+    :param df: Price frame with 'close' and 'RRS' columns, plus 'benchmark_close' to sweep RRS_PARAMS.
+    :param params: Dictionary of RRS and strategy parameters.
+    :param initial_balance: Starting cash.
+    :param fee: Fee per side as a fraction of traded value.
+    :return: Dictionary of parameters and MetricsCalculator metrics.
+    """
+    rrs_params = {k: params[k] for k in RRS_PARAMS if k in params}
+    frame = with_rrs(df, **rrs_params) if rrs_params else df.copy()
+
+    strat = Strategy(params.get('buy_threshold', Config.RRS_BUY_THRESHOLD),
+                     params.get('sell_threshold', Config.RRS_SELL_THRESHOLD), verbose=False)
+    signals = strat.generate_signals(frame)
+    results = Backtester(frame, signals, initial_balance, fee, verbose=False).execute_trades()
+    metrics = MetricsCalculator(results, initial_balance, verbose=False).calculate_metrics() if not results.empty else {}
+    return {**params, **metrics}
+
+def _evaluate_chunk(chunk, initial_balance, fee):
+    out = []
+    for params in chunk:
+        try:
+            out.append(evaluate(_worker_frame, params, initial_balance, fee))
+        except Exception as e:
+            logger.error(f"Evaluation failed for {params}: {e}")
+            out.append(dict(params))
+    return out
+
+class Optimizer:
+    def __init__(self, df, metric='Sharpe Ratio', maximize=True, max_workers=None,
+                 initial_balance=Config.INITIAL_BALANCE, fee=Config.FEE):
+        """
+        Parameter search over the Strategy thresholds and the RRS window and method.
+
+        The numeric columns of the frame are copied once into a shared memory
+        block that every worker process maps, so tasks only carry parameter
+        dictionaries instead of a pickled DataFrame each.
+
+        :param df: Price frame with 'close' and 'RRS' columns.
+        :param metric: MetricsCalculator metric used for ranking (e.g. 'Sharpe Ratio').
+        :param maximize: Rank descending if True, ascending otherwise.
+        :param max_workers: Worker processes. Defaults to all cores.
+        :param initial_balance: Starting cash for each backtest.
+        :param fee: Fee per side as a fraction of traded value.
+        """
+        self.df = df.select_dtypes(include='number')
+        self.metric = metric
+        self.maximize = maximize
+        self.max_workers = max_workers or os.cpu_count()
+        self.initial_balance = initial_balance
+        self.fee = fee
+
+    def grid_search(self, param_grid, constraint=default_constraint):
+        """
+        Evaluate every combination of the grid.
+
+        :param param_grid: Dictionary mapping parameter names to lists of values.
+        :param constraint: Callable filtering combinations, or None.
+        :return: DataFrame of parameters and metrics, best first.
+        """
+        return self.run(grid_combinations(param_grid, constraint))
+
+    def random_search(self, param_space, n_iter=100, seed=None, constraint=default_constraint):
+        """
+        Evaluate random samples of the parameter space.
+
+        :param param_space: Dictionary mapping parameter names to lists or (low, high) tuples.
+        :param n_iter: Number of combinations to evaluate.
+        :param seed: Random seed for reproducible searches.
+        :param constraint: Callable filtering combinations, or None.
+        :return: DataFrame of parameters and metrics, best first.
+        """
+        return self.run(random_combinations(param_space, n_iter, seed, constraint))
+
+    def threshold_sweep(self, buy_thresholds, sell_thresholds, constraint=default_constraint):
+        """
+        Sweep buy/sell threshold pairs as one batched array backtest instead of a process pool.
+
+        :param buy_thresholds: Candidate buy thresholds.
+        :param sell_thresholds: Candidate sell thresholds.
+        :param constraint: Callable filtering combinations, or None.
+        :return: DataFrame of thresholds and batch metrics, best first.
+        """
+        combos = grid_combinations({'buy_threshold': list(buy_thresholds), 'sell_threshold': list(sell_thresholds)}, constraint)
+        if not combos:
+            return pd.DataFrame()
+
+        started = time.perf_counter()
+        strat = Strategy(Config.RRS_BUY_THRESHOLD, Config.RRS_SELL_THRESHOLD, verbose=False)
+        signal_matrix = strat.generate_signal_matrix(
+            self.df, [c['buy_threshold'] for c in combos], [c['sell_threshold'] for c in combos]
+        )
+        metrics = Backtester(self.df, signal_matrix, self.initial_balance, self.fee, verbose=False).execute_batch()
+        results = metrics.reset_index()
+        if self.metric in results.columns:
+            results = results.sort_values(self.metric, ascending=not self.maximize, na_position='last')
+
+        logger.info(f"Swept {len(combos)} threshold pairs in {time.perf_counter() - started:.2f}s.")
+        return results.reset_index(drop=True)
+
+    def run(self, combinations):
+        """
+        Evaluate parameter sets on the process pool and rank them.
+
+        :param combinations: List of parameter dictionaries.
+        :return: DataFrame of parameters and metrics, best first.
+        """
+        if not combinations:
+            return pd.DataFrame()
+
+        started = time.perf_counter()
+        values = np.ascontiguousarray(self.df.to_numpy(dtype=np.float64))
+        shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        try:
+            np.ndarray(values.shape, dtype=np.float64, buffer=shm.buf)[:] = values
+
+            # A few chunks per worker keeps the pool busy without per-task overhead
+            chunk_size = max(1, len(combinations) // (self.max_workers * 4))
+            chunks = [combinations[i:i + chunk_size] for i in range(0, len(combinations), chunk_size)]
+
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers, initializer=_init_worker,
+                initargs=(shm.name, values.shape, list(self.df.columns), self.df.index)
+            ) as pool:
+                futures = [pool.submit(_evaluate_chunk, chunk, self.initial_balance, self.fee) for chunk in chunks]
+                rows = [row for future in futures for row in future.result()]
+        finally:
+            shm.close()
+            shm.unlink()
+
+        results = pd.DataFrame(rows)
+        if self.metric in results.columns:
+            results = results.sort_values(self.metric, ascending=not self.maximize, na_position='last')
+        results = results.reset_index(drop=True)
+
+        elapsed = time.perf_counter() - started
+        logger.info(f"Evaluated {len(combinations)} parameter sets in {elapsed:.1f}s "
+                     f"({len(combinations) / elapsed:.1f}/s on {self.max_workers} workers).")
+        return results
+
+if __name__ == "__main__":
+    # Example data
+    rng = np.random.default_rng(42)
+    periods = 24 * 365
+    df = pd.DataFrame({
+        'close': 100 * np.exp(np.cumsum(rng.normal(0, 0.01, periods))),
+        'benchmark_close': 100 * np.exp(np.cumsum(rng.normal(0, 0.01, periods)))
+    }, index=pd.date_range(start='2023-01-01', periods=periods, freq='h'))
+    df = with_rrs(df)
+
+    optimizer = Optimizer(df, metric='Sharpe Ratio')
+    results = optimizer.grid_search({
+        'rrs_window': [6, 12, 24],
+        'buy_threshold': np.round(np.arange(1.00, 1.05, 0.01), 2).tolist(),
+        'sell_threshold': np.round(np.arange(0.95, 1.00, 0.01), 2).tolist()
+    })
+
+    print("Top parameter sets:")
+    print(results[['rrs_window', 'buy_threshold', 'sell_threshold', 'Sharpe Ratio', 'Return (%)', 'Total Trades']].head(10))
+
+    # The same sweep as a single batched array pass
+    sweep = optimizer.threshold_sweep(np.round(np.arange(1.00, 1.05, 0.001), 3), np.round(np.arange(0.95, 1.00, 0.001), 3))
+    print("Top threshold pairs (batched):")
+    print(sweep[['buy_threshold', 'sell_threshold', 'Sharpe Ratio', 'Return (%)', 'Total Trades']].head(10))
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import time
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class WeightRateLimiter:
+    def __init__(self, weight_limit=Config.REQUEST_WEIGHT_LIMIT, window_seconds=60,
+                 warning_threshold=Config.RATE_LIMIT_WARNING_THRESHOLD):
+        """
+        Token bucket over Binance request weight, shared by every concurrent fetch.
+
+        The bucket refills continuously at weight_limit per window and is corrected
+        from the X-MBX-USED-WEIGHT-1M header of each response, so requests made by
+        other processes on the same IP are accounted for as well.
+
+        :param weight_limit: Request weight allowed per window (Binance: 6000 per minute).
+        :param window_seconds: Length of the rate limit window in seconds.
+        :param warning_threshold: Percentage of the limit that triggers warnings and throttling.
+        """
+        self.capacity = weight_limit
+        self.refill_rate = weight_limit / window_seconds
+        self.warning_threshold = warning_threshold
+        self.tokens = float(weight_limit)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.used_weight = 0
+        self.total_weight = 0
+        self.request_count = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+        return now
+
+    async def acquire(self, weight=1):
+        """
+        Wait until the bucket holds enough weight for one request, then take it.
+
+        Check and take happen without an await in between, so concurrent
+        coroutines on the same event loop never overdraw the bucket. Requests
+        are counted by record(), once they have actually been sent.
+
+        :param weight: Request weight of the call about to be made.
+        """
+        while True:
+            now = self._refill()
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+                continue
+            if self.tokens >= weight:
+                self.tokens -= weight
+                return
+            await asyncio.sleep((weight - self.tokens) / self.refill_rate)
+
+    def record(self, weight=1):
+        """
+        Count one request that reached the server (including error responses).
+
+        :param weight: Request weight of the call.
+        """
+        self.total_weight += weight
+        self.request_count += 1
+
+    def update_from_headers(self, headers):
+        """
+        Synchronize the bucket with the server-reported used weight.
+
+        :param headers: Response headers of a Binance REST call.
+        """
+        used = headers.get('X-MBX-USED-WEIGHT-1M') or headers.get('X-MBX-USED-WEIGHT')
+        if used is None:
+            return
+        self._refill()
+        self.used_weight = int(used)
+        self.tokens = min(self.tokens, float(self.capacity - self.used_weight))
+
+        usage_percent = self.used_weight / self.capacity * 100
+        if usage_percent >= self.warning_threshold:
+            logger.warning(f"API weight usage at {usage_percent:.0f}% ({self.used_weight}/{self.capacity}). Throttling requests.")
+
+    def pause(self, seconds):
+        """
+        Block all requests for the given time, e.g. after a 429 with Retry-After.
+
+        :param seconds: Seconds to wait before the next request.
+        """
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0.0
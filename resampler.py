@@ -0,0 +1,200 @@
+import logging
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from config import Config
+from candle_store import subtract_ranges
+from candles import INTERVAL_MS
+
+logger = logging.getLogger(__name__)
+
+# Intervals that can be built from a finer base; '1M' has no fixed length
+RESAMPLE_INTERVAL_MS = {interval: ms for interval, ms in INTERVAL_MS.items() if interval != '1M'}
+
+# Binance weekly candles open on Monday 00:00 UTC; the epoch was a Thursday
+_BIN_OFFSET_MS = {'1w': 4 * 86_400_000}
+
+# How each column combines into a coarser bar; anything not listed takes the last value
+AGGREGATIONS = {
+    'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum',
+    'quote_asset_volume': 'sum', 'number_of_trades': 'sum',
+    'taker_buy_base_asset_volume': 'sum', 'taker_buy_quote_asset_volume': 'sum'
+}
+
+def bin_open_times(open_ms, interval):
+    """
+    Open time of the coarser candle each base candle falls into.
+
+    :param open_ms: int64 array of base candle open times in milliseconds.
+    :param interval: Target interval (e.g., '4h').
+    :return: int64 array of bin open times in milliseconds.
+    """
+    step = RESAMPLE_INTERVAL_MS[interval]
+    offset = _BIN_OFFSET_MS.get(interval, 0)
+    return (open_ms - offset) // step * step + offset
+
+def resample_candles(df, interval, base_interval='1m', include_partial=False):
+    """
+    Aggregate base candles into coarser ones.
+
+    Open is the first open, high the max, low the min, close the last close and
+    volumes and trade counts are summed. Bins are aligned like Binance's own
+    candles (UTC, weeks starting Monday), so the result matches what the API
+    returns for the target interval.
+
+    A first bin whose opening base candles are missing (the data starts
+    mid-bin) and a last bin whose closing base candles are not there yet are
+    dropped, since their open or close would be wrong. Bins with a gap inside
+    are kept, as Binance builds its own bars over exchange downtime the same
+    way, but logged as a warning.
+
+    :param df: Base candles indexed by open time, e.g. 1m bars from the candle store.
+    :param interval: Target interval (e.g., '4h').
+    :param base_interval: Interval of the base candles.
+    :param include_partial: Keep incomplete first and last bars.
+    :return: DataFrame indexed by the coarser open times.
+    """
+    if interval not in RESAMPLE_INTERVAL_MS or base_interval not in RESAMPLE_INTERVAL_MS:
+        raise ValueError(f"Cannot resample {base_interval} to {interval}. Supported intervals: {list(RESAMPLE_INTERVAL_MS)}")
+    step = RESAMPLE_INTERVAL_MS[interval]
+    base_step = RESAMPLE_INTERVAL_MS[base_interval]
+    if step % base_step:
+        raise ValueError(f"{interval} is not a multiple of {base_interval}.")
+    if interval == base_interval or df.empty:
+        return df
+
+    open_ms = df.index.to_numpy(dtype='datetime64[ms]').astype(np.int64)
+    bins = bin_open_times(open_ms, interval)
+    # Base candles are sorted, so every bin is one contiguous run starting at these positions
+    starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    ends = np.r_[starts[1:], len(bins)] - 1
+
+    out = {}
+    for column in df.columns:
+        values = df[column].to_numpy()
+        how = AGGREGATIONS.get(column, 'last')
+        if how == 'first':
+            out[column] = values[starts]
+        elif how == 'last':
+            out[column] = values[ends]
+        elif how == 'max':
+            out[column] = np.maximum.reduceat(values, starts)
+        elif how == 'min':
+            out[column] = np.minimum.reduceat(values, starts)
+        else:
+            out[column] = np.add.reduceat(values, starts)
+
+    index = pd.DatetimeIndex(bins[starts].astype('datetime64[ms]').astype('datetime64[ns]'), name=df.index.name)
+    result = pd.DataFrame(out, index=index)
+
+    complete = ends - starts + 1 == step // base_step
+    keep = np.ones(len(result), dtype=bool)
+    if not include_partial:
+        # The first bin is complete only if it starts with its first base candle,
+        # the last one only once its final base candle is present
+        keep[0] &= open_ms[0] == bins[0]
+        keep[-1] &= open_ms[-1] + base_step >= bins[-1] + step
+    short = keep & ~complete
+    if include_partial:
+        short[[0, -1]] = False  # Incomplete edges were asked for
+    if short.any():
+        logger.warning(
+            "%d of %d %s bars were built from fewer than %d %s candles (gaps in the base data), first at %s.",
+            short.sum(), len(result), interval, step // base_step, base_interval, index[short.argmax()]
+        )
+    return result[keep] if not keep.all() else result
+
+class Resampler:
+    def __init__(self, store, base_interval='1m', max_entries=Config.RESAMPLE_CACHE_SIZE):
+        """
+        Serve any coarser interval from the base candles in a store.
+
+        Results are cached per (symbol, interval). Each entry remembers the base
+        coverage it was built from; when new base candles are stored (REST
+        fetches or websocket flushes), only the bars from the first changed
+        base candle onwards are rebuilt.
+
+        :param store: CandleStore or KlineDatabase holding the base candles.
+        :param base_interval: Interval of the stored base candles.
+        :param max_entries: Cached (symbol, interval) frames kept, least recently used evicted first.
+        """
+        self.store = store
+        self.base_interval = base_interval
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, symbol, interval, start=None, end=None):
+        """
+        Candles of one symbol at a coarser interval.
+
+        :param symbol: Trading pair symbol (e.g., 'SOLUSDT').
+        :param interval: Target interval (e.g., '4h').
+        :param start: Slice start (anything pd.Timestamp accepts). None for all stored data.
+        :param end: Slice end (inclusive). None for all stored data.
+        :return: DataFrame indexed by open time.
+        """
+        if interval == self.base_interval:
+            return self.store.load(symbol, interval, start, end)
+
+        key = (symbol, interval)
+        coverage = self.store.get_coverage(symbol, self.base_interval)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or not self._entry_spans(entry, start, end):
+                entry = self._build(symbol, interval, start, end, coverage)
+            elif entry['coverage'] != coverage:
+                entry = self._refresh(symbol, interval, entry, coverage)
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return entry['df'].loc[start:end]
+
+    def invalidate(self, symbol=None):
+        """
+        Drop cached frames of one symbol, or of every symbol.
+
+        :param symbol: Trading pair symbol, or None for all.
+        """
+        with self._lock:
+            for key in [k for k in self._cache if symbol is None or k[0] == symbol]:
+                del self._cache[key]
+
+    @staticmethod
+    def _entry_spans(entry, start, end):
+        if entry['start'] is not None and (start is None or pd.Timestamp(start) < entry['start']):
+            return False
+        if entry['end'] is not None and (end is None or pd.Timestamp(end) > entry['end']):
+            return False
+        return True
+
+    def _build(self, symbol, interval, start, end, coverage):
+        # Load from the start of the bin containing `start` so the first bar is complete
+        load_start = None
+        if start is not None:
+            start_ms = int(pd.Timestamp(start).value // 1_000_000)
+            load_start = pd.Timestamp(int(bin_open_times(np.array([start_ms]), interval)[0]), unit='ms')
+        base = self.store.load(symbol, self.base_interval, load_start, end)
+        df = resample_candles(base, interval, self.base_interval)
+        logger.debug("Resampled %d %s candles of %s into %d %s bars.", len(base), self.base_interval, symbol, len(df), interval)
+        return {
+            'df': df, 'coverage': coverage,
+            'start': pd.Timestamp(start) if start is not None else None,
+            'end': pd.Timestamp(end) if end is not None else None
+        }
+
+    def _refresh(self, symbol, interval, entry, coverage):
+        # First base millisecond that the new coverage holds and the cached one did not
+        added = [m for s, e in coverage for m in subtract_ranges(entry['coverage'], s, e)]
+        if not added:
+            return {**entry, 'coverage': coverage}
+        changed_ms = min(s for s, _ in added)
+        rebuild_from = pd.Timestamp(int(bin_open_times(np.array([changed_ms]), interval)[0]), unit='ms')
+
+        base = self.store.load(symbol, self.base_interval, rebuild_from, entry['end'])
+        tail = resample_candles(base, interval, self.base_interval)
+        df = pd.concat([entry['df'].loc[:rebuild_from - pd.Timedelta(milliseconds=1)], tail])
+        logger.debug("Rebuilt %d %s bars of %s from %s.", len(tail), interval, symbol, rebuild_from)
+        return {**entry, 'df': df, 'coverage': coverage}
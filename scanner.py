@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import time
+import numpy as np
+import pandas as pd
+from config import Config
+from data_processor import align_universe, check_rrs_thresholds, relative_strength, wide_atr
+from strategy import Strategy
+
+logger = logging.getLogger(__name__)
+
+class UniverseScanner:
+    def __init__(self, benchmark=Config.BENCHMARK_SYMBOL, buy_threshold=None, sell_threshold=None,
+                 window=Config.RRS_WINDOW, method=Config.RRS_METHOD, capacity=Config.SCANNER_HISTORY_BARS,
+                 atr_window=14):
+        """
+        Cross-sectional RRS scanner over a whole symbol universe.
+
+        Closes and volumes (plus highs and lows for the 'real' method) are held
+        as wide (time x symbol) float32 arrays of the last `capacity` bars, so
+        data_processor.relative_strength and Strategy signals run column-wise
+        for all symbols at once. update() appends one bar in place, after which
+        scan() only touches the rows the lookback needs.
+
+        :param benchmark: Benchmark symbol (e.g., 'BTCUSDT').
+        :param buy_threshold: RRS above which a symbol is a buy candidate. Defaults to
+                              Config.RRS_BUY_THRESHOLD, which is on the 'ratio' scale.
+        :param sell_threshold: RRS below which a symbol is a sell candidate. Defaults to
+                               Config.RRS_SELL_THRESHOLD, which is on the 'ratio' scale.
+        :param window: Lookback in bars for relative strength.
+        :param method: 'ratio', 'log' or 'real'. 'log' and 'real' center on 0 and need explicit thresholds.
+        :param capacity: Bars kept in memory per symbol.
+        :param atr_window: ATR window for the 'real' method.
+        """
+        if buy_threshold is None and sell_threshold is None and method == 'ratio':
+            buy_threshold, sell_threshold = Config.RRS_BUY_THRESHOLD, Config.RRS_SELL_THRESHOLD
+        if buy_threshold is None or sell_threshold is None:
+            raise ValueError(f"The '{method}' RRS method needs explicit buy and sell thresholds.")
+        check_rrs_thresholds(method, buy_threshold, sell_threshold)
+        if capacity <= window + (atr_window if method == 'real' else 0):
+            raise ValueError("capacity must be larger than the RRS window (plus the ATR window for 'real').")
+        self.benchmark = benchmark
+        self.strategy = Strategy(buy_threshold, sell_threshold, verbose=False)
+        self.window = window
+        self.method = method
+        self.atr_window = atr_window
+        self.capacity = capacity
+        self.fields = ('high', 'low', 'close') if method == 'real' else ('close',)
+        self.symbols = []
+        self.index = pd.DatetimeIndex([])
+        # field -> (time x symbol) array, and field -> benchmark array
+        self.prices = {field: np.empty((0, 0), dtype=np.float32) for field in self.fields}
+        self.bench = {field: np.empty(0, dtype=np.float32) for field in self.fields}
+        self.volume = np.empty((0, 0), dtype=np.float32)
+
+    @property
+    def buy_threshold(self):
+        return self.strategy.buy_threshold
+
+    @property
+    def sell_threshold(self):
+        return self.strategy.sell_threshold
+
+    @property
+    def close(self):
+        return self.prices['close']
+
+    @property
+    def bench_close(self):
+        return self.bench['close']
+
+    def set_frames(self, frames):
+        """
+        Load the universe from OHLCV frames.
+
+        :param frames: Dictionary mapping symbols (including the benchmark) to OHLCV DataFrames.
+        """
+        if self.benchmark not in frames or frames[self.benchmark].empty:
+            raise ValueError(f"Benchmark {self.benchmark} data is required for scanning.")
+        assets = {s: df for s, df in frames.items() if s != self.benchmark and not df.empty}
+        wide, bench = align_universe(assets, frames[self.benchmark], fields=self.fields + ('volume',))
+        missing = [f for f in self.fields if f not in wide]
+        if missing:
+            raise ValueError(f"The '{self.method}' RRS method needs {missing} columns.")
+
+        # A missing bar is flat at the last close; its volume is zero
+        close = wide['close'].ffill()
+        self.prices = {f: wide[f].fillna(close).iloc[-self.capacity:].to_numpy(dtype=np.float32) for f in self.fields}
+        self.bench = {f: bench[f].iloc[-self.capacity:].to_numpy(dtype=np.float32) for f in self.fields}
+        close = close.iloc[-self.capacity:]
+        self.symbols = list(close.columns)
+        self.index = close.index
+        if 'volume' in wide:
+            self.volume = wide['volume'].fillna(0).iloc[-self.capacity:].to_numpy(dtype=np.float32)
+        else:
+            self.volume = np.zeros_like(self.close)
+        logger.info("Scanner loaded %d symbols x %d bars.", len(self.symbols), len(self.index))
+
+    def load(self, start_date, end_date, symbols=None, interval=Config.TIMEFRAME):
+        """
+        Fetch the universe through data_fetcher (served from the candle store when cached).
+
+        :param start_date: Start date for data (e.g., '2023-01-01').
+        :param end_date: End date for data (e.g., '2023-02-01').
+        :param symbols: Symbols to scan. Defaults to every trading Config.SCANNER_QUOTE_ASSET pair.
+        :param interval: Data interval (e.g., '1h').
+        """
+        import data_fetcher
+
+        if symbols is None:
+            symbols = data_fetcher.exchange_info.symbols_by_quote(Config.SCANNER_QUOTE_ASSET)
+        symbols = list(dict.fromkeys(list(symbols) + [self.benchmark]))
+        frames = asyncio.run(data_fetcher.fetch_multiple_symbols_async(symbols, start_date, end_date, interval))
+        self.set_frames(frames)
+
+    def _append(self, array, row):
+        if len(array) < self.capacity:
+            return np.concatenate((array, np.asarray(row, dtype=np.float32)[None]))
+        # In-place shift keeps the array's memory and dtype; no reallocation per bar
+        array[:-1] = array[1:]
+        array[-1] = row
+        return array
+
+    def update(self, timestamp, closes, volumes=None, highs=None, lows=None):
+        """
+        Append one new bar for the universe, shifting out the oldest one.
+
+        :param timestamp: Open time of the new bar.
+        :param closes: Dictionary of symbol -> close, including the benchmark.
+                       Symbols without a value keep their previous prices.
+        :param volumes: Optional dictionary of symbol -> volume.
+        :param highs: Optional dictionary of symbol -> high ('real' method; defaults to the close).
+        :param lows: Optional dictionary of symbol -> low ('real' method; defaults to the close).
+        """
+        quotes = {'close': closes, 'high': highs or {}, 'low': lows or {}}
+        volumes = volumes or {}
+        # 'close' is the last field, so a symbol without a new bar gets a flat one at its previous close
+        for field in self.fields:
+            row = self.prices['close'][-1].copy()
+            bench = self.bench['close'][-1]
+            for i, symbol in enumerate(self.symbols):
+                if symbol in closes:
+                    row[i] = quotes[field].get(symbol, closes[symbol])
+            if self.benchmark in closes:
+                bench = quotes[field].get(self.benchmark, closes[self.benchmark])
+            self.prices[field] = self._append(self.prices[field], row)
+            self.bench[field] = self._append(self.bench[field], bench)
+        self.volume = self._append(self.volume, [volumes.get(s, 0.0) if s in closes else 0.0 for s in self.symbols])
+        self.index = self.index[-(self.capacity - 1):].append(pd.DatetimeIndex([pd.Timestamp(timestamp)]))
+
+    def update_from_bars(self, bars):
+        """
+        Append bars emitted by websocket_stream.KlineStream that share one open time.
+
+        :param bars: List of bar dictionaries with 'symbol', 'timestamp', 'close', 'high', 'low' and 'volume'.
+        """
+        if not bars:
+            return
+        self.update(bars[0]['timestamp'],
+                    {b['symbol']: b['close'] for b in bars},
+                    {b['symbol']: b['volume'] for b in bars},
+                    {b['symbol']: b['high'] for b in bars if 'high' in b},
+                    {b['symbol']: b['low'] for b in bars if 'low' in b})
+
+    def rrs(self, rows=1):
+        """
+        RRS of every symbol for the most recent bars, through data_processor.relative_strength.
+
+        :param rows: Number of most recent bars to compute.
+        :return: float32 array of shape (rows, symbols).
+        """
+        # 'real' smooths ATR recursively over the whole history; the others only need the lookback
+        lookback = len(self.index) if self.method == 'real' else rows + self.window
+
+        def wide(field):
+            return pd.DataFrame(self.prices[field][-lookback:], columns=self.symbols, dtype=np.float64)
+
+        def bench(field):
+            return pd.Series(self.bench[field][-lookback:], dtype=np.float64)
+
+        asset_atr = bench_atr = None
+        if self.method == 'real':
+            asset_atr = wide_atr(wide('high'), wide('low'), wide('close'), self.atr_window)
+            bench_atr = wide_atr(bench('high'), bench('low'), bench('close'), self.atr_window)
+        values = relative_strength(wide('close'), bench('close'), self.window, self.method, asset_atr, bench_atr)
+        return values.to_numpy(dtype=np.float32)[-rows:]
+
+    def scan(self):
+        """
+        Rank the universe on the latest bar.
+
+        :return: DataFrame of buy and sell candidates with 'RRS', 'signal', 'close' and
+                 'volume' (summed over the RRS window); buys strongest first, then sells weakest first.
+        """
+        if len(self.index) <= self.window:
+            raise ValueError("Not enough bars loaded to compute RRS.")
+        latest = pd.DataFrame({'RRS': self.rrs(rows=1)[0]}, index=pd.Index(self.symbols, name='symbol'))
+        signal = self.strategy.generate_signals(latest).to_numpy()
+
+        table = pd.DataFrame({
+            'RRS': latest['RRS'],
+            'signal': np.array(['hold', 'buy', 'sell'], dtype=object)[signal],
+            'close': self.close[-1],
+            'volume': self.volume[-self.window:].sum(axis=0)
+        }, index=latest.index)
+
+        buys = table[signal == 1].sort_values('RRS', ascending=False)
+        sells = table[signal == -1].sort_values('RRS', ascending=True)
+        return pd.concat([buys, sells])
+
+if __name__ == "__main__":
+    # Example with a synthetic 500-symbol universe
+    rng = np.random.default_rng(7)
+    periods = Config.SCANNER_HISTORY_BARS
+    index = pd.date_range(start='2023-01-01', periods=periods, freq='h')
+
+    def synthetic(seed):
+        closes = 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.01, periods)))
+        return pd.DataFrame({'close': closes, 'volume': 1_000.0}, index=index)
+
+    frames = {f"SYM{i}USDT": synthetic(i) for i in range(500)}
+    frames[Config.BENCHMARK_SYMBOL] = synthetic(10_000)
+
+    scanner = UniverseScanner()
+    scanner.set_frames(frames)
+    print(scanner.scan().head(10))
+
+    started = time.perf_counter()
+    next_bar = index[-1] + pd.Timedelta(hours=1)
+    scanner.update(next_bar, {s: df['close'].iloc[-1] * (1 + rng.normal(0, 0.01)) for s, df in frames.items()})
+    candidates = scanner.scan()
+    print(f"Incremental refresh for {len(scanner.symbols)} symbols took {(time.perf_counter() - started) * 1000:.1f} ms")
+    print(candidates.head(10))
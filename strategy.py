@@ -1,54 +1,268 @@
+import ast
+import functools
+import numpy as np
 import pandas as pd
+from config import Config
+import data_processor
 
+def _shift(values, periods=1):
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 0 or periods == 0:
+        return values
+    out = np.full(values.shape, np.nan)
+    out[periods:] = values[:-periods]
+    return out
+
+# Functions available inside rule expressions
+RULE_FUNCTIONS = {
+    'prev': _shift,
+    'cross_above': lambda a, b: np.greater(a, b) & np.less_equal(_shift(a), _shift(b)),
+    'cross_below': lambda a, b: np.less(a, b) & np.greater_equal(_shift(a), _shift(b)),
+    'rising': lambda x, periods=1: np.greater(x, _shift(x, periods)),
+    'falling': lambda x, periods=1: np.less(x, _shift(x, periods)),
+    'abs': np.abs, 'min': np.minimum, 'max': np.maximum
+}
+
+_COMPARISONS = {
+    ast.Gt: np.greater, ast.GtE: np.greater_equal, ast.Lt: np.less, ast.LtE: np.less_equal,
+    ast.Eq: np.equal, ast.NotEq: np.not_equal
+}
+_ARITHMETIC = {ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.divide}
+
+class Rule:
+    def __init__(self, expression):
+        """
+        Boolean condition over indicator columns and strategy parameters, e.g.
+        "cross_above(MACD, MACD_signal) and close > EMA_200".
+
+        The expression is parsed once into a tree of NumPy operations, so
+        evaluating it is a few whole-column array passes. Names resolve to a
+        strategy parameter when one exists and to a DataFrame column otherwise.
+        Supported syntax: comparisons (also chained), and/or/not, + - * /,
+        numeric constants and the functions in RULE_FUNCTIONS. Comparisons with
+        NaN (indicator warm-up bars) are False.
+
+        :param expression: Rule source.
+        """
+        self.expression = expression
+        self.names = set()
+        try:
+            tree = ast.parse(expression, mode='eval')
+        except SyntaxError as e:
+            raise ValueError(f"Invalid rule {expression!r}: {e.msg}") from None
+        self._evaluate = self._compile(tree.body)
+
+    def _compile(self, node):
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            value = node.value
+            return lambda resolve: value
+        if isinstance(node, ast.Name):
+            name = node.id
+            self.names.add(name)
+            return lambda resolve: resolve(name)
+        if isinstance(node, ast.BoolOp):
+            parts = [self._compile(v) for v in node.values]
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            return lambda resolve: functools.reduce(combine, [part(resolve) for part in parts])
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.USub)):
+            operand = self._compile(node.operand)
+            op = np.logical_not if isinstance(node.op, ast.Not) else np.negative
+            return lambda resolve: op(operand(resolve))
+        if isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+            op = _ARITHMETIC[type(node.op)]
+            left, right = self._compile(node.left), self._compile(node.right)
+            return lambda resolve: op(left(resolve), right(resolve))
+        if isinstance(node, ast.Compare) and all(type(o) in _COMPARISONS for o in node.ops):
+            operands = [self._compile(node.left)] + [self._compile(c) for c in node.comparators]
+            ops = [_COMPARISONS[type(o)] for o in node.ops]
+
+            def compare(resolve):
+                values = [operand(resolve) for operand in operands]
+                return functools.reduce(np.logical_and, [op(a, b) for op, a, b in zip(ops, values, values[1:])])
+            return compare
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id in RULE_FUNCTIONS and not node.keywords):
+            func = RULE_FUNCTIONS[node.func.id]
+            args = [self._compile(a) for a in node.args]
+            return lambda resolve: func(*[arg(resolve) for arg in args])
+        raise ValueError(f"Unsupported syntax in rule {self.expression!r}: {ast.get_source_segment(self.expression, node)}")
+
+    def evaluate(self, df, params=None):
+        """
+        :param df: DataFrame holding the referenced columns.
+        :param params: Dictionary of parameter values.
+        :return: Boolean NumPy array with one value per row of df.
+        """
+        params = params or {}
+
+        def resolve(name):
+            if name in params:
+                return params[name]
+            if name in df.columns:
+                return df[name].to_numpy()
+            raise KeyError(f"Rule {self.expression!r} needs column '{name}', which is not in the DataFrame.")
+
+        with np.errstate(all='ignore'):
+            mask = self._evaluate(resolve)
+        return np.broadcast_to(np.asarray(mask, dtype=bool), (len(df),))
+
+@functools.lru_cache(maxsize=None)
+def compile_rule(expression):
+    """
+    :param expression: Rule source.
+    :return: Compiled Rule, shared by every strategy using the same expression.
+    """
+    return Rule(expression)
+
+# Strategy name -> class, filled by register_strategy
+STRATEGIES = {}
+
+def register_strategy(name):
+    """
+    Class decorator adding a Strategy subclass to STRATEGIES. Its rules are
+    compiled right away so a malformed expression fails at import.
+
+    :param name: Registry name (e.g., 'macd').
+    """
+    def decorator(cls):
+        if name in STRATEGIES:
+            raise ValueError(f"Strategy '{name}' is already registered.")
+        for expression in cls.buy_rules + cls.sell_rules:
+            compile_rule(expression)
+        cls.name = name
+        STRATEGIES[name] = cls
+        return cls
+    return decorator
+
+def get_strategy(name, **params):
+    """
+    :param name: Registry name of the strategy.
+    :param params: Parameter overrides (e.g., buy_threshold=1.03).
+    :return: Strategy instance.
+    """
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {name}. Available: {sorted(STRATEGIES)}")
+    return STRATEGIES[name](**params)
+
+@register_strategy('rrs')
 class Strategy:
-    def __init__(self, buy_threshold, sell_threshold):
+    # Indicators read by the rules, as data_processor.add_indicators specs
+    # (e.g. ('EMA', {'span': 50})); subclasses list what they need here
+    indicators = ()
+    # Default parameter values; rules refer to them by name
+    params = {'buy_threshold': Config.RRS_BUY_THRESHOLD, 'sell_threshold': Config.RRS_SELL_THRESHOLD}
+    # A bar is a buy when any buy rule holds and a sell when any sell rule holds; sell wins over buy
+    buy_rules = ('RRS > buy_threshold',)
+    sell_rules = ('RRS < sell_threshold',)
+
+    def __init__(self, buy_threshold=None, sell_threshold=None, verbose=True, **params):
         """
-        Initializes the Strategy with buy and sell thresholds.
+        Rule-based strategy. The base class trades RRS against buy and sell
+        thresholds; subclasses registered with register_strategy override
+        indicators, params and the rules.
 
-        :param buy_threshold: Threshold for generating buy signals.
-        :param sell_threshold: Threshold for generating sell signals.
+        :param buy_threshold: Threshold for generating buy signals. None keeps the default.
+        :param sell_threshold: Threshold for generating sell signals. None keeps the default.
+        :param verbose: Print debugging output. Disable for batch runs.
+        :param params: Overrides of other parameters declared in `params`.
         """
-        self.buy_threshold = buy_threshold
-        self.sell_threshold = sell_threshold
+        overrides = {k: v for k, v in (('buy_threshold', buy_threshold), ('sell_threshold', sell_threshold))
+                     if v is not None}
+        overrides.update(params)
+        unknown = set(overrides) - set(type(self).params)
+        if unknown:
+            raise ValueError(f"Unknown parameters for {type(self).__name__}: {sorted(unknown)}")
+        self.params = {**type(self).params, **overrides}
+        self.verbose = verbose
+
+    @property
+    def buy_threshold(self):
+        return self.params.get('buy_threshold')
+
+    @property
+    def sell_threshold(self):
+        return self.params.get('sell_threshold')
+
+    def _any_rule(self, rules, df):
+        mask = np.zeros(len(df), dtype=bool)
+        for expression in rules:
+            mask |= compile_rule(expression).evaluate(df, self.params)
+        return mask
 
     def generate_signals(self, df):
         """
         Generates buy, sell, and hold signals based on the provided DataFrame.
 
-        :param df: DataFrame containing the required data and indicators.
-        :return: Series containing signals ('buy', 'sell', 'hold').
+        :param df: DataFrame containing the columns the rules read.
+        :return: int8 Series of signal codes (1 buy, -1 sell, 0 hold).
         """
         try:
             if df.empty:
                 raise ValueError("Input DataFrame cannot be empty.")
 
-            if 'RRS' not in df.columns:
-                raise ValueError("DataFrame must contain 'RRS' column for signal generation.")
-
-            # Initialize signals as 'hold'
-            signals = pd.Series(index=df.index, data='hold', dtype='str')
-
-            # Generate buy signals where RRS exceeds the buy threshold
-            signals.loc[df['RRS'] > self.buy_threshold] = 'buy'
-
-            # Generate sell signals where RRS falls below the sell threshold
-            signals.loc[df['RRS'] < self.sell_threshold] = 'sell'
-
-            # Add signal reasons to the DataFrame for debugging and analysis
-            df['signal_reason'] = 'None'
-            df.loc[df['RRS'] > self.buy_threshold, 'signal_reason'] = 'RRS above buy threshold'
-            df.loc[df['RRS'] < self.sell_threshold, 'signal_reason'] = 'RRS below sell threshold'
+            buy = self._any_rule(self.buy_rules, df)
+            sell = self._any_rule(self.sell_rules, df)
+            signals = pd.Series(np.where(sell, -1, np.where(buy, 1, 0)).astype(np.int8), index=df.index)
 
             # Debugging output
-            print("Generated Signals:")
-            print(signals.head())
-            print("\nSignal Reasons:")
-            print(df[['RRS', 'signal_reason']].head())
+            if self.verbose:
+                print("Generated Signals:")
+                print(signals.head())
 
             return signals
         except Exception as e:
             print(f"Error generating signals: {e}")
-            return pd.Series(dtype='str')
+            return pd.Series(dtype=np.int8)
+
+    def explain(self, df, signals=None):
+        """
+        Human-readable reason for every buy and sell bar, built only when asked for.
+
+        :param df: DataFrame the signals were generated from.
+        :param signals: Output of generate_signals. Computed again if None.
+        :return: Series of reasons indexed by the timestamps of the buy and sell bars.
+        """
+        codes = np.asarray(self.generate_signals(df) if signals is None else signals)
+        reasons = np.full(len(codes), None, dtype=object)
+        for code, rules in ((-1, self.sell_rules), (1, self.buy_rules)):
+            pending = codes == code
+            for expression in rules:
+                rule = compile_rule(expression)
+                hit = pending & rule.evaluate(df, self.params)
+                values = ', '.join(f"{name}={self.params[name]}" for name in sorted(rule.names) if name in self.params)
+                reasons[hit] = f"{expression} ({values})" if values else expression
+                pending &= ~hit
+        active = codes != 0
+        return pd.Series(reasons[active], index=df.index[active], name='signal_reason')
+
+    def generate_signal_matrix(self, df, buy_thresholds=None, sell_thresholds=None):
+        """
+        Generates signals for many threshold pairs in one broadcast pass.
+
+        Pairs are taken element-wise; as in generate_signals, a sell condition
+        wins over a buy condition on the same bar.
+
+        :param df: DataFrame containing the 'RRS' column.
+        :param buy_thresholds: Array of buy thresholds. Defaults to this strategy's threshold.
+        :param sell_thresholds: Array of sell thresholds, same length as buy_thresholds.
+        :return: DataFrame of int8 codes (1 buy, -1 sell, 0 hold), one column per
+                 (buy_threshold, sell_threshold) pair.
+        """
+        if df.empty:
+            raise ValueError("Input DataFrame cannot be empty.")
+
+        if 'RRS' not in df.columns:
+            raise ValueError("DataFrame must contain 'RRS' column for signal generation.")
+
+        buy = np.atleast_1d(self.buy_threshold if buy_thresholds is None else buy_thresholds).astype(float)
+        sell = np.atleast_1d(self.sell_threshold if sell_thresholds is None else sell_thresholds).astype(float)
+        if buy.shape != sell.shape:
+            raise ValueError("buy_thresholds and sell_thresholds must have the same length.")
+
+        rrs = df['RRS'].to_numpy(dtype=float)[:, None]
+        codes = np.where(rrs < sell, -1, np.where(rrs > buy, 1, 0)).astype(np.int8)
+        columns = pd.MultiIndex.from_arrays([buy, sell], names=['buy_threshold', 'sell_threshold'])
+        return pd.DataFrame(codes, index=df.index, columns=columns)
 
     def calculate_signal_strength(self, df):
         """
@@ -74,14 +288,112 @@ class Strategy:
             signal_strength.loc[df['RRS'] < self.sell_threshold] = self.sell_threshold - df['RRS']
 
             # Debugging output
-            print("Signal Strengths:")
-            print(signal_strength.head())
+            if self.verbose:
+                print("Signal Strengths:")
+                print(signal_strength.head())
 
             return signal_strength
         except Exception as e:
             print(f"Error calculating signal strength: {e}")
             return pd.Series(dtype=float)
 
+# Strategies from the README list. Each declares its indicators and rules; shared
+# indicators are computed once through prepare_indicators.
+
+@register_strategy('macd')
+class MACDStrategy(Strategy):
+    indicators = ('MACD',)
+    params = {}
+    buy_rules = ('cross_above(MACD, MACD_signal)',)
+    sell_rules = ('cross_below(MACD, MACD_signal)',)
+
+@register_strategy('kama')
+class KAMAStrategy(Strategy):
+    indicators = ('KAMA',)
+    params = {}
+    buy_rules = ('cross_above(close, KAMA_10)',)
+    sell_rules = ('cross_below(close, KAMA_10)',)
+
+@register_strategy('kama_heikin_ashi')
+class KAMAHeikinAshiStrategy(Strategy):
+    indicators = ('KAMA', 'HeikinAshi')
+    params = {}
+    buy_rules = ('HA_close > HA_open and cross_above(HA_close, KAMA_10)',)
+    sell_rules = ('HA_close < HA_open and cross_below(HA_close, KAMA_10)',)
+
+@register_strategy('aroon')
+class AroonStrategy(Strategy):
+    indicators = ('Aroon',)
+    params = {'upper': 50, 'lower': -50}
+    buy_rules = ('cross_above(Aroon_osc, upper)',)
+    sell_rules = ('cross_below(Aroon_osc, lower)',)
+
+@register_strategy('cmo')
+class CMOStrategy(Strategy):
+    indicators = ('CMO',)
+    params = {'oversold': -50, 'overbought': 50}
+    buy_rules = ('cross_above(CMO_14, oversold)',)
+    sell_rules = ('cross_below(CMO_14, overbought)',)
+
+@register_strategy('chaikin')
+class ChaikinStrategy(Strategy):
+    indicators = ('Chaikin',)
+    params = {}
+    buy_rules = ('cross_above(Chaikin, 0)',)
+    sell_rules = ('cross_below(Chaikin, 0)',)
+
+@register_strategy('trix')
+class TRIXStrategy(Strategy):
+    indicators = ('TRIX',)
+    params = {}
+    buy_rules = ('cross_above(TRIX_15, 0)',)
+    sell_rules = ('cross_below(TRIX_15, 0)',)
+
+@register_strategy('wma_cross')
+class WMACrossStrategy(Strategy):
+    indicators = (('WMA', {'window': 9}), ('WMA', {'window': 21}))
+    params = {}
+    buy_rules = ('cross_above(WMA_9, WMA_21)',)
+    sell_rules = ('cross_below(WMA_9, WMA_21)',)
+
+@register_strategy('psar')
+class PSARStrategy(Strategy):
+    indicators = ('PSAR',)
+    params = {}
+    buy_rules = ('rising(PSAR_trend)',)
+    sell_rules = ('falling(PSAR_trend)',)
+
+@register_strategy('psar_ema')
+class PSAREMAStrategy(Strategy):
+    indicators = ('PSAR', ('EMA', {'span': 200}))
+    params = {}
+    buy_rules = ('rising(PSAR_trend) and close > EMA_200',)
+    sell_rules = ('falling(PSAR_trend)', 'cross_below(close, EMA_200)')
+
+@register_strategy('half_trend')
+class HalfTrendStrategy(Strategy):
+    indicators = ('HalfTrend',)
+    params = {}
+    buy_rules = ('rising(HalfTrend_trend)',)
+    sell_rules = ('falling(HalfTrend_trend)',)
+
+@register_strategy('volume_spike')
+class VolumeSpikeStrategy(Strategy):
+    indicators = ('VolumeSpike',)
+    params = {}
+    buy_rules = ('volume_spike == 1 and close > open',)
+    sell_rules = ('volume_spike == 1 and close < open',)
+
+def prepare_indicators(df, strategies):
+    """
+    Compute the indicators of several strategies, each shared indicator only once.
+
+    :param df: OHLCV DataFrame.
+    :param strategies: Strategy instances or classes.
+    :return: DataFrame with every required indicator column added.
+    """
+    return data_processor.add_indicators(df, [spec for strategy in strategies for spec in strategy.indicators])
+
 if __name__ == "__main__":
     # Example data
     df = pd.DataFrame({
@@ -101,5 +413,5 @@ if __name__ == "__main__":
     print(signals)
     print("\nSignal Strength:")
     print(signal_strength)
-    print("\nDataFrame with Signal Reasons:")
-    print(df)
+    print("\nSignal Reasons:")
+    print(strategy.explain(df, signals))
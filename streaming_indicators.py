@@ -0,0 +1,545 @@
+import math
+from collections import deque
+import numpy as np
+
+class StreamingIndicator:
+    """
+    Base class for O(1)-per-bar indicators.
+
+    Subclasses keep only the state needed for the next value, so the cost of
+    update() does not depend on how much history was loaded. Each one matches
+    its batch counterpart in data_processor to floating point rounding.
+    """
+
+    def __init__(self):
+        self.value = np.nan
+
+    def update(self, price):
+        """
+        Feed one new bar.
+
+        :param price: Source value of the bar (usually the close).
+        :return: Indicator value after this bar (NaN while warming up).
+        """
+        raise NotImplementedError
+
+    def seed(self, prices):
+        """
+        Feed a history of bars.
+
+        :param prices: Iterable of source values, oldest first.
+        :return: NumPy array of the indicator value after each bar.
+        """
+        return np.array([self.update(float(p)) for p in prices], dtype=float)
+
+class SMA(StreamingIndicator):
+    def __init__(self, window):
+        """
+        Simple moving average, matching Series.rolling(window).mean().
+
+        :param window: Number of bars averaged.
+        """
+        super().__init__()
+        self.window = window
+        self._buffer = deque(maxlen=window)
+        self._sum = 0.0
+        self._since_resync = 0
+
+    def update(self, price):
+        if len(self._buffer) == self.window:
+            self._sum -= self._buffer[0]
+        self._buffer.append(price)
+        self._sum += price
+
+        # Re-add the window exactly once per window length so rounding never accumulates
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            self._sum = math.fsum(self._buffer)
+            self._since_resync = 0
+
+        self.value = self._sum / self.window if len(self._buffer) == self.window else np.nan
+        return self.value
+
+class EMA(StreamingIndicator):
+    def __init__(self, span=None, alpha=None):
+        """
+        Exponential moving average, matching Series.ewm(span=span, adjust=False).mean().
+
+        :param span: EMA span; the smoothing factor is 2 / (span + 1).
+        :param alpha: Smoothing factor, used instead of span when given.
+        """
+        super().__init__()
+        if alpha is None:
+            if span is None:
+                raise ValueError("Either span or alpha must be provided.")
+            alpha = 2 / (span + 1)
+        self.alpha = alpha
+
+    def update(self, price):
+        if np.isnan(self.value):
+            self.value = price
+        else:
+            self.value = self.alpha * price + (1 - self.alpha) * self.value
+        return self.value
+
+class WilderAverage(StreamingIndicator):
+    def __init__(self, window):
+        """
+        Wilder's smoothing, matching data_processor.wilder_average.
+
+        The first update stands for the bar without a price change and is
+        skipped; the next `window` values seed a simple mean.
+
+        :param window: Smoothing window.
+        """
+        super().__init__()
+        self.window = window
+        self._count = 0
+        self._seed_sum = 0.0
+
+    def update(self, value):
+        self._count += 1
+        if self._count == 1:
+            return self.value
+        if self._count <= self.window + 1:
+            self._seed_sum += value
+            if self._count == self.window + 1:
+                self.value = self._seed_sum / self.window
+            return self.value
+        self.value += (value - self.value) / self.window
+        return self.value
+
+class RSI(StreamingIndicator):
+    def __init__(self, window=14, method='sma'):
+        """
+        Relative Strength Index, matching data_processor.add_rsi.
+
+        :param window: Window size for calculating RSI.
+        :param method: 'sma' for rolling-mean averages, 'wilder' for Wilder's smoothing.
+        """
+        super().__init__()
+        if method == 'wilder':
+            self._avg_gain, self._avg_loss = WilderAverage(window), WilderAverage(window)
+        elif method == 'sma':
+            self._avg_gain, self._avg_loss = SMA(window), SMA(window)
+        else:
+            raise ValueError(f"Unknown RSI method: {method}")
+        self._previous = None
+
+    def update(self, price):
+        delta = 0.0 if self._previous is None else price - self._previous
+        self._previous = price
+        avg_gain = self._avg_gain.update(delta if delta > 0 else 0.0)
+        avg_loss = self._avg_loss.update(-delta if delta < 0 else 0.0)
+
+        if np.isnan(avg_gain) or np.isnan(avg_loss) or (avg_gain == 0 and avg_loss == 0):
+            self.value = np.nan
+        elif avg_loss == 0:
+            self.value = 100.0
+        else:
+            self.value = 100 - 100 / (1 + avg_gain / avg_loss)
+        return self.value
+
+class StreamingProcessor:
+    def __init__(self, short_window=10, long_window=50, rsi_window=14, rsi_method='sma'):
+        """
+        Incremental counterpart of data_processor.process_data.
+
+        Seed it once from history, then call update() for every new closed
+        candle to get the same indicator columns process_data would produce.
+
+        :param short_window: Window size for the short moving average.
+        :param long_window: Window size for the long moving average.
+        :param rsi_window: Window size for calculating RSI.
+        :param rsi_method: 'sma' or 'wilder'.
+        """
+        self.indicators = {
+            f"SMA_{short_window}": SMA(short_window),
+            f"SMA_{long_window}": SMA(long_window),
+            'RSI': RSI(rsi_window, method=rsi_method)
+        }
+
+    def seed(self, df):
+        """
+        Warm the state from a history frame.
+
+        :param df: DataFrame with 'close' prices, oldest first.
+        :return: Copy of the frame with the indicator columns added.
+        """
+        out = df.copy()
+        closes = df['close'].to_numpy(dtype=float)
+        for name, indicator in self.indicators.items():
+            out[name] = indicator.seed(closes)
+        return out
+
+    def update(self, close):
+        """
+        Feed one new closed candle.
+
+        :param close: Close price of the candle.
+        :return: Dictionary of indicator values after this candle.
+        """
+        return {name: indicator.update(float(close)) for name, indicator in self.indicators.items()}
+
+class WMA(StreamingIndicator):
+    def __init__(self, window):
+        """
+        Linearly weighted moving average, matching data_processor.add_wma.
+
+        :param window: Number of bars averaged.
+        """
+        super().__init__()
+        self.window = window
+        self._buffer = deque(maxlen=window)
+        self._sum = 0.0
+        self._weighted = 0.0
+        self._since_resync = 0
+        self._divisor = window * (window + 1) / 2
+
+    def update(self, price):
+        if len(self._buffer) == self.window:
+            # Every weight drops by one and the oldest value falls out
+            self._weighted += self.window * price - self._sum
+            self._sum += price - self._buffer[0]
+        else:
+            self._weighted += (len(self._buffer) + 1) * price
+            self._sum += price
+        self._buffer.append(price)
+
+        self._since_resync += 1
+        if self._since_resync >= self.window:
+            self._sum = math.fsum(self._buffer)
+            self._weighted = math.fsum((i + 1) * p for i, p in enumerate(self._buffer))
+            self._since_resync = 0
+
+        self.value = self._weighted / self._divisor if len(self._buffer) == self.window else np.nan
+        return self.value
+
+class MACD(StreamingIndicator):
+    def __init__(self, fast=12, slow=26, signal=9):
+        """
+        MACD line, matching data_processor.add_macd. The signal line and
+        histogram are kept in `signal` and `hist`.
+
+        :param fast: Fast EMA span.
+        :param slow: Slow EMA span.
+        :param signal: Signal EMA span.
+        """
+        super().__init__()
+        self._fast, self._slow, self._signal = EMA(fast), EMA(slow), EMA(signal)
+        self.signal = np.nan
+        self.hist = np.nan
+
+    def update(self, price):
+        self.value = self._fast.update(price) - self._slow.update(price)
+        self.signal = self._signal.update(self.value)
+        self.hist = self.value - self.signal
+        return self.value
+
+class TRIX(StreamingIndicator):
+    def __init__(self, window=15):
+        """
+        Percent change of a triple EMA, matching data_processor.add_trix.
+
+        :param window: EMA span of each smoothing pass.
+        """
+        super().__init__()
+        self._emas = [EMA(window) for _ in range(3)]
+        self._previous = np.nan
+
+    def update(self, price):
+        triple = price
+        for ema in self._emas:
+            triple = ema.update(triple)
+        self.value = (triple / self._previous - 1) * 100
+        self._previous = triple
+        return self.value
+
+class CMO(StreamingIndicator):
+    def __init__(self, window=14):
+        """
+        Chande Momentum Oscillator, matching data_processor.add_cmo.
+
+        :param window: Lookback in bars.
+        """
+        super().__init__()
+        self._gains, self._losses = SMA(window), SMA(window)
+        self._previous = None
+
+    def update(self, price):
+        if self._previous is None:
+            self._previous = price
+            return self.value
+        delta = price - self._previous
+        self._previous = price
+        gains = self._gains.update(delta if delta > 0 else 0.0)
+        losses = self._losses.update(-delta if delta < 0 else 0.0)
+        total = gains + losses
+        self.value = 100 * (gains - losses) / total if total > 0 else np.nan
+        return self.value
+
+class KAMA(StreamingIndicator):
+    def __init__(self, window=10, fast=2, slow=30):
+        """
+        Kaufman's Adaptive Moving Average, matching data_processor.add_kama.
+
+        :param window: Efficiency ratio lookback.
+        :param fast: Fastest EMA span.
+        :param slow: Slowest EMA span.
+        """
+        super().__init__()
+        self.window = window
+        self._closes = deque(maxlen=window + 1)
+        self._moves = deque(maxlen=window)
+        self._volatility = 0.0
+        self._since_resync = 0
+        self._fast_sc, self._slow_sc = 2 / (fast + 1), 2 / (slow + 1)
+
+    def update(self, price):
+        if self._closes:
+            move = abs(price - self._closes[-1])
+            if len(self._moves) == self.window:
+                self._volatility -= self._moves[0]
+            self._moves.append(move)
+            self._volatility += move
+            self._since_resync += 1
+            if self._since_resync >= self.window:
+                self._volatility = math.fsum(self._moves)
+                self._since_resync = 0
+        self._closes.append(price)
+
+        if len(self._closes) == self.window:
+            self.value = price
+        elif len(self._closes) > self.window:
+            change = abs(price - self._closes[0])
+            efficiency = change / self._volatility if self._volatility > 0 else 0.0
+            sc = (efficiency * (self._fast_sc - self._slow_sc) + self._slow_sc) ** 2
+            self.value += sc * (price - self.value)
+        return self.value
+
+class BarIndicator(StreamingIndicator):
+    """
+    Base class for indicators that need more than one field of a bar.
+
+    update() takes a mapping with 'open', 'high', 'low', 'close' and 'volume'
+    (e.g. a KlineStream bar) and seed() takes an OHLCV DataFrame.
+    """
+
+    fields = ('open', 'high', 'low', 'close', 'volume')
+
+    def seed(self, df):
+        """
+        Feed a history frame.
+
+        :param df: OHLCV DataFrame, oldest first.
+        :return: NumPy array of the indicator value after each bar.
+        """
+        columns = [df[f].to_numpy(dtype=float) for f in self.fields]
+        return np.array([self.update(dict(zip(self.fields, row))) for row in zip(*columns)], dtype=float)
+
+class Aroon(BarIndicator):
+    fields = ('high', 'low')
+
+    def __init__(self, window=25):
+        """
+        Aroon oscillator, matching data_processor.add_aroon. Aroon up and down
+        are kept in `up` and `down`.
+
+        Monotonic deques track the most recent highest high and lowest low, so
+        each update is amortized O(1).
+
+        :param window: Lookback in bars.
+        """
+        super().__init__()
+        self.window = window
+        self._count = 0
+        self._highs = deque()
+        self._lows = deque()
+        self.up = np.nan
+        self.down = np.nan
+
+    def update(self, bar):
+        i = self._count
+        self._count += 1
+        while self._highs and self._highs[-1][1] <= bar['high']:
+            self._highs.pop()
+        self._highs.append((i, bar['high']))
+        while self._lows and self._lows[-1][1] >= bar['low']:
+            self._lows.pop()
+        self._lows.append((i, bar['low']))
+        for extremes in (self._highs, self._lows):
+            if extremes[0][0] < i - self.window:
+                extremes.popleft()
+
+        if self._count > self.window:
+            self.up = 100 * (self.window - (i - self._highs[0][0])) / self.window
+            self.down = 100 * (self.window - (i - self._lows[0][0])) / self.window
+            self.value = self.up - self.down
+        return self.value
+
+class Chaikin(BarIndicator):
+    fields = ('high', 'low', 'close', 'volume')
+
+    def __init__(self, fast=3, slow=10):
+        """
+        Chaikin oscillator, matching data_processor.add_chaikin.
+
+        :param fast: Fast EMA span.
+        :param slow: Slow EMA span.
+        """
+        super().__init__()
+        self._adl = 0.0
+        self._fast, self._slow = EMA(fast), EMA(slow)
+
+    def update(self, bar):
+        spread = bar['high'] - bar['low']
+        if spread > 0:
+            self._adl += ((bar['close'] - bar['low']) - (bar['high'] - bar['close'])) / spread * bar['volume']
+        self.value = self._fast.update(self._adl) - self._slow.update(self._adl)
+        return self.value
+
+class VolumeSpike(BarIndicator):
+    fields = ('volume',)
+
+    def __init__(self, window=20, multiplier=2.0):
+        """
+        Volume relative to the average of the previous bars, matching
+        data_processor.add_volume_spike. `spike` is 1 on spike bars.
+
+        :param window: Number of previous bars averaged.
+        :param multiplier: Ratio that counts as a spike.
+        """
+        super().__init__()
+        self.multiplier = multiplier
+        self._average = SMA(window)
+        self.spike = 0
+
+    def update(self, bar):
+        average = self._average.value
+        self.value = bar['volume'] / average if average > 0 else np.nan
+        self.spike = int(self.value >= self.multiplier)
+        self._average.update(bar['volume'])
+        return self.value
+
+class HeikinAshi(BarIndicator):
+    fields = ('open', 'high', 'low', 'close')
+
+    def __init__(self):
+        """
+        Heikin-Ashi candles, matching data_processor.add_heikin_ashi. The
+        value is HA_close; `open`, `high` and `low` hold the rest of the candle.
+        """
+        super().__init__()
+        self.open = self.high = self.low = np.nan
+
+    def update(self, bar):
+        ha_close = (bar['open'] + bar['high'] + bar['low'] + bar['close']) / 4
+        if np.isnan(self.open):
+            self.open = (bar['open'] + bar['close']) / 2
+        else:
+            self.open = 0.5 * self.open + self.value / 2
+        self.value = ha_close
+        self.high = max(bar['high'], self.open, ha_close)
+        self.low = min(bar['low'], self.open, ha_close)
+        return self.value
+
+class PSAR(BarIndicator):
+    fields = ('high', 'low')
+
+    def __init__(self, step=0.02, max_step=0.2):
+        """
+        Parabolic SAR, matching data_processor.add_psar. `trend` is 1 while
+        rising and -1 while falling.
+
+        :param step: Acceleration factor step.
+        :param max_step: Maximum acceleration factor.
+        """
+        super().__init__()
+        self.step = step
+        self.max_step = max_step
+        self.trend = 1
+        self._lows = deque(maxlen=2)
+        self._highs = deque(maxlen=2)
+        self._extreme = None
+        self._af = step
+        self._sar = None
+
+    def update(self, bar):
+        high, low = bar['high'], bar['low']
+        if self._sar is None:
+            self._sar, self._extreme = low, high
+        else:
+            sar = self._sar + self._af * (self._extreme - self._sar)
+            if self.trend == 1:
+                sar = min(sar, *self._lows)
+                if low < sar:
+                    self.trend, sar, self._extreme, self._af = -1, self._extreme, low, self.step
+                elif high > self._extreme:
+                    self._extreme, self._af = high, min(self._af + self.step, self.max_step)
+            else:
+                sar = max(sar, *self._highs)
+                if high > sar:
+                    self.trend, sar, self._extreme, self._af = 1, self._extreme, high, self.step
+                elif low < self._extreme:
+                    self._extreme, self._af = low, min(self._af + self.step, self.max_step)
+            self._sar = self.value = sar
+        self._lows.append(low)
+        self._highs.append(high)
+        return self.value
+
+class HalfTrend(BarIndicator):
+    fields = ('high', 'low', 'close')
+
+    def __init__(self, amplitude=2):
+        """
+        Half Trend line, matching data_processor.add_half_trend. `trend` is 1
+        in an uptrend and -1 in a downtrend.
+
+        :param amplitude: Lookback of the high/low channel.
+        """
+        super().__init__()
+        self.amplitude = amplitude
+        self.trend = 0
+        self._highs = deque(maxlen=amplitude)
+        self._lows = deque(maxlen=amplitude)
+        self._state = 0
+        self._next_state = 0
+        self._previous_state = None
+        self._max_low = self._min_high = None
+        self._up = self._down = np.nan
+
+    def update(self, bar):
+        previous_high = self._highs[-1] if self._highs else bar['high']
+        previous_low = self._lows[-1] if self._lows else bar['low']
+        self._highs.append(bar['high'])
+        self._lows.append(bar['low'])
+        if len(self._highs) < self.amplitude:
+            return self.value
+        if self._max_low is None:
+            self._max_low, self._min_high = previous_low, previous_high
+
+        high_price, low_price = max(self._highs), min(self._lows)
+        high_ma, low_ma = sum(self._highs) / self.amplitude, sum(self._lows) / self.amplitude
+        if self._next_state == 1:
+            self._max_low = max(low_price, self._max_low)
+            if high_ma < self._max_low and bar['close'] < previous_low:
+                self._state, self._next_state, self._min_high = 1, 0, high_price
+        else:
+            self._min_high = min(high_price, self._min_high)
+            if low_ma > self._min_high and bar['close'] > previous_high:
+                self._state, self._next_state, self._max_low = 0, 1, low_price
+
+        if self._state == 0:
+            if self._previous_state is not None and self._previous_state != 0:
+                self._up = self._down
+            else:
+                self._up = self._max_low if np.isnan(self._up) else max(self._max_low, self._up)
+            self.value, self.trend = self._up, 1
+        else:
+            if self._previous_state is not None and self._previous_state != 1:
+                self._down = self._up
+            else:
+                self._down = self._min_high if np.isnan(self._down) else min(self._min_high, self._down)
+            self.value, self.trend = self._down, -1
+        self._previous_state = self._state
+        return self.value
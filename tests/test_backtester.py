@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from backtester import BUY, HOLD, SELL, simulate_batch, simulate_long_only
+from benchmark import synthetic_ohlcv
+
+def _loop(close, signals, initial_balance, fee, position_size):
+    """Bar-by-bar reference: buy when flat, sell when long, trade at the close."""
+    cash, units, entry = initial_balance, 0.0, None
+    equity, pnl = [], []
+    for price, signal in zip(close, signals):
+        if signal == BUY and entry is None:
+            invested = cash * position_size
+            units, cash, entry = invested / (price * (1 + fee)), cash - invested, price
+        elif signal == SELL and entry is not None:
+            cash += units * price * (1 - fee)
+            pnl.append(price * (1 - fee) / (entry * (1 + fee)) - 1)
+            units, entry = 0.0, None
+        equity.append(cash + units * price)
+    return np.array(equity), np.array(pnl)
+
+def _signals(n, seed):
+    rng = np.random.default_rng(seed)
+    return rng.choice([BUY, HOLD, HOLD, HOLD, SELL], n).astype(np.int8)
+
+@pytest.mark.parametrize('position_size', [1.0, 0.5])
+@pytest.mark.parametrize('seed', [0, 1])
+def test_long_only_matches_loop(seed, position_size):
+    close = synthetic_ohlcv(2000, seed=seed)['close'].to_numpy()
+    signals = _signals(len(close), seed)
+    equity, pnl = _loop(close, signals, 1000.0, 0.001, position_size)
+    sim = simulate_long_only(close, signals, 1000.0, 0.001, position_size)
+    np.testing.assert_allclose(sim['equity'], equity, rtol=1e-9)
+    np.testing.assert_allclose(sim['pnl'], pnl, rtol=1e-9)
+
+def test_repeated_and_unmatched_signals_are_ignored():
+    close = np.array([10.0, 11, 12, 13, 14, 15])
+    signals = np.array([SELL, BUY, BUY, HOLD, SELL, SELL], dtype=np.int8)
+    sim = simulate_long_only(close, signals, 100.0, 0.0)
+    assert list(sim['entry_idx']) == [1] and list(sim['exit_idx']) == [4]
+    np.testing.assert_allclose(sim['equity'], [100, 100, 100 * 12 / 11, 100 * 13 / 11, 100 * 14 / 11, 100 * 14 / 11])
+
+def test_open_trade_at_the_end_is_marked_to_market():
+    close = np.array([10.0, 12, 15])
+    sim = simulate_long_only(close, np.array([BUY, HOLD, HOLD], dtype=np.int8), 100.0, 0.0)
+    assert len(sim['pnl']) == 0 and list(sim['open_entry_idx']) == [0]
+    np.testing.assert_allclose(sim['equity'], [100, 120, 150])
+
+def test_batch_columns_match_single_runs():
+    close = synthetic_ohlcv(1000, seed=3)['close'].to_numpy()
+    matrix = np.column_stack([_signals(len(close), seed) for seed in range(5)])
+    batch = simulate_batch(close, matrix, 1000.0, 0.001, 0.5)
+    for j in range(matrix.shape[1]):
+        single = simulate_long_only(close, matrix[:, j], 1000.0, 0.001, 0.5)
+        np.testing.assert_allclose(batch['equity'][:, j], single['equity'], rtol=1e-9)
+        np.testing.assert_allclose(batch['pnl'][batch['exit'][:, j], j], single['pnl'], rtol=1e-9)
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+from candle_store import CandleStore, merge_ranges, subtract_ranges
+
+def _covered(ranges, start, end):
+    mask = np.zeros(end - start + 1, dtype=bool)
+    for a, b in ranges:
+        if a <= end and b >= start:
+            mask[max(a, start) - start:min(b, end) - start + 1] = True
+    return mask
+
+@pytest.mark.parametrize('ranges, expected', [
+    ([], []),
+    ([[5, 9], [0, 3]], [[0, 3], [5, 9]]),
+    ([[0, 3], [4, 9]], [[0, 9]]),  # Adjacent ranges join
+    ([[0, 10], [2, 5], [8, 12]], [[0, 12]]),
+    ([[0, 3], [5, 9], [1, 6]], [[0, 9]]),
+])
+def test_merge_ranges(ranges, expected):
+    assert merge_ranges(ranges) == expected
+
+@pytest.mark.parametrize('start, end, expected', [
+    (0, 100, [(0, 9), (21, 29), (41, 100)]),
+    (10, 20, []),
+    (12, 35, [(21, 29)]),
+    (15, 25, [(21, 25)]),
+    (45, 50, [(45, 50)]),
+])
+def test_subtract_ranges(start, end, expected):
+    assert subtract_ranges([[10, 20], [30, 40]], start, end) == expected
+
+def test_ranges_against_a_bitmap():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        starts = rng.integers(0, 500, 6)
+        ranges = [[int(a), int(a + rng.integers(0, 60))] for a in starts]
+        coverage = merge_ranges(ranges)
+        start, end = sorted(int(x) for x in rng.integers(0, 600, 2))
+        assert (_covered(coverage, 0, 600) == _covered(ranges, 0, 600)).all()
+        missing = subtract_ranges(coverage, start, end)
+        assert (_covered(missing, start, end) == ~_covered(coverage, start, end)).all()
+
+def test_coverage_round_trip(tmp_path):
+    store = CandleStore(str(tmp_path))
+    store.mark_covered('SOLUSDT', '1m', 0, 59_999)
+    store.mark_covered('SOLUSDT', '1m', 120_000, 179_999)
+    store.mark_covered('SOLUSDT', '1m', 60_000, 119_999)
+    assert store.get_coverage('SOLUSDT', '1m') == [[0, 179_999]]
+    assert store.missing_ranges('SOLUSDT', '1m', 0, 239_999) == [(180_000, 239_999)]
+
+def test_write_replaces_rows_and_loads_slices(tmp_path):
+    store = CandleStore(str(tmp_path))
+    index = pd.date_range('2023-01-31 23:58', periods=4, freq='min', name='timestamp').as_unit('ns')
+    df = pd.DataFrame({'close': [1.0, 2.0, 3.0, 4.0]}, index=index)
+    store.write('SOLUSDT', '1m', df)
+    store.write('SOLUSDT', '1m', df.iloc[1:2] * 10)
+    loaded = store.load('SOLUSDT', '1m')
+    assert loaded['close'].tolist() == [1.0, 20.0, 3.0, 4.0]  # Spans the January/February partitions
+    assert store.load('SOLUSDT', '1m', '2023-02-01', None)['close'].tolist() == [3.0, 4.0]
@@ -0,0 +1,38 @@
+import asyncio
+import numpy as np
+import pandas as pd
+import data_fetcher
+from candle_store import CandleStore
+from candles import Candles, to_price_dtype
+
+PRICE = '27123.456789'
+
+def _row(i):
+    return [i * 60_000, PRICE, PRICE, PRICE, PRICE, '1.23456789', (i + 1) * 60_000 - 1,
+            '33456.78901234', 42, '0.61728394', '16728.39450617', '0']
+
+def test_float32_is_in_memory_only(tmp_path):
+    candles = Candles.from_klines([_row(i) for i in range(3)], price_dtype='float32')
+    df = candles.to_dataframe()
+    assert df['close'].dtype == np.float32 and df['quote_asset_volume'].dtype == np.float32
+
+    store = CandleStore(str(tmp_path))
+    store.write('SOLUSDT', '1m', df)
+    stored = pd.read_parquet(next(tmp_path.rglob('*.parquet')))
+    assert all(stored[c].dtype == np.float64 for c in ['open', 'close', 'volume', 'quote_asset_volume'])
+
+def test_store_path_parses_full_precision(tmp_path, monkeypatch):
+    async def fake_page(symbol, interval, start_ts, end_ts, max_retries=3):
+        return [_row(i) for i in range(start_ts // 60_000, end_ts // 60_000 + 1)]
+
+    store = CandleStore(str(tmp_path))
+    monkeypatch.setattr(data_fetcher, '_candle_store', store)
+    monkeypatch.setattr(data_fetcher, 'fetch_page_async', fake_page)
+    asyncio.run(data_fetcher._fetch_into_store_async('SOLUSDT', '1m', 0, 10 * 60_000 - 1, 0))
+
+    stored = store.load('SOLUSDT', '1m')
+    assert len(stored) == 10
+    assert stored['close'].iloc[0] == float(PRICE)
+    assert stored['quote_asset_volume'].iloc[0] == 33456.78901234
+    assert to_price_dtype(stored, 'float32')['close'].dtype == np.float32
+    assert to_price_dtype(stored, 'float64') is stored
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data_processor import add_kama, linear_recurrence
+from streaming_indicators import KAMA
+
+def _loop(a, b, initial):
+    out, y = np.empty(len(a)), initial
+    for i in range(len(a)):
+        y = a[i] * y + b[i]
+        out[i] = y
+    return out
+
+@pytest.mark.parametrize('a', [
+    np.full(1000, 0.01),
+    np.full(3000, 0.999),
+    np.random.default_rng(1).random(5000),
+    np.where(np.random.default_rng(2).random(5000) < 0.05, 0.0, np.random.default_rng(3).random(5000)),
+    np.r_[0.0, np.full(300, 1e-3)]
+], ids=['small', 'near-one', 'uniform', 'zeros', 'leading-zero'])
+def test_linear_recurrence_matches_loop(a):
+    b = np.random.default_rng(4).normal(100, 10, len(a))
+    result = linear_recurrence(a, b, 50.0)
+    assert np.isfinite(result).all()
+    np.testing.assert_allclose(result, _loop(a, b, 50.0), rtol=1e-9)
+
+def test_kama_with_unit_fast_constant_matches_streaming():
+    rng = np.random.default_rng(5)
+    close = 100 + np.cumsum(rng.normal(0, 1, 5000))
+    close[2000:2100] = close[2000] + np.arange(100)  # Efficiency 1 makes the coefficient exactly zero
+    df = add_kama(pd.DataFrame({'close': close}, index=pd.date_range('2023-01-01', periods=len(close), freq='min')),
+                  window=3, fast=1, slow=30)
+    streaming = KAMA(window=3, fast=1, slow=30).seed(close)
+    assert df['KAMA_3'].iloc[2:].notna().all()
+    np.testing.assert_allclose(df['KAMA_3'].to_numpy(), streaming, rtol=1e-9)
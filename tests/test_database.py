@@ -0,0 +1,66 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+import pytest
+from config import Config
+import data_fetcher
+import data_processor
+from database import EXTENDED_COLUMNS, KlineDatabase
+
+def _klines(periods=5):
+    index = pd.date_range('2023-01-01', periods=periods, freq='h', name='timestamp')
+    df = pd.DataFrame({c: np.arange(periods, dtype=np.float64) + 100 for c in ['open', 'high', 'low', 'close', 'volume']}, index=index)
+    df['quote_asset_volume'] = np.float32(1.5)
+    df['number_of_trades'] = np.arange(periods, dtype=np.int32)
+    df['taker_buy_base_asset_volume'] = np.float32(0.5)
+    df['taker_buy_quote_asset_volume'] = np.float32(0.25)
+    return df
+
+def test_extended_fields_round_trip(tmp_path):
+    db = KlineDatabase(f"sqlite:///{tmp_path / 'k.db'}")
+    df = _klines()
+    db.write('SOLUSDT', '1h', df)
+    loaded = db.load('SOLUSDT', '1h', columns=['close'] + EXTENDED_COLUMNS)
+    assert loaded['number_of_trades'].tolist() == list(range(5))
+    np.testing.assert_allclose(loaded['quote_asset_volume'], 1.5)
+
+    # An OHLCV-only frame must not wipe the stored extended fields
+    db.write('SOLUSDT', '1h', df[['open', 'high', 'low', 'close', 'volume']] * 2)
+    loaded = db.load('SOLUSDT', '1h', columns=['close', 'number_of_trades'])
+    assert loaded['number_of_trades'].tolist() == list(range(5))
+    assert loaded['close'].iloc[0] == 200
+    db.close()
+
+def test_old_schema_gets_extended_columns(tmp_path):
+    path = tmp_path / 'old.db'
+    conn = sqlite3.connect(path)
+    conn.execute("""CREATE TABLE klines (symbol TEXT NOT NULL, interval TEXT NOT NULL, open_time BIGINT NOT NULL,
+        open DOUBLE PRECISION, high DOUBLE PRECISION, low DOUBLE PRECISION, close DOUBLE PRECISION,
+        volume DOUBLE PRECISION, PRIMARY KEY (symbol, interval, open_time))""")
+    conn.commit()
+    conn.close()
+    db = KlineDatabase(f"sqlite:///{path}")
+    db.write('SOLUSDT', '1h', _klines())
+    assert len(db.load('SOLUSDT', '1h', columns=EXTENDED_COLUMNS)) == 5
+    db.close()
+
+@pytest.fixture
+def database_enabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'DATABASE_ENABLED', True)
+    monkeypatch.setattr(Config, 'DATABASE_URI', f"sqlite:///{tmp_path / 'processed.db'}")
+    monkeypatch.setattr(data_fetcher, '_candle_store', None)
+    yield
+    data_fetcher._candle_store.close()
+
+def test_save_processed_data_reuses_connection(database_enabled):
+    df = _klines()
+    df['RRS'] = 1.0
+    data_processor.save_processed_data(df, 'SOLUSDT', '1h')
+    data_processor.save_processed_data(df, 'SOLUSDT', '1h')
+    db = data_fetcher.get_candle_store()
+    assert db is data_fetcher._candle_store
+
+    cursor = db.conn.cursor()
+    cursor.execute("SELECT DISTINCT name FROM indicators")
+    assert [row[0] for row in cursor.fetchall()] == ['RRS']
+    assert db.load('SOLUSDT', '1h', columns=['number_of_trades'])['number_of_trades'].tolist() == list(range(5))
@@ -0,0 +1,36 @@
+import logging
+import queue
+from logging_setup import _DeferredQueueHandler
+
+def _queued(log):
+    log_queue = queue.SimpleQueue()
+    logger = logging.getLogger('test_logging_setup')
+    logger.propagate = False
+    handler = _DeferredQueueHandler(log_queue)
+    logger.addHandler(handler)
+    try:
+        log(logger)
+    finally:
+        logger.removeHandler(handler)
+    return log_queue.get_nowait()
+
+def test_arguments_are_merged_when_logged():
+    state = {'qty': 1}
+
+    def log(logger):
+        logger.warning("position %s", state)
+        state['qty'] = 2
+
+    record = _queued(log)
+    assert record.getMessage() == "position {'qty': 1}" and record.args is None
+
+def test_tracebacks_are_rendered_before_queueing():
+    def log(logger):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed")
+
+    record = _queued(log)
+    assert record.exc_info is None and 'ValueError: boom' in record.exc_text
+    assert 'ValueError: boom' in logging.Formatter().format(record)
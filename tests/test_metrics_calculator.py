@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+from metrics_calculator import MetricsCalculator, TRADE_METRICS, compute_metrics
+
+def _frame(**columns):
+    return pd.DataFrame({'close': [100.0, 102, 101, 103, 105], 'equity': [1000.0, 1020, 1010, 1030, 1050], **columns},
+                        index=pd.date_range('2023-01-01', periods=5, freq='D'))
+
+def test_empty_pnl_gives_zero_trade_metrics():
+    metrics = compute_metrics(np.array([1000.0, 1010, 1005]), 1000, 365, pnl=np.empty(0))
+    assert all(metrics[name] == 0 for name in TRADE_METRICS)
+
+def test_empty_pnl_matches_batch_shape():
+    equity = np.full((4, 3), 1000.0)
+    metrics = compute_metrics(equity, 1000, 365, pnl=np.empty((0, 3)))
+    for name in TRADE_METRICS:
+        assert metrics[name].shape == (3,) and not metrics[name].any()
+
+def test_frame_without_pnl_column_is_scored():
+    metrics = MetricsCalculator(_frame(), 1000, verbose=False).calculate_metrics()
+    assert metrics['Total Trades'] == 0
+    assert np.isclose(metrics['Return (%)'], 5.0)
+
+def test_empty_trade_ledger_is_scored():
+    ledger = pd.DataFrame({'pnl': pd.Series(dtype=float), 'duration': pd.Series(dtype=float)})
+    metrics = MetricsCalculator(_frame(), 1000, verbose=False, trades=ledger).calculate_metrics()
+    assert metrics['Total Trades'] == 0 and metrics['Best Trade (%)'] == 0
+    assert metrics['Max Trade Duration'] == 0
+
+def test_trade_metrics_skip_bars_without_exit():
+    metrics = compute_metrics(np.linspace(1000, 1040, 5), 1000, 365, pnl=np.array([np.nan, 0.02, np.nan, -0.01, np.nan]))
+    assert metrics['Total Trades'] == 2
+    assert np.isclose(metrics['Win Rate (%)'], 50)
+    assert np.isclose(metrics['Best Trade (%)'], 2) and np.isclose(metrics['Worst Trade (%)'], -1)
+    assert np.isclose(metrics['Avg Trade (%)'], 0.5)
+
+def test_batch_columns_match_single_runs():
+    rng = np.random.default_rng(0)
+    equity = 1000 * np.cumprod(1 + rng.normal(0, 0.01, (200, 4)), axis=0)
+    pnl = np.where(rng.random((200, 4)) < 0.1, rng.normal(0, 0.02, (200, 4)), np.nan)
+    batch = compute_metrics(equity, 1000, 8760, pnl=pnl)
+    for j in range(4):
+        single = compute_metrics(equity[:, j], 1000, 8760, pnl=pnl[:, j])
+        for name, value in single.items():
+            np.testing.assert_allclose(np.broadcast_to(batch[name], (4,))[j], value, err_msg=name)
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+import pytest
+import optimizer
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(7)
+    periods = 24 * 60
+    df = pd.DataFrame({
+        'close': 100 * np.exp(np.cumsum(rng.normal(0, 0.01, periods))),
+        'benchmark_close': 100 * np.exp(np.cumsum(rng.normal(0, 0.01, periods)))
+    }, index=pd.date_range('2023-01-01', periods=periods, freq='h'))
+    return optimizer.with_rrs(df)
+
+def test_rrs_window_changes_results(frame):
+    base = {'buy_threshold': 1.01, 'sell_threshold': 0.99}
+    short = optimizer.evaluate(frame, {**base, 'rrs_window': 4})
+    long = optimizer.evaluate(frame, {**base, 'rrs_window': 48})
+    assert short['Total Trades'] != long['Total Trades'] or short['Return (%)'] != long['Return (%)']
+
+def test_log_method_uses_its_own_scale(frame):
+    assert not optimizer.default_constraint({'rrs_method': 'log', 'buy_threshold': 1.02, 'sell_threshold': 0.98})
+    assert optimizer.default_constraint({'rrs_method': 'log', 'buy_threshold': 0.02, 'sell_threshold': -0.02})
+    result = optimizer.evaluate(frame, {'rrs_method': 'log', 'buy_threshold': 0.02, 'sell_threshold': -0.02})
+    assert result['Total Trades'] > 0
+
+def test_real_method_rejected(frame):
+    with pytest.raises(ValueError):
+        optimizer.with_rrs(frame, rrs_method='real')
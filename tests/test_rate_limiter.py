@@ -0,0 +1,50 @@
+import asyncio
+import types
+import pytest
+from binance.exceptions import BinanceAPIException
+from config import Config
+import data_fetcher
+from rate_limiter import WeightRateLimiter
+
+def _rate_limited(*args, **kwargs):
+    response = types.SimpleNamespace(headers={'Retry-After': '0'})
+    raise BinanceAPIException(response, 429, '{"code": -1003, "msg": "Too many requests."}')
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = WeightRateLimiter(weight_limit=10 ** 9)
+    monkeypatch.setattr(data_fetcher, 'rate_limiter', limiter)
+    return limiter
+
+def test_acquire_does_not_count_requests():
+    limiter = WeightRateLimiter()
+    asyncio.run(limiter.acquire(2))
+    assert limiter.request_count == 0 and limiter.total_weight == 0
+    limiter.record(2)
+    assert limiter.request_count == 1 and limiter.total_weight == 2
+
+def test_rate_limit_retries_are_capped(monkeypatch, limiter):
+    monkeypatch.setattr(data_fetcher, 'request_klines', _rate_limited)
+    result = asyncio.run(data_fetcher.fetch_page_async('SOLUSDT', '1h', 0, 1))
+    assert result is None
+    # The first attempt plus every retry reached the server
+    assert limiter.request_count == Config.MAX_API_RETRIES + 1
+    assert limiter.total_weight == (Config.MAX_API_RETRIES + 1) * Config.KLINES_REQUEST_WEIGHT
+
+def test_unsent_requests_are_not_counted(monkeypatch, limiter):
+    def unreachable(*args, **kwargs):
+        raise ConnectionError("connection refused")
+    monkeypatch.setattr(data_fetcher, 'request_klines', unreachable)
+    monkeypatch.setattr(asyncio, 'sleep', _no_sleep)
+    assert asyncio.run(data_fetcher.fetch_page_async('SOLUSDT', '1h', 0, 1, max_retries=2)) is None
+    assert limiter.request_count == 0
+
+def test_successful_page_counted_once(monkeypatch, limiter):
+    monkeypatch.setattr(data_fetcher, 'request_klines', lambda *args: ([[0] * 12], {}))
+    assert asyncio.run(data_fetcher.fetch_page_async('SOLUSDT', '1h', 0, 1)) == [[0] * 12]
+    assert limiter.request_count == 1
+
+_real_sleep = asyncio.sleep
+
+async def _no_sleep(seconds):
+    await _real_sleep(0)
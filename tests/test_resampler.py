@@ -0,0 +1,77 @@
+import logging
+import numpy as np
+import pandas as pd
+import pytest
+from candle_store import CandleStore
+from resampler import RESAMPLE_INTERVAL_MS, Resampler, bin_open_times, resample_candles
+
+def _minutes(start, periods):
+    index = pd.date_range(start, periods=periods, freq='min', name='timestamp').as_unit('ns')
+    close = np.arange(periods, dtype=np.float64) + 100
+    return pd.DataFrame({'open': close - 0.5, 'high': close + 1, 'low': close - 1, 'close': close,
+                         'volume': np.ones(periods), 'number_of_trades': np.ones(periods, dtype=np.int64)}, index=index)
+
+def _ms(timestamp):
+    return int(timestamp.value // 1_000_000)
+
+@pytest.mark.parametrize('interval', ['5m', '1h', '4h', '1d'])
+def test_matches_pandas_resample(interval):
+    df = _minutes('2023-01-02', 3 * 1440)
+    rule = {'5m': '5min', '1h': 'h', '4h': '4h', '1d': 'D'}[interval]
+    expected = df.resample(rule).agg({'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last',
+                                      'volume': 'sum', 'number_of_trades': 'sum'})
+    pd.testing.assert_frame_equal(resample_candles(df, interval), expected, check_freq=False)
+
+def test_weekly_bins_open_on_monday():
+    open_ms = pd.date_range('2023-01-01', periods=14, freq='D').to_numpy(dtype='datetime64[ms]').astype(np.int64)
+    bins = pd.to_datetime(bin_open_times(open_ms, '1w'), unit='ms')
+    assert set(bins.dayofweek) == {0}
+    assert bins[0] == pd.Timestamp('2022-12-26') and bins[1] == pd.Timestamp('2023-01-02')
+
+def test_incomplete_edges_are_dropped():
+    df = _minutes('2023-01-01 00:05', 8 * 60 - 10)  # 00:05 to 07:54
+    result = resample_candles(df, '4h')
+    assert result.empty
+
+    df = _minutes('2023-01-01 00:05', 12 * 60 - 5)  # 00:05 to 11:59
+    result = resample_candles(df, '4h')
+    assert list(result.index) == [pd.Timestamp('2023-01-01 04:00'), pd.Timestamp('2023-01-01 08:00')]
+    assert result['open'].iloc[0] == df.loc['2023-01-01 04:00', 'open']
+
+    partial = resample_candles(df, '4h', include_partial=True)
+    assert partial.index[0] == pd.Timestamp('2023-01-01 00:00') and len(partial) == 3
+
+def test_internal_gaps_are_kept_and_reported(caplog):
+    df = _minutes('2023-01-01', 8 * 60)
+    df = df.drop(df.index[300:310])
+    with caplog.at_level(logging.WARNING, logger='resampler'):
+        result = resample_candles(df, '4h')
+    assert len(result) == 2
+    assert result['volume'].tolist() == [240, 230]
+    assert "1 of 2 4h bars" in caplog.text
+
+@pytest.mark.parametrize('interval', ['15m', '2h', '12h', '3d'])
+def test_bins_are_aligned_to_the_epoch(interval):
+    open_ms = _minutes('2023-03-07 13:17', 5000).index.to_numpy(dtype='datetime64[ms]').astype(np.int64)
+    bins = bin_open_times(open_ms, interval)
+    step = RESAMPLE_INTERVAL_MS[interval]
+    assert (bins % step == 0).all() and (bins <= open_ms).all() and (open_ms - bins < step).all()
+
+def test_coarser_base_interval():
+    hourly = resample_candles(_minutes('2023-01-02', 2 * 1440), '1h')
+    from_hours = resample_candles(hourly, '1d', base_interval='1h')
+    pd.testing.assert_frame_equal(from_hours, resample_candles(_minutes('2023-01-02', 2 * 1440), '1d'))
+
+def test_cache_refresh_matches_full_rebuild(tmp_path):
+    store = CandleStore(str(tmp_path))
+    df = _minutes('2023-01-02', 1440)
+    first, second = df.iloc[:700], df.iloc[700:]
+    store.write('SOLUSDT', '1m', first)
+    store.mark_covered('SOLUSDT', '1m', _ms(first.index[0]), _ms(first.index[-1]) + 59_999)
+    resampler = Resampler(store)
+    assert len(resampler.get('SOLUSDT', '1h')) == 11
+
+    store.write('SOLUSDT', '1m', second)
+    store.mark_covered('SOLUSDT', '1m', _ms(second.index[0]), _ms(second.index[-1]) + 59_999)
+    refreshed = resampler.get('SOLUSDT', '1h')
+    pd.testing.assert_frame_equal(refreshed, resample_candles(df, '1h'), check_index_type=False, check_freq=False)
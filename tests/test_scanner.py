@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data_processor import calculate_universe_rrs
+from scanner import UniverseScanner
+
+PERIODS = 120
+INDEX = pd.date_range('2023-01-01', periods=PERIODS + 1, freq='h')
+
+def _frame(seed, periods=PERIODS + 1):
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.01, periods)))
+    return pd.DataFrame({'high': close * 1.005, 'low': close * 0.995, 'close': close, 'volume': 1_000.0},
+                        index=INDEX[:periods])
+
+@pytest.fixture
+def frames():
+    frames = {f"SYM{i}USDT": _frame(i) for i in range(20)}
+    frames['BTCUSDT'] = _frame(1_000)
+    return frames
+
+@pytest.mark.parametrize('method, buy, sell', [('ratio', 1.01, 0.99), ('log', 0.01, -0.01), ('real', 0.5, -0.5)])
+def test_scan_matches_batch_rrs_and_strategy(frames, method, buy, sell):
+    scanner = UniverseScanner('BTCUSDT', buy, sell, window=12, method=method, capacity=PERIODS + 1)
+    scanner.set_frames(frames)
+    expected = calculate_universe_rrs({s: df for s, df in frames.items() if s != 'BTCUSDT'}, frames['BTCUSDT'],
+                                      window=12, method=method).iloc[-1]
+    np.testing.assert_allclose(scanner.rrs()[0], expected[scanner.symbols].to_numpy(), rtol=1e-5, atol=1e-5)  # float32 storage
+
+    table = scanner.scan()
+    assert (table.loc[table['signal'] == 'buy', 'RRS'] > buy).all()
+    assert (table.loc[table['signal'] == 'sell', 'RRS'] < sell).all()
+    assert set(table.index) == set(expected.index[(expected > buy) | (expected < sell)])
+
+def test_update_matches_reload(frames):
+    scanner = UniverseScanner('BTCUSDT', window=12, capacity=PERIODS)
+    scanner.set_frames({s: df.iloc[:-1] for s, df in frames.items()})
+    last = {s: df.iloc[-1] for s, df in frames.items()}
+    scanner.update(INDEX[-1], {s: bar['close'] for s, bar in last.items()}, {s: bar['volume'] for s, bar in last.items()})
+
+    reloaded = UniverseScanner('BTCUSDT', window=12, capacity=PERIODS)
+    reloaded.set_frames(frames)
+    np.testing.assert_array_equal(scanner.close, reloaded.close)
+    np.testing.assert_array_equal(scanner.bench_close, reloaded.bench_close)
+    assert scanner.index.equals(reloaded.index)
+    pd.testing.assert_frame_equal(scanner.scan(), reloaded.scan())
+
+def test_thresholds_must_fit_method():
+    with pytest.raises(ValueError):
+        UniverseScanner(method='log')  # Ratio-scale defaults would flag everything as a sell
+    with pytest.raises(ValueError):
+        UniverseScanner(buy_threshold=1.02, sell_threshold=0.98, method='log')
+    UniverseScanner(buy_threshold=0.02, sell_threshold=-0.02, method='log')
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+import data_processor as dp
+import streaming_indicators as si
+from benchmark import synthetic_ohlcv
+
+CANDLES = synthetic_ohlcv(3000, seed=7)
+
+# (batch function, its arguments, output column, streaming indicator)
+CASES = [
+    (dp.add_sma, {'window': 20}, 'SMA_20', lambda: si.SMA(20)),
+    (dp.add_ema, {'span': 20}, 'EMA_20', lambda: si.EMA(20)),
+    (dp.add_rsi, {'window': 14}, 'RSI', lambda: si.RSI(14)),
+    (dp.add_rsi, {'window': 14, 'method': 'wilder'}, 'RSI', lambda: si.RSI(14, method='wilder')),
+    (dp.add_wma, {'window': 20}, 'WMA_20', lambda: si.WMA(20)),
+    (dp.add_macd, {}, 'MACD', lambda: si.MACD()),
+    (dp.add_trix, {'window': 15}, 'TRIX_15', lambda: si.TRIX(15)),
+    (dp.add_cmo, {'window': 14}, 'CMO_14', lambda: si.CMO(14)),
+    (dp.add_kama, {'window': 10}, 'KAMA_10', lambda: si.KAMA(10)),
+    (dp.add_aroon, {'window': 25}, 'Aroon_osc', lambda: si.Aroon(25)),
+    (dp.add_chaikin, {}, 'Chaikin', lambda: si.Chaikin()),
+    (dp.add_volume_spike, {'window': 20}, 'volume_ratio', lambda: si.VolumeSpike(20)),
+    (dp.add_heikin_ashi, {}, 'HA_close', lambda: si.HeikinAshi()),
+    (dp.add_psar, {}, 'PSAR', lambda: si.PSAR()),
+    (dp.add_half_trend, {'amplitude': 2}, 'HalfTrend', lambda: si.HalfTrend(2)),
+]
+
+@pytest.mark.parametrize('add, params, column, streaming', CASES, ids=[f"{c[2]}-{i}" for i, c in enumerate(CASES)])
+def test_streaming_matches_batch(add, params, column, streaming):
+    batch = add(CANDLES.copy(), **params)[column].to_numpy(dtype=np.float64)
+    indicator = streaming()
+    source = CANDLES if isinstance(indicator, si.BarIndicator) else CANDLES['close'].to_numpy()
+    np.testing.assert_allclose(indicator.seed(source), batch, rtol=1e-9, atol=1e-9)
+
+def test_processor_matches_process_data():
+    history, live = CANDLES.iloc[:2000], CANDLES.iloc[2000:]
+    batch = dp.process_data(CANDLES.copy())
+    processor = si.StreamingProcessor()
+    processor.seed(history)
+    updates = [processor.update(close) for close in live['close']]
+    for name in processor.indicators:
+        np.testing.assert_allclose([u[name] for u in updates], batch[name].iloc[2000:], rtol=1e-9, err_msg=name)
@@ -0,0 +1,24 @@
+import pandas as pd
+import pytest
+from walk_forward import rolling_folds
+
+INDEX = pd.date_range('2023-01-01', periods=24 * 120, freq='h')
+
+def test_test_windows_tile_the_history():
+    folds = rolling_folds(INDEX, '60D', '20D')
+    assert [f[1][0] for f in folds[1:]] == [f[1][1] for f in folds[:-1]]
+    assert folds[0] == ((0, 24 * 60), (24 * 60, 24 * 80))
+    assert folds[-1][1][1] == len(INDEX)
+
+def test_anchored_train_windows_start_at_zero():
+    assert all(train[0] == 0 for train, _ in rolling_folds(INDEX, 500, 200, anchored=True))
+
+@pytest.mark.parametrize('train, test, step', [(500, 0, None), (0, 100, None), (500, 100, 0), ('60D', '0D', None),
+                                               (500, -5, None), ('-1D', '20D', None)])
+def test_non_positive_sizes_raise(train, test, step):
+    with pytest.raises(ValueError):
+        rolling_folds(INDEX, train, test, step)
+
+def test_step_smaller_than_test_raises():
+    with pytest.raises(ValueError):
+        rolling_folds(INDEX, 500, 200, step=100)
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import pandas as pd
+import websockets
+from data_fetcher import klines_to_dataframe
+from websocket_stream import KlineStream
+
+MINUTE = 60_000
+
+def _event(i, closed=True, symbol='SOLUSDT'):
+    close = 100.0 + i
+    k = {'t': i * MINUTE, 'T': (i + 1) * MINUTE - 1, 's': symbol, 'i': '1m', 'o': str(close), 'h': str(close + 1),
+         'l': str(close - 1), 'c': str(close), 'v': '10', 'n': 5, 'x': closed, 'q': '1000', 'V': '4', 'Q': '400'}
+    return json.dumps({'stream': f"{symbol.lower()}@kline_1m", 'data': {'e': 'kline', 's': symbol, 'k': k}})
+
+def _row(i):
+    close = 100.0 + i
+    return [i * MINUTE, str(close), str(close + 1), str(close - 1), str(close), '10', (i + 1) * MINUTE - 1,
+            '1000', 5, '4', '400', '0']
+
+# Messages per connection: the first drops after bar 1; the second resends bar 1 and skips bars 2-3
+SCRIPT = [
+    [_event(0, closed=False), _event(0), _event(1, closed=False), _event(1)],
+    [_event(1), _event(4, closed=False), _event(4)]
+]
+
+class RecordingStore:
+    def __init__(self):
+        self.frames = []
+        self.covered = []
+
+    def write(self, symbol, interval, df):
+        self.frames.append(df)
+
+    def mark_covered(self, symbol, interval, start_ts, end_ts):
+        self.covered.append((start_ts, end_ts))
+
+async def _run_stream(bars_wanted):
+    connections = []
+    backfills = []
+
+    async def handler(ws):
+        connections.append(ws)
+        for message in SCRIPT[min(len(connections), len(SCRIPT)) - 1]:
+            await ws.send(message)
+        if len(connections) < len(SCRIPT):
+            return  # Drop the connection
+        await ws.wait_closed()
+
+    async def backfill(symbol, interval, start_ms, end_ms):
+        backfills.append((symbol, interval, start_ms, end_ms))
+        return [_row(i) for i in range(start_ms // MINUTE, end_ms // MINUTE + 1)], [(start_ms, end_ms)]
+
+    store = RecordingStore()
+    async with websockets.serve(handler, 'localhost', 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        stream = KlineStream(['SOLUSDT'], '1m', url=f"ws://localhost:{port}", store=store, backfill=backfill,
+                             interval_ms=MINUTE, to_dataframe=klines_to_dataframe, flush_interval=3600)
+        bars = stream.__aiter__()
+        try:
+            received = [await asyncio.wait_for(bars.__anext__(), 10) for _ in range(bars_wanted)]
+        finally:
+            await bars.aclose()
+    return received, backfills, store, len(connections)
+
+def test_stream_emits_closed_bars_reconnects_and_backfills():
+    bars, backfills, store, connections = asyncio.run(_run_stream(5))
+
+    # Only closed candles, each once, in order and without a gap
+    assert [bar['timestamp'] for bar in bars] == list(pd.to_datetime([i * MINUTE for i in range(5)], unit='ms'))
+    assert [bar['close'] for bar in bars] == [100.0, 101.0, 102.0, 103.0, 104.0]
+    assert connections == 2
+
+    # The gap left by the reconnect was requested over REST exactly once
+    assert backfills == [('SOLUSDT', '1m', 2 * MINUTE, 4 * MINUTE - 1)]
+
+    # Indicator values are attached and the candles reach the store on stop
+    assert 'RSI' in bars[-1]
+    assert sum(len(df) for df in store.frames) == 5
+    assert store.covered == [(0, 5 * MINUTE - 1)]
@@ -1,84 +1,422 @@
-import matplotlib.pyplot as plt
+import base64
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
+from config import Config
+
+def _pyplot(headless=False):
+    # matplotlib takes longer to import than the rest of a backtest; load it only when plotting
+    if headless:
+        import matplotlib
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+def minmax_indices(y, pixels):
+    """
+    Min-max downsampling: the lowest and highest point of each pixel column.
+
+    Every spike and every drawdown bottom survives, so the drawn line covers
+    exactly the same vertical extent as the full series.
+
+    :param y: Series values.
+    :param pixels: Horizontal resolution to downsample to.
+    :return: Sorted positions to keep (at most 2 * pixels + 2).
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= 2 * pixels:
+        return np.arange(n)
+    size = -(-n // pixels)
+    buckets = -(-n // size)
+    pad = buckets * size - n
+    # NaNs must never win a bucket; padding fills the last bucket up to full size
+    missing = np.isnan(y)
+    low = np.pad(np.where(missing, np.inf, y), (0, pad), constant_values=np.inf).reshape(buckets, size)
+    high = np.pad(np.where(missing, -np.inf, y), (0, pad), constant_values=-np.inf).reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    return np.unique(np.concatenate(([0, n - 1], offsets + low.argmin(axis=1), offsets + high.argmax(axis=1))))
+
+def lttb_indices(y, pixels):
+    """
+    Largest-Triangle-Three-Buckets downsampling: one point per pixel column,
+    picked to keep the visual shape of the series.
+
+    :param y: Series values (bars are treated as equally spaced).
+    :param pixels: Number of points to keep.
+    :return: Sorted positions to keep.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= pixels or pixels < 3:
+        return np.arange(n)
+    missing = np.isnan(y)
+    if missing.all():
+        return np.array([0, n - 1])
+    if missing.any():
+        # Gaps are bridged for point selection only; the drawn values still come from y
+        positions = np.arange(n)
+        y = np.interp(positions, positions[~missing], y[~missing])
+
+    # pixels - 2 buckets between the fixed first and last point
+    edges = np.linspace(1, n - 1, pixels - 1).astype(np.int64)
+    sums = np.concatenate(([0.0], np.cumsum(y)))
+    starts, ends = edges[:-1], edges[1:]
+    # Each bucket is scored against the mean of the next one; the last against the final point
+    next_x = np.append((starts[1:] + ends[1:] - 1) / 2, n - 1)
+    next_y = np.append((sums[ends[1:]] - sums[starts[1:]]) / (ends[1:] - starts[1:]), y[-1])
+
+    keep = np.empty(pixels, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        candidates = np.arange(start, end)
+        area = np.abs((a - next_x[i]) * (y[start:end] - y[a]) - (a - candidates) * (next_y[i] - y[a]))
+        a = start + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+_DOWNSAMPLERS = {'minmax': minmax_indices, 'lttb': lttb_indices}
+
+def downsample_indices(y, pixels, method=Config.PLOT_DOWNSAMPLE):
+    """
+    Positions of the points worth drawing at the given resolution.
+
+    :param y: Series values.
+    :param pixels: Horizontal resolution of the plot.
+    :param method: 'minmax', 'lttb' or None to keep every point.
+    :return: Sorted positions to keep.
+    """
+    if method is None:
+        return np.arange(len(y))
+    if method not in _DOWNSAMPLERS:
+        raise ValueError(f"Unknown downsampling method: {method}. Use one of {list(_DOWNSAMPLERS)} or None.")
+    return _DOWNSAMPLERS[method](y, pixels)
+
+def signal_indices(signal):
+    """
+    Positions of the buy and sell bars.
+
+    :param signal: 'buy'/'sell'/'hold' labels or numeric signals (1 buy, -1 sell, 0 hold).
+    :return: Tuple of (buy positions, sell positions) as int64 arrays.
+    """
+    values = np.asarray(signal)
+    if values.dtype.kind in 'biuf':
+        return np.flatnonzero(values > 0), np.flatnonzero(values < 0)
+    return np.flatnonzero(values == 'buy'), np.flatnonzero(values == 'sell')
+
+def thin_markers(positions, n_bars, pixels):
+    """
+    Keep the first marker of each pixel column; more would be drawn on top of each other.
+
+    :param positions: Sorted marker positions.
+    :param n_bars: Length of the plotted series.
+    :param pixels: Horizontal resolution of the plot.
+    :return: Sorted positions to draw.
+    """
+    if len(positions) <= pixels:
+        return positions
+    _, first = np.unique(positions * pixels // n_bars, return_index=True)
+    return positions[first]
+
+def _plot_pixels(figsize, dpi):
+    return max(int(figsize[0] * dpi), 3)
+
+def _price_chart(df, pixels, downsample):
+    # Everything the price plot draws, reduced to a few points per pixel
+    if 'close' not in df.columns or 'signal' not in df.columns:
+        raise ValueError("DataFrame must contain 'close' and 'signal' columns.")
+    index = df.index.to_numpy()
+    close = df['close'].to_numpy(dtype=np.float64)
+    keep = downsample_indices(close, pixels, downsample)
+    buys, sells = (thin_markers(p, len(df), pixels) for p in signal_indices(df['signal']))
+    return {
+        'x': index[keep], 'close': close[keep],
+        'buy_x': index[buys], 'buy_y': close[buys],
+        'sell_x': index[sells], 'sell_y': close[sells]
+    }
+
+def _equity_chart(df, pixels, downsample):
+    if 'equity' not in df.columns:
+        raise ValueError("DataFrame must contain 'equity' column.")
+    equity = df['equity'].to_numpy(dtype=np.float64)
+    # fmax skips NaNs like Series.cummax
+    peaks = np.fmax.accumulate(equity)
+    keep = downsample_indices(equity, pixels, downsample)
+    return {'x': df.index.to_numpy()[keep], 'equity': equity[keep], 'peak': peaks[keep]}
+
+def _draw_price(plt, chart, title, save_path, figsize, dpi):
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.plot(chart['x'], chart['close'], label="Close Price", linewidth=2, alpha=0.7)
+    ax.scatter(chart['buy_x'], chart['buy_y'], label="Buy Signal", marker='^', color='green', s=100, alpha=0.9)
+    ax.scatter(chart['sell_x'], chart['sell_y'], label="Sell Signal", marker='v', color='red', s=100, alpha=0.9)
+    _finish(plt, fig, ax, title, "Price", save_path, dpi)
+
+def _draw_equity(plt, chart, title, save_path, figsize, dpi):
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.plot(chart['x'], chart['equity'], label="Equity Curve", color="blue", linewidth=2, alpha=0.9)
+    # Highlight equity peaks
+    ax.plot(chart['x'], chart['peak'], label="Equity Peak", color="orange", linestyle="--", linewidth=1.5, alpha=0.7)
+    _finish(plt, fig, ax, title, "Equity", save_path, dpi)
+
+def _finish(plt, fig, ax, title, ylabel, save_path, dpi):
+    ax.set_title(title)
+    ax.set_xlabel("Date")
+    ax.set_ylabel(ylabel)
+    ax.legend()
+    ax.grid()
+    if save_path:
+        fig.savefig(save_path, dpi=dpi)
+        # Figures stay registered with pyplot until closed; batch renders would pile them up
+        plt.close(fig)
+    else:
+        plt.show()
+
+_CHARTS = {
+    'price': (_price_chart, _draw_price, "Price and Signals"),
+    'equity': (_equity_chart, _draw_equity, "Equity Curve")
+}
+
+def _render_report(name, charts, output_dir, figsize, dpi, headless=True):
+    # Runs in a batch worker: only the downsampled arrays were sent over
+    plt = _pyplot(headless)
+    paths = []
+    for kind, chart in charts.items():
+        path = os.path.join(output_dir, f"{name}_{kind}.png")
+        _CHARTS[kind][1](plt, chart, f"{name}: {_CHARTS[kind][2]}", path, figsize, dpi)
+        paths.append(path)
+    return paths
+
+# Re-buckets the visible x-range with min-max per pixel from the full data embedded in the page
+_ZOOM_SCRIPT = """
+(function () {
+  const gd = document.getElementById('{plot_id}');
+  const decode = (b64, Type) => {
+    const bin = atob(b64), bytes = new Uint8Array(bin.length);
+    for (let i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
+    return new Type(bytes.buffer);
+  };
+  const data = __DATA__;
+  const x = decode(data.x, Float64Array);
+  const series = data.series.map(s => ({trace: s.trace, y: decode(s.y, Float32Array)}));
+  const toX = r => typeof r === 'number' || !data.time ? Number(r) :
+    Date.parse((r.length <= 10 ? r + 'T00:00:00' : r.replace(' ', 'T').replace(/(\\.\\d{3})\\d+/, '$1')) + 'Z');
+  const lowerBound = v => { let lo = 0, hi = x.length; while (lo < hi) { const m = (lo + hi) >> 1; if (x[m] < v) lo = m + 1; else hi = m; } return lo; };
+  const minmax = (y, lo, hi, pixels) => {
+    const out = [];
+    if (hi - lo <= 2 * pixels) { for (let i = lo; i < hi; i++) out.push(i); return out; }
+    const size = Math.ceil((hi - lo) / pixels);
+    for (let s = lo; s < hi; s += size) {
+      const e = Math.min(s + size, hi);
+      let mn = s, mx = s;
+      for (let i = s + 1; i < e; i++) { if (y[i] < y[mn]) mn = i; if (y[i] > y[mx]) mx = i; }
+      if (mn === mx) out.push(mn); else out.push(Math.min(mn, mx), Math.max(mn, mx));
+    }
+    return out;
+  };
+  gd.on('plotly_relayout', ev => {
+    const start = Object.keys(ev).find(k => /^xaxis\\d*\\.range\\[0\\]$/.test(k));
+    let lo = 0, hi = x.length;
+    if (start) {
+      // One bar beyond each edge so the lines run to the border
+      lo = Math.max(lowerBound(toX(ev[start])) - 1, 0);
+      hi = Math.min(lowerBound(toX(ev[start.replace('[0]', '[1]')])) + 1, x.length);
+    } else if (!Object.keys(ev).some(k => /^xaxis\\d*\\.autorange$/.test(k))) {
+      return;
+    }
+    const pixels = Math.max(gd.clientWidth, 100);
+    const xs = [], ys = [];
+    for (const s of series) {
+      const keep = minmax(s.y, lo, hi, pixels);
+      xs.push(keep.map(i => x[i]));
+      ys.push(keep.map(i => s.y[i]));
+    }
+    Plotly.restyle(gd, {x: xs, y: ys}, series.map(s => s.trace));
+  });
+})();
+"""
+
+def _b64(values, dtype):
+    return base64.b64encode(np.ascontiguousarray(values, dtype=dtype).tobytes()).decode('ascii')
 
 class Visualizer:
     @staticmethod
-    def plot_price_and_signals(df, title="Price and Signals", save_path=None):
+    def plot_price_and_signals(df, title="Price and Signals", save_path=None, downsample=Config.PLOT_DOWNSAMPLE,
+                               figsize=Config.PLOT_FIGSIZE, dpi=Config.PLOT_DPI):
         """
         Plots the asset's price with buy and sell signals.
 
+        The price line is downsampled to the pixel width of the figure and the
+        signal markers are drawn from their bar positions, so a year of 1m bars
+        plots as fast as a few thousand.
+
         :param df: DataFrame containing 'close' prices and 'signal' column.
         :param title: Title of the plot.
         :param save_path: Path to save the plot as an image. If None, the plot is displayed.
+        :param downsample: 'minmax', 'lttb' or None to draw every bar.
+        :param figsize: Figure size in inches.
+        :param dpi: Resolution of the saved image.
         """
         try:
             if df.empty:
                 raise ValueError("DataFrame cannot be empty for visualization.")
 
-            if 'close' not in df.columns or 'signal' not in df.columns:
-                raise ValueError("DataFrame must contain 'close' and 'signal' columns.")
-
-            plt.figure(figsize=(14, 7))
-            plt.plot(df.index, df['close'], label="Close Price", linewidth=2, alpha=0.7)
-
-            # Plot buy signals
-            buy_signals = df[df['signal'] == 'buy']
-            plt.scatter(buy_signals.index, buy_signals['close'], label="Buy Signal", marker='^', color='green', s=100, alpha=0.9)
-
-            # Plot sell signals
-            sell_signals = df[df['signal'] == 'sell']
-            plt.scatter(sell_signals.index, sell_signals['close'], label="Sell Signal", marker='v', color='red', s=100, alpha=0.9)
-
-            plt.title(title)
-            plt.xlabel("Date")
-            plt.ylabel("Price")
-            plt.legend()
-            plt.grid()
-
+            chart = _price_chart(df, _plot_pixels(figsize, dpi), downsample)
+            _draw_price(_pyplot(), chart, title, save_path, figsize, dpi)
             if save_path:
-                plt.savefig(save_path, dpi=300)
                 print(f"Plot saved to {save_path}")
-            else:
-                plt.show()
         except Exception as e:
             print(f"Error in plot_price_and_signals: {e}")
 
     @staticmethod
-    def plot_equity_curve(df, title="Equity Curve", save_path=None):
+    def plot_equity_curve(df, title="Equity Curve", save_path=None, downsample=Config.PLOT_DOWNSAMPLE,
+                          figsize=Config.PLOT_FIGSIZE, dpi=Config.PLOT_DPI):
         """
         Plots the equity curve of the portfolio.
 
         :param df: DataFrame containing 'equity' column.
         :param title: Title of the plot.
         :param save_path: Path to save the plot as an image. If None, the plot is displayed.
+        :param downsample: 'minmax', 'lttb' or None to draw every bar.
+        :param figsize: Figure size in inches.
+        :param dpi: Resolution of the saved image.
         """
         try:
             if df.empty:
                 raise ValueError("DataFrame cannot be empty for visualization.")
 
-            if 'equity' not in df.columns:
-                raise ValueError("DataFrame must contain 'equity' column.")
+            chart = _equity_chart(df, _plot_pixels(figsize, dpi), downsample)
+            _draw_equity(_pyplot(), chart, title, save_path, figsize, dpi)
+            if save_path:
+                print(f"Plot saved to {save_path}")
+        except Exception as e:
+            print(f"Error in plot_equity_curve: {e}")
 
-            plt.figure(figsize=(14, 7))
-            plt.plot(df.index, df['equity'], label="Equity Curve", color="blue", linewidth=2, alpha=0.9)
+    @staticmethod
+    def render_batch(reports, output_dir=Config.PLOT_DIR, max_workers=Config.PLOT_WORKERS,
+                     downsample=Config.PLOT_DOWNSAMPLE, figsize=Config.PLOT_FIGSIZE, dpi=Config.PLOT_DPI):
+        """
+        Render the price and equity charts of many backtests to PNG files in parallel.
 
-            # Highlight equity peaks
-            equity_peaks = df['equity'].cummax()
-            plt.plot(df.index, equity_peaks, label="Equity Peak", color="orange", linestyle="--", linewidth=1.5, alpha=0.7)
+        Series are downsampled here and only the reduced arrays go to the
+        worker processes, which draw headless with the Agg backend. A report
+        gets a '<name>_price.png' if it has 'close' and 'signal' columns and a
+        '<name>_equity.png' if it has an 'equity' column.
 
-            plt.title(title)
-            plt.xlabel("Date")
-            plt.ylabel("Equity")
-            plt.legend()
-            plt.grid()
+        :param reports: Dictionary of name -> backtest results DataFrame (e.g., one per optimizer result).
+        :param output_dir: Directory of the images.
+        :param max_workers: Worker processes. Defaults to all cores.
+        :param downsample: 'minmax', 'lttb' or None to draw every bar.
+        :param figsize: Figure size in inches.
+        :param dpi: Resolution of the images.
+        :return: Dictionary of name -> list of image paths (empty if the report failed).
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        pixels = _plot_pixels(figsize, dpi)
+        jobs = {}
+        for name, df in reports.items():
+            charts = {}
+            for kind, (prepare, _, _) in _CHARTS.items():
+                try:
+                    charts[kind] = prepare(df, pixels, downsample)
+                except ValueError:
+                    continue
+            if charts and not df.empty:
+                jobs[name] = charts
+            else:
+                print(f"Nothing to plot for {name}.")
 
-            if save_path:
-                plt.savefig(save_path, dpi=300)
-                print(f"Plot saved to {save_path}")
+        paths = {name: [] for name in reports}
+        if not jobs:
+            return paths
+        workers = min(max_workers or os.cpu_count(), len(jobs))
+        if workers == 1:
+            for name, charts in jobs.items():
+                # In-process: keep whatever backend the caller uses
+                paths[name] = _render_report(name, charts, output_dir, figsize, dpi, headless=False)
+            return paths
+
+        # spawn: forked children would inherit the parent's GUI backend state
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = {name: pool.submit(_render_report, name, charts, output_dir, figsize, dpi)
+                       for name, charts in jobs.items()}
+            for name, future in futures.items():
+                try:
+                    paths[name] = future.result()
+                except Exception as e:
+                    print(f"Error rendering {name}: {e}")
+        print(f"Rendered {sum(len(p) for p in paths.values())} charts to {output_dir}")
+        return paths
+
+    @staticmethod
+    def to_html(df, save_path, title="Backtest", downsample=Config.PLOT_DOWNSAMPLE,
+                figsize=Config.PLOT_FIGSIZE, dpi=Config.PLOT_DPI):
+        """
+        Write an interactive chart of price, signals and (if present) equity to an HTML file.
+
+        The page opens with downsampled lines and carries the full series;
+        zooming re-buckets the visible range with min-max per pixel, so detail
+        down to single bars appears on demand. Needs the optional plotly
+        package; the page loads plotly.js from its CDN.
+
+        :param df: DataFrame containing 'close' and 'signal' columns, and optionally 'equity'.
+        :param save_path: Path of the HTML file.
+        :param title: Title of the chart.
+        :param downsample: 'minmax', 'lttb' or None for the initial view.
+        :param figsize: Figure size in inches; with dpi sets the initial resolution.
+        :param dpi: Pixels per inch of the initial view.
+        :return: save_path, or None on error.
+        """
+        try:
+            try:
+                import plotly.graph_objects as go
+                from plotly.subplots import make_subplots
+            except ImportError:
+                raise ImportError("Interactive charts need plotly (pip install plotly).")
+            if df.empty:
+                raise ValueError("DataFrame cannot be empty for visualization.")
+
+            pixels = _plot_pixels(figsize, dpi)
+            price = _price_chart(df, pixels, downsample)
+            has_equity = 'equity' in df.columns
+            fig = make_subplots(rows=2 if has_equity else 1, cols=1, shared_xaxes=True,
+                                row_heights=[0.65, 0.35] if has_equity else None, vertical_spacing=0.03)
+            fig.add_trace(go.Scatter(x=price['x'], y=price['close'], name="Close Price", mode='lines'), row=1, col=1)
+            fig.add_trace(go.Scatter(x=price['buy_x'], y=price['buy_y'], name="Buy Signal", mode='markers',
+                                     marker=dict(symbol='triangle-up', color='green', size=10)), row=1, col=1)
+            fig.add_trace(go.Scatter(x=price['sell_x'], y=price['sell_y'], name="Sell Signal", mode='markers',
+                                     marker=dict(symbol='triangle-down', color='red', size=10)), row=1, col=1)
+            series = [{'trace': 0, 'y': _b64(df['close'], '<f4')}]
+            if has_equity:
+                equity = _equity_chart(df, pixels, downsample)
+                fig.add_trace(go.Scatter(x=equity['x'], y=equity['equity'], name="Equity Curve", mode='lines',
+                                         line=dict(color='blue')), row=2, col=1)
+                fig.add_trace(go.Scatter(x=equity['x'], y=equity['peak'], name="Equity Peak", mode='lines',
+                                         line=dict(color='orange', dash='dash')), row=2, col=1)
+                series += [
+                    {'trace': 3, 'y': _b64(df['equity'], '<f4')},
+                    {'trace': 4, 'y': _b64(np.fmax.accumulate(df['equity'].to_numpy(dtype=np.float64)), '<f4')}
+                ]
+            fig.update_layout(title=title, height=int(figsize[1] * dpi), hovermode='x unified')
+
+            index = df.index
+            is_time = isinstance(index, pd.DatetimeIndex)
+            if is_time:
+                naive = index.tz_convert('UTC').tz_localize(None) if index.tz is not None else index
+                x = naive.to_numpy(dtype='datetime64[ms]').astype(np.int64)
             else:
-                plt.show()
+                x = index.to_numpy(dtype=np.float64)
+            data = {'time': is_time, 'x': _b64(x, '<f8'), 'series': series}
+            fig.write_html(save_path, include_plotlyjs='cdn',
+                           post_script=_ZOOM_SCRIPT.replace('__DATA__', json.dumps(data)))
+            print(f"Interactive chart saved to {save_path}")
+            return save_path
         except Exception as e:
-            print(f"Error in plot_equity_curve: {e}")
+            print(f"Error in to_html: {e}")
+            return None
 
 if __name__ == "__main__":
     # Example data
@@ -90,4 +428,7 @@ if __name__ == "__main__":
 
     # Create visualizations
     Visualizer.plot_price_and_signals(df)
-    Visualizer.plot_equity_curve(df)
\ No newline at end of file
+    Visualizer.plot_equity_curve(df)
+
+    # Headless batch export of several reports
+    Visualizer.render_batch({'example': df, 'example_flat': df.assign(equity=10000)})
@@ -0,0 +1,220 @@
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from config import Config
+import data_processor
+import optimizer
+from optimizer import Optimizer
+from strategy import Strategy
+from backtester import Backtester
+from metrics_calculator import MetricsCalculator
+
+logger = logging.getLogger(__name__)
+
+def _to_bars(index, size, start=0):
+    if isinstance(size, (int, np.integer)):
+        bars = int(size)
+    else:
+        # Durations are measured from the fold start so irregular indexes still get the right span
+        bars = int(index.searchsorted(index[start] + pd.Timedelta(size))) - start
+    if bars <= 0:
+        raise ValueError(f"Window size {size!r} resolves to {bars} bars; train, test and step sizes must be positive.")
+    return bars
+
+def rolling_folds(index, train_size, test_size, step=None, anchored=False):
+    """
+    Split an index into consecutive train/test windows.
+
+    :param index: DatetimeIndex of the price frame.
+    :param train_size: Train window as a bar count or a duration (e.g. '90D').
+    :param test_size: Test window as a bar count or a duration (e.g. '30D').
+    :param step: Shift between folds. Defaults to the test size, so test windows tile the history.
+    :param anchored: Keep every train window starting at the first bar (expanding window).
+    :return: List of ((train_start, train_end), (test_start, test_end)) positional half-open ranges.
+    :raises ValueError: If a train, test or step size is not a positive number of bars.
+    """
+    folds = []
+    start = 0
+    if len(index) == 0:
+        return folds
+    while True:
+        train_end = start + _to_bars(index, train_size, start)
+        if train_end >= len(index):
+            break
+        test_end = min(train_end + _to_bars(index, test_size, train_end), len(index))
+        folds.append(((0 if anchored else start, train_end), (train_end, test_end)))
+        if test_end >= len(index):
+            break
+        shift = _to_bars(index, step, start) if step is not None else test_end - train_end
+        if shift < test_end - train_end:
+            raise ValueError("step must not be smaller than the test window; overlapping test windows cannot be stitched.")
+        start += shift
+    return folds
+
+def run_fold(df, train, test, buy_thresholds, sell_thresholds, metric='Sharpe Ratio', maximize=True,
+             initial_balance=Config.INITIAL_BALANCE, fee=Config.FEE):
+    """
+    Optimize thresholds on one train window and trade them on the following test window.
+
+    :param df: Price frame with 'close' and 'RRS' (and any precomputed indicators).
+    :param train: (start, end) positional range of the train window.
+    :param test: (start, end) positional range of the test window.
+    :param buy_thresholds: Candidate buy thresholds.
+    :param sell_thresholds: Candidate sell thresholds.
+    :param metric: Metric used to pick the best pair on the train window.
+    :param maximize: Pick the highest metric if True, the lowest otherwise.
+    :param initial_balance: Starting cash of each window.
+    :param fee: Fee per side as a fraction of traded value.
+    :return: Dictionary with the chosen thresholds, train/test metrics and the test results frame.
+    """
+    train_df = df.iloc[train[0]:train[1]]
+    test_df = df.iloc[test[0]:test[1]]
+
+    sweep = Optimizer(train_df, metric, maximize, max_workers=1, initial_balance=initial_balance, fee=fee) \
+        .threshold_sweep(buy_thresholds, sell_thresholds)
+    if sweep.empty:
+        raise ValueError("No valid threshold pair to evaluate.")
+    best = sweep.iloc[0]
+
+    strat = Strategy(best['buy_threshold'], best['sell_threshold'], verbose=False)
+    signals = strat.generate_signal_matrix(test_df).iloc[:, 0]
+    results = Backtester(test_df, signals, initial_balance, fee, verbose=False).execute_trades()
+    test_metrics = MetricsCalculator(results, initial_balance, verbose=False).calculate_metrics()
+
+    return {
+        'buy_threshold': best['buy_threshold'],
+        'sell_threshold': best['sell_threshold'],
+        'train_start': train_df.index[0], 'train_end': train_df.index[-1],
+        'test_start': test_df.index[0], 'test_end': test_df.index[-1],
+        f"train {metric}": best.get(metric, np.nan),
+        **{f"test {k}": v for k, v in test_metrics.items()},
+        'results': results
+    }
+
+def _run_fold_shared(train, test, buy_thresholds, sell_thresholds, metric, maximize, initial_balance, fee):
+    # optimizer._init_worker maps the shared frame once per worker process
+    return run_fold(optimizer._worker_frame, train, test, buy_thresholds, sell_thresholds,
+                    metric, maximize, initial_balance, fee)
+
+class WalkForward:
+    def __init__(self, df, train_size, test_size, step=None, anchored=False, metric='Sharpe Ratio', maximize=True,
+                 max_workers=None, initial_balance=Config.INITIAL_BALANCE, fee=Config.FEE, indicator_params=None):
+        """
+        Rolling out-of-sample evaluation of Strategy thresholds.
+
+        Indicators are computed once on the full history before splitting. They
+        only look backwards, so a fold sees the same values it would have
+        computed itself, and warm-up bars come from the data before the window.
+        The frame is then shared with the worker processes the same way the
+        Optimizer does it, and each fold only receives its window bounds.
+
+        :param df: Price frame with 'close' and 'RRS' columns.
+        :param train_size: Train window as a bar count or a duration (e.g. '90D').
+        :param test_size: Test window as a bar count or a duration (e.g. '30D').
+        :param step: Shift between folds. Defaults to the test size.
+        :param anchored: Use expanding train windows starting at the first bar.
+        :param metric: Metric used to pick thresholds on each train window.
+        :param maximize: Pick the highest metric if True, the lowest otherwise.
+        :param max_workers: Worker processes. Defaults to all cores.
+        :param initial_balance: Starting cash.
+        :param fee: Fee per side as a fraction of traded value.
+        :param indicator_params: Keyword arguments for data_processor.process_data, or None to skip it.
+        """
+        frame = data_processor.process_data(df.copy(), **indicator_params) if indicator_params is not None else df
+        self.df = frame.select_dtypes(include='number')
+        self.folds = rolling_folds(self.df.index, train_size, test_size, step, anchored)
+        self.metric = metric
+        self.maximize = maximize
+        self.max_workers = max_workers or os.cpu_count()
+        self.initial_balance = initial_balance
+        self.fee = fee
+        self.fold_results = []
+
+    def run(self, buy_thresholds, sell_thresholds):
+        """
+        Run every fold on the process pool and stitch the test windows together.
+
+        :param buy_thresholds: Candidate buy thresholds.
+        :param sell_thresholds: Candidate sell thresholds.
+        :return: Tuple of (per-fold summary DataFrame, stitched out-of-sample results frame
+                 that MetricsCalculator consumes directly).
+        """
+        if not self.folds:
+            raise ValueError("History is too short for a single train/test fold.")
+
+        started = time.perf_counter()
+        values = np.ascontiguousarray(self.df.to_numpy(dtype=np.float64))
+        shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        try:
+            np.ndarray(values.shape, dtype=np.float64, buffer=shm.buf)[:] = values
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(self.folds)), initializer=optimizer._init_worker,
+                initargs=(shm.name, values.shape, list(self.df.columns), self.df.index)
+            ) as pool:
+                futures = [
+                    pool.submit(_run_fold_shared, train, test, list(buy_thresholds), list(sell_thresholds),
+                                self.metric, self.maximize, self.initial_balance, self.fee)
+                    for train, test in self.folds
+                ]
+                self.fold_results = [future.result() for future in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+
+        summary = pd.DataFrame([{k: v for k, v in fold.items() if k != 'results'} for fold in self.fold_results])
+        stitched = self.stitch([fold['results'] for fold in self.fold_results])
+        logger.info(f"Walk-forward over {len(self.folds)} folds took {time.perf_counter() - started:.1f}s.")
+        return summary, stitched
+
+    def stitch(self, windows):
+        """
+        Chain test windows into one out-of-sample equity curve.
+
+        Each window was simulated from initial_balance; it is rescaled to start
+        from the equity the previous window ended with. Positions still open at
+        the end of a window are valued at its last close and not carried over.
+
+        :param windows: Backtester results frames of consecutive test windows.
+        :return: Combined results frame.
+        """
+        parts = []
+        capital = self.initial_balance
+        for results in windows:
+            if results.empty:
+                continue
+            scale = capital / self.initial_balance
+            part = results.copy()
+            for column in ('equity', 'cash'):
+                if column in part.columns:
+                    part[column] = part[column] * scale
+            if 'position' in part.columns:
+                part['position'] = part['position'] * scale
+            capital = part['equity'].iloc[-1]
+            parts.append(part)
+        if not parts:
+            return pd.DataFrame()
+        combined = pd.concat(parts)
+        combined['drawdown'] = combined['equity'] / combined['equity'].cummax() - 1
+        return combined
+
+if __name__ == "__main__":
+    # Example data
+    rng = np.random.default_rng(42)
+    periods = 24 * 365
+    df = pd.DataFrame({
+        'close': 100 * np.exp(np.cumsum(rng.normal(0, 0.01, periods))),
+        'RRS': 1 + pd.Series(rng.normal(0, 0.05, periods)).rolling(24, min_periods=1).mean().to_numpy()
+    }, index=pd.date_range(start='2023-01-01', periods=periods, freq='h'))
+
+    walk_forward = WalkForward(df, train_size='90D', test_size='30D', indicator_params={})
+    summary, oos = walk_forward.run(np.round(np.arange(1.00, 1.05, 0.005), 3), np.round(np.arange(0.95, 1.00, 0.005), 3))
+
+    print("Folds:")
+    print(summary[['test_start', 'buy_threshold', 'sell_threshold', 'train Sharpe Ratio', 'test Return (%)']])
+    print("Out-of-sample metrics:")
+    metrics = MetricsCalculator(oos, walk_forward.initial_balance, verbose=False).calculate_metrics()
+    print({k: metrics[k] for k in ('Return (%)', 'Sharpe Ratio', 'Max Drawdown (%)', 'Total Trades')})
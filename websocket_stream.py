@@ -0,0 +1,195 @@
+import asyncio
+import json
+import logging
+import pandas as pd
+import websockets
+from config import Config
+from streaming_indicators import StreamingProcessor
+
+logger = logging.getLogger(__name__)
+
+def kline_event_to_row(k):
+    """
+    Convert the 'k' payload of a kline stream event to the REST klines row layout.
+
+    :param k: Kline dictionary from a websocket event.
+    :return: List in /api/v3/klines order.
+    """
+    return [k['t'], k['o'], k['h'], k['l'], k['c'], k['v'], k['T'], k['q'], k['n'], k['V'], k['Q'], '0']
+
+class KlineStream:
+    def __init__(self, symbols, interval=Config.TIMEFRAME, url=Config.WEBSOCKET_URL, store=None, backfill=None,
+                 interval_ms=None, to_dataframe=None, streams_per_connection=Config.WEBSOCKET_STREAMS_PER_CONNECTION,
+                 flush_interval=Config.WEBSOCKET_FLUSH_INTERVAL):
+        """
+        Live closed-candle feed over multiplexed Binance kline streams.
+
+        Symbols are split across combined-stream connections. Every connection
+        reconnects with exponential backoff; when the first candle after a
+        reconnect is not adjacent to the last one seen, the missing candles are
+        backfilled through the REST path before the live candle is emitted, so
+        consumers always see a gap-free series per symbol.
+
+        Closed candles are buffered into the candle store and run through a
+        per-symbol StreamingProcessor, whose indicator values are attached to
+        each emitted bar.
+
+        :param symbols: Trading pair symbols (e.g., ['SOLUSDT', 'BTCUSDT']).
+        :param interval: Data interval (e.g., '1h').
+        :param url: Base websocket URL; point it at a local server for offline testing.
+        :param store: CandleStore/KlineDatabase receiving closed candles, or None.
+        :param backfill: Coroutine (symbol, interval, start_ms, end_ms) -> (rows, windows) used on gaps,
+                         e.g. data_fetcher.fetch_range_async. None disables backfill.
+        :param interval_ms: Candle length in milliseconds.
+        :param to_dataframe: Function converting raw kline rows to an OHLCV DataFrame.
+        :param streams_per_connection: Maximum streams multiplexed on one connection.
+        :param flush_interval: Seconds between candle store flushes.
+        """
+        self.symbols = [s.upper() for s in symbols]
+        self.interval = interval
+        self.url = url.rstrip('/')
+        self.store = store
+        self.backfill = backfill
+        self.interval_ms = interval_ms
+        self.to_dataframe = to_dataframe
+        self.streams_per_connection = streams_per_connection
+        self.flush_interval = flush_interval
+        self.processors = {symbol: StreamingProcessor() for symbol in self.symbols}
+        self.last_open_time = {}
+        self._pending = {symbol: [] for symbol in self.symbols}
+        self._queue = None
+        self._tasks = []
+        self._stopped = False
+
+    def seed_indicators(self, history):
+        """
+        Warm the per-symbol indicator state from history so the first live values are complete.
+
+        :param history: Dictionary mapping symbols to OHLCV DataFrames.
+        """
+        for symbol, df in history.items():
+            if symbol in self.processors and not df.empty:
+                self.processors[symbol].seed(df)
+                self.last_open_time[symbol] = int(df.index[-1].value // 1_000_000)
+
+    def _connection_urls(self):
+        streams = [f"{symbol.lower()}@kline_{self.interval}" for symbol in self.symbols]
+        for i in range(0, len(streams), self.streams_per_connection):
+            yield f"{self.url}/stream?streams={'/'.join(streams[i:i + self.streams_per_connection])}"
+
+    async def __aiter__(self):
+        """
+        Yield closed bars as dictionaries with 'symbol', 'timestamp', OHLCV and indicator values.
+        """
+        self._queue = asyncio.Queue()
+        self._stopped = False
+        self._tasks = [asyncio.create_task(self._run_connection(url)) for url in self._connection_urls()]
+        if self.store is not None:
+            self._tasks.append(asyncio.create_task(self._flush_periodically()))
+        try:
+            while not self._stopped:
+                bar = await self._queue.get()
+                if bar is None:
+                    break
+                yield bar
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        """
+        Close all connections and flush buffered candles to the store.
+        """
+        self._stopped = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.flush()
+        if self._queue is not None:
+            self._queue.put_nowait(None)
+
+    async def _run_connection(self, url):
+        backoff = 1
+        while not self._stopped:
+            try:
+                async with websockets.connect(url, ping_interval=20, ping_timeout=20) as ws:
+                    logger.info(f"Connected to {url[:120]}")
+                    backoff = 1
+                    async for message in ws:
+                        await self._handle_message(json.loads(message))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Websocket connection lost ({e}). Reconnecting in {backoff}s...")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60)
+
+    async def _handle_message(self, message):
+        data = message.get('data', message)
+        k = data.get('k') if isinstance(data, dict) else None
+        if not k or not k.get('x'):
+            return  # Only closed candles are emitted
+
+        symbol = k['s']
+        if symbol not in self.processors:
+            return
+        open_time = int(k['t'])
+        last = self.last_open_time.get(symbol)
+        if last is not None and open_time <= last:
+            return  # Duplicate after a reconnect
+
+        if last is not None and self.interval_ms and open_time - last > self.interval_ms and self.backfill is not None:
+            await self._backfill_gap(symbol, last + self.interval_ms, open_time - 1)
+
+        self._emit(symbol, kline_event_to_row(k))
+
+    async def _backfill_gap(self, symbol, start_ms, end_ms):
+        logger.info(f"Backfilling {symbol} gap {start_ms}-{end_ms} over REST.")
+        try:
+            rows, _ = await self.backfill(symbol, self.interval, start_ms, end_ms)
+        except Exception as e:
+            logger.error(f"Backfill failed for {symbol}: {e}")
+            return
+        for row in rows:
+            if int(row[0]) > self.last_open_time.get(symbol, -1):
+                self._emit(symbol, row)
+
+    def _emit(self, symbol, row):
+        self.last_open_time[symbol] = int(row[0])
+        self._pending[symbol].append(row)
+        bar = {
+            'symbol': symbol,
+            'timestamp': pd.Timestamp(int(row[0]), unit='ms'),
+            'open': float(row[1]), 'high': float(row[2]), 'low': float(row[3]),
+            'close': float(row[4]), 'volume': float(row[5])
+        }
+        bar.update(self.processors[symbol].update(bar['close']))
+        self._queue.put_nowait(bar)
+
+    async def _flush_periodically(self):
+        while not self._stopped:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
+
+    def flush(self):
+        """
+        Append buffered closed candles to the candle store and mark them covered.
+        """
+        if self.store is None or self.to_dataframe is None:
+            return
+        for symbol, rows in self._pending.items():
+            if not rows:
+                continue
+            self._pending[symbol] = []
+            try:
+                self.store.write(symbol, self.interval, self.to_dataframe(rows))
+                # Only contiguous runs are covered; a gap whose backfill failed stays missing
+                run_start = 0
+                for i in range(1, len(rows) + 1):
+                    if i == len(rows) or (self.interval_ms and int(rows[i][0]) - int(rows[i - 1][0]) > self.interval_ms):
+                        self.store.mark_covered(symbol, self.interval, int(rows[run_start][0]), int(rows[i - 1][6]))
+                        run_start = i
+            except Exception as e:
+                logger.error(f"Error storing streamed candles for {symbol}: {e}")
+                self._pending[symbol] = rows + self._pending[symbol]
+        logger.debug("Flushed streamed candles.")